@@ -1,10 +1,27 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from app.query_stats import QueryStatsMiddleware
 from app.routes import main_router
+from app.services.file_audit_sink import file_audit_sink
+from app.services.invoice_parse_jobs import invoice_parse_queue
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    file_audit_sink.start()
+    yield
+    invoice_parse_queue.shutdown()
+    # Buffered audit rows are written (or spilled to disk) before the worker exits.
+    file_audit_sink.shutdown()
+
 
 app = FastAPI(
     title="SupplyService",
     debug=True,
+    lifespan=lifespan,
 )
 
+app.add_middleware(QueryStatsMiddleware)
 app.include_router(main_router)
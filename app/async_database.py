@@ -0,0 +1,54 @@
+from typing import Annotated
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import (
+    AUTH_DATABASE_URL,
+    REFERENCE_DATABASE_URL,
+    SUPPLY_DATABASE_URL,
+    pool_options,
+)
+from app.pool_metrics import watch_pool
+from app.query_stats import instrument_engine
+
+
+def _async_url(url: str) -> str:
+    return url.replace("mysql+pymysql://", "mysql+aiomysql://", 1)
+
+
+async_auth_engine = create_async_engine(_async_url(AUTH_DATABASE_URL), **pool_options("AUTH"))
+async_supply_engine = create_async_engine(_async_url(SUPPLY_DATABASE_URL), **pool_options("SUPPLY"))
+async_reference_engine = create_async_engine(_async_url(REFERENCE_DATABASE_URL), **pool_options("REFERENCE"))
+
+watch_pool("auth_async", async_auth_engine.sync_engine)
+watch_pool("supply_async", async_supply_engine.sync_engine)
+watch_pool("reference_async", async_reference_engine.sync_engine)
+
+instrument_engine(async_auth_engine.sync_engine)
+instrument_engine(async_supply_engine.sync_engine)
+instrument_engine(async_reference_engine.sync_engine)
+
+AsyncAuthSessionLocal = async_sessionmaker(autoflush=False, bind=async_auth_engine)
+AsyncSupplySessionLocal = async_sessionmaker(autoflush=False, bind=async_supply_engine)
+AsyncReferenceSessionLocal = async_sessionmaker(autoflush=False, bind=async_reference_engine)
+
+
+async def get_async_auth_db() -> AsyncSession:  # pyright: ignore[reportInvalidTypeForm]
+    async with AsyncAuthSessionLocal() as db:
+        yield db  # pyright: ignore[reportReturnType]
+
+
+async def get_async_supply_db() -> AsyncSession:  # pyright: ignore[reportInvalidTypeForm]
+    async with AsyncSupplySessionLocal() as db:
+        yield db  # pyright: ignore[reportReturnType]
+
+
+async def get_async_reference_db() -> AsyncSession:  # pyright: ignore[reportInvalidTypeForm]
+    async with AsyncReferenceSessionLocal() as db:
+        yield db  # pyright: ignore[reportReturnType]
+
+
+DbAsyncAuthSession = Annotated[AsyncSession, Depends(get_async_auth_db, scope="function")]
+DbAsyncSupplySession = Annotated[AsyncSession, Depends(get_async_supply_db, scope="function")]
+DbAsyncReferenceSession = Annotated[AsyncSession, Depends(get_async_reference_db, scope="function")]
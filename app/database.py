@@ -6,6 +6,9 @@ from fastapi import Depends
 from sqlalchemy import create_engine
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
+from app.pool_metrics import watch_pool
+from app.query_stats import instrument_engine
+
 load_dotenv()
 
 AUTH_DATABASE_URL = (
@@ -24,9 +27,36 @@ REFERENCE_DATABASE_URL = (
     f"{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{REFERENCE_DB_NAME}"
 )
 
-auth_engine = create_engine(AUTH_DATABASE_URL)
-supply_engine = create_engine(SUPPLY_DATABASE_URL)
-reference_engine = create_engine(REFERENCE_DATABASE_URL)
+DB_ASYNC_ENABLED = os.getenv("DB_ASYNC_ENABLED", "false").lower() in ("1", "true", "yes")
+
+
+def _pool_setting(prefix: str, name: str, default: str) -> str:
+    # AUTH_DB_POOL_SIZE overrides DB_POOL_SIZE, which overrides the default.
+    return os.getenv(f"{prefix}_DB_{name}") or os.getenv(f"DB_{name}") or default
+
+
+def pool_options(prefix: str) -> dict:
+    return {
+        "pool_size": int(_pool_setting(prefix, "POOL_SIZE", "5")),
+        "max_overflow": int(_pool_setting(prefix, "POOL_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(_pool_setting(prefix, "POOL_TIMEOUT", "30")),
+        # Must stay below MySQL wait_timeout, otherwise idle connections are dropped server-side.
+        "pool_recycle": int(_pool_setting(prefix, "POOL_RECYCLE", "1800")),
+        "pool_pre_ping": _pool_setting(prefix, "POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+    }
+
+
+auth_engine = create_engine(AUTH_DATABASE_URL, **pool_options("AUTH"))
+supply_engine = create_engine(SUPPLY_DATABASE_URL, **pool_options("SUPPLY"))
+reference_engine = create_engine(REFERENCE_DATABASE_URL, **pool_options("REFERENCE"))
+
+watch_pool("auth", auth_engine)
+watch_pool("supply", supply_engine)
+watch_pool("reference", reference_engine)
+
+instrument_engine(auth_engine)
+instrument_engine(supply_engine)
+instrument_engine(reference_engine)
 
 AuthSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=auth_engine)
 SupplySessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=supply_engine)
@@ -69,6 +99,8 @@ def get_reference_db() -> Session:  # pyright: ignore[reportInvalidTypeForm]
         db.close()
 
 
-DbAuthSession = Annotated[Session, Depends(get_auth_db)]
-DbSupplySession = Annotated[Session, Depends(get_supply_db)]
-DbReferenceSession = Annotated[Session, Depends(get_reference_db)]
+# "function" scope closes the sessions as soon as the handler returns, so connections
+# are back in the pool before the response is serialized and sent.
+DbAuthSession = Annotated[Session, Depends(get_auth_db, scope="function")]
+DbSupplySession = Annotated[Session, Depends(get_supply_db, scope="function")]
+DbReferenceSession = Annotated[Session, Depends(get_reference_db, scope="function")]
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+_SUFFIX = ".cache"
+
+
+# Persistent string cache on disk, bounded by total size. Least recently used entries are evicted
+# first; hits touch the file mtime so the order survives restarts. The size bound is kept per
+# process: each worker counts what was on disk at its first write plus its own writes since, so a
+# directory shared by several workers can grow to roughly max_bytes times their number.
+class FileCache:
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+        self._sizes: OrderedDict[str, int] | None = None
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as cache_file:
+                value = cache_file.read()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except OSError:
+            with self._lock:
+                self.misses += 1
+                self.errors += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            if self._sizes is not None and key in self._sizes:
+                self._sizes.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        path = self._path(key)
+        data = value.encode("utf-8")
+        temp_path = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(file_descriptor, "wb") as temp_file:
+                temp_file.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            # The cache is an optimisation only; a read-only or full disk must not fail the caller.
+            with self._lock:
+                self.errors += 1
+            return
+        finally:
+            # Whatever failed between mkstemp and the rename, no half-written file is left behind.
+            if temp_path is not None and os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+        with self._lock:
+            sizes = self._load_index()
+            self._total_bytes += len(data) - sizes.pop(key, 0)
+            sizes[key] = len(data)
+            self._evict(sizes)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._sizes) if self._sizes is not None else None,
+                "bytes": self._total_bytes if self._sizes is not None else None,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else None,
+                "evictions": self.evictions,
+                "errors": self.errors,
+            }
+
+    def _evict(self, sizes: OrderedDict[str, int]) -> None:
+        while self._total_bytes > self.max_bytes and len(sizes) > 1:
+            key, size = sizes.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        # Built on first write from what is already on disk, oldest first.
+        if self._sizes is not None:
+            return self._sizes
+
+        entries = []
+        for root, _, file_names in os.walk(self.directory):
+            for file_name in file_names:
+                if not file_name.endswith(_SUFFIX):
+                    continue
+                try:
+                    file_stat = os.stat(os.path.join(root, file_name))
+                except OSError:
+                    continue
+                entries.append((file_stat.st_mtime, file_name[: -len(_SUFFIX)], file_stat.st_size))
+
+        self._sizes = OrderedDict((key, size) for _, key, size in sorted(entries))
+        self._total_bytes = sum(self._sizes.values())
+        return self._sizes
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + _SUFFIX)
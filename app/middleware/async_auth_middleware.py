@@ -0,0 +1,28 @@
+from fastapi import Cookie, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.async_database import get_async_auth_db
+from app.middleware.session_cache import get_cached_session, remember_session
+from app.repositories.session_repository import SessionRepository
+
+
+async def get_async_session(
+    session_token: str | None = Cookie(default=None, alias="session"),
+    db: AsyncSession = Depends(get_async_auth_db, scope="function"),
+):
+    if not session_token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Session token missing"
+        )
+
+    token_hash = SessionRepository.hash_token(session_token)
+    cached, session = get_cached_session(token_hash)
+    if not cached:
+        session = await db.run_sync(lambda sync_db: SessionRepository(sync_db).get_by_token_hash(token_hash))
+        session = remember_session(token_hash, session)
+        await db.close()
+
+    if not session:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid session")
+
+    return session
@@ -2,21 +2,26 @@ from fastapi import Cookie, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.database import get_auth_db
+from app.middleware.session_cache import get_cached_session, remember_session
 from app.repositories.session_repository import SessionRepository
 
 
 def get_session(
     session_token: str | None = Cookie(default=None, alias="session"),
-    db: Session = Depends(get_auth_db),
+    db: Session = Depends(get_auth_db, scope="function"),
 ):
     if not session_token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Session token missing"
         )
 
-    session_repository = SessionRepository(db)
-
-    session = session_repository.get_by_token(session_token)
+    token_hash = SessionRepository.hash_token(session_token)
+    cached, session = get_cached_session(token_hash)
+    if not cached:
+        session_repository = SessionRepository(db)
+        session = remember_session(token_hash, session_repository.get_by_token_hash(token_hash))
+        # Hand the connection back right away; a route that needs the auth DB checks one out again on first use.
+        db.close()
 
     if not session:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid session")
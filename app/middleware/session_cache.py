@@ -0,0 +1,62 @@
+import os
+from datetime import UTC, datetime
+
+from app.cache import TTLCache
+from app.models.session import SessionDB
+from app.repositories.session_repository import SessionRepository
+
+SESSION_CACHE_TTL_SECONDS = float(os.getenv("SESSION_CACHE_TTL_SECONDS", "60"))
+SESSION_CACHE_NEGATIVE_TTL_SECONDS = float(os.getenv("SESSION_CACHE_NEGATIVE_TTL_SECONDS", "5"))
+SESSION_CACHE_MAX_SIZE = int(os.getenv("SESSION_CACHE_MAX_SIZE", "10000"))
+
+# Keyed by token hash. Values are detached SessionDB snapshots, or None for tokens known to be invalid.
+session_cache = TTLCache(ttl_seconds=SESSION_CACHE_TTL_SECONDS, max_size=SESSION_CACHE_MAX_SIZE)
+
+_MISSING = object()
+
+
+def get_cached_session(token_hash: str) -> tuple[bool, SessionDB | None]:
+    session = session_cache.get(token_hash, _MISSING)
+    if session is _MISSING:
+        return False, None
+    return True, session
+
+
+def remember_session(token_hash: str, session: SessionDB | None) -> SessionDB | None:
+    if session is None:
+        session_cache.set(token_hash, None, SESSION_CACHE_NEGATIVE_TTL_SECONDS)
+        return None
+
+    snapshot = SessionDB(
+        id=session.id,
+        user_id=session.user_id,
+        token_hash=session.token_hash,
+        expires_at=session.expires_at,
+    )
+    ttl_seconds = min(SESSION_CACHE_TTL_SECONDS, _seconds_until(session.expires_at))
+    if ttl_seconds > 0:
+        session_cache.set(token_hash, snapshot, ttl_seconds)
+    return snapshot
+
+
+def evict_session(token: str) -> None:
+    session_cache.invalidate(SessionRepository.hash_token(token))
+
+
+def evict_user_sessions(user_id: str) -> None:
+    session_cache.invalidate_matching(
+        lambda _token_hash, session: session is not None and str(session.user_id) == str(user_id)
+    )
+
+
+def clear_session_cache() -> None:
+    session_cache.invalidate()
+
+
+def _seconds_until(expires_at: datetime | None) -> float:
+    if expires_at is None:
+        return 0.0
+    # expires_at is stored as naive UTC.
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=UTC)
+    return (expires_at - datetime.now(UTC)).total_seconds()
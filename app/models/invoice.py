@@ -115,6 +115,20 @@ class InvoiceUpdate(BaseModel):
     status: str | None = Field(default=None)
 
 
+class InvoiceListQuery(BaseModel):
+    status: str | None = Field(default=None)
+    provider_id: str | None = Field(default=None)
+    payer_id: str | None = Field(default=None)
+    request_id: int | None = Field(default=None)
+    date_from: dt_date | None = Field(default=None)
+    date_to: dt_date | None = Field(default=None)
+    is_urgent: bool | None = Field(default=None)
+    order: Literal["asc", "desc"] = Field(default="desc")
+    cursor: int | None = Field(default=None)
+    limit: int | None = Field(default=None, ge=1, le=500)
+    view: Literal["full", "summary"] = Field(default="full")
+
+
 class InvoiceItemCreate(BaseModel):
     name: str | None = Field(default=None)
     unit_name: str | None = Field(default=None)
@@ -127,6 +141,10 @@ class InvoiceItemCreate(BaseModel):
     converted_quantity: float | None = Field(default=None)
 
 
+class InvoiceItemBatchCreate(BaseModel):
+    items: list[InvoiceItemCreate] = Field(min_length=1, max_length=1000)
+
+
 class InvoiceItemUpdate(BaseModel):
     name: str | None = Field(default=None)
     unit_name: str | None = Field(default=None)
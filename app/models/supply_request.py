@@ -100,6 +100,21 @@ class SupplyRequestCreate(BaseModel):
     deadline: datetime | None = Field(default=None)
 
 
+class SupplyRequestListQuery(BaseModel):
+    status_id: str | None = Field(default=None)
+    object_levels_id: str | None = Field(default=None)
+    created_by: str | None = Field(default=None)
+    executor: str | None = Field(default=None)
+    created_from: datetime | None = Field(default=None)
+    created_to: datetime | None = Field(default=None)
+    deadline_from: datetime | None = Field(default=None)
+    deadline_to: datetime | None = Field(default=None)
+    order: Literal["asc", "desc"] = Field(default="desc")
+    cursor: int | None = Field(default=None)
+    limit: int | None = Field(default=None, ge=1, le=500)
+    view: Literal["full", "summary"] = Field(default="full")
+
+
 class SupplyRequestUpdate(BaseModel):
     object_levels_id: str | None = Field(default=None)
     name: str | None = Field(default=None)
@@ -133,6 +148,16 @@ class RequestItemUpdate(BaseModel):
     comment: str | None = Field(default=None)
 
 
+class RequestItemBatchUpdate(RequestItemUpdate):
+    id: str
+
+
+class RequestItemBatch(BaseModel):
+    create: list[RequestItemCreate] = Field(default_factory=list, max_length=1000)
+    update: list[RequestItemBatchUpdate] = Field(default_factory=list, max_length=1000)
+    delete: list[str] = Field(default_factory=list, max_length=1000)
+
+
 class NomenclatureCreate(BaseModel):
     warehouse_category_id: str
     name: str
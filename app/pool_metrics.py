@@ -0,0 +1,99 @@
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_CHECKED_OUT_AT = "checked_out_at"
+
+
+class PoolMetrics:
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.saturated_checkouts = 0
+        self.hold_seconds_total = 0.0
+        self.hold_seconds_max = 0.0
+        self._lock = threading.Lock()
+
+    def on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        connection_record.info[_CHECKED_OUT_AT] = time.monotonic()
+        capacity = self._capacity()
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+            # Reaching the pool capacity means the next checkout has to wait for pool_timeout.
+            if capacity is not None and self.checked_out >= capacity:
+                self.saturated_checkouts += 1
+
+    def on_checkin(self, dbapi_connection, connection_record) -> None:
+        checked_out_at = connection_record.info.pop(_CHECKED_OUT_AT, None)
+        with self._lock:
+            self.checkins += 1
+            if checked_out_at is None:
+                return
+            self.checked_out = max(self.checked_out - 1, 0)
+            held = time.monotonic() - checked_out_at
+            self.hold_seconds_total += held
+            self.hold_seconds_max = max(self.hold_seconds_max, held)
+
+    def on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> dict:
+        pool = self.engine.pool
+        with self._lock:
+            released = self.checkins
+            return {
+                "pool": pool.status(),
+                "pool_size": self._pool_attr("size"),
+                "max_overflow": getattr(pool, "_max_overflow", None),
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "saturated_checkouts": self.saturated_checkouts,
+                "hold_seconds_avg": round(self.hold_seconds_total / released, 6) if released else None,
+                "hold_seconds_max": round(self.hold_seconds_max, 6),
+            }
+
+    def _capacity(self) -> int | None:
+        size = self._pool_attr("size")
+        max_overflow = getattr(self.engine.pool, "_max_overflow", None)
+        if size is None or max_overflow is None or max_overflow < 0:
+            return None
+        return size + max_overflow
+
+    def _pool_attr(self, name: str) -> int | None:
+        attr = getattr(self.engine.pool, name, None)
+        return attr() if callable(attr) else None
+
+
+pool_metrics: dict[str, PoolMetrics] = {}
+
+
+def watch_pool(name: str, engine: Engine) -> PoolMetrics:
+    metrics = PoolMetrics(engine)
+    event.listen(engine, "connect", metrics.on_connect)
+    event.listen(engine, "checkout", metrics.on_checkout)
+    event.listen(engine, "checkin", metrics.on_checkin)
+    event.listen(engine, "invalidate", metrics.on_invalidate)
+    pool_metrics[name] = metrics
+    return metrics
+
+
+def get_pool_metrics() -> dict[str, dict]:
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
@@ -0,0 +1,165 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DB_SLOW_QUERY_MS = os.getenv("DB_SLOW_QUERY_MS")
+SLOW_QUERY_THRESHOLD_MS = float(DB_SLOW_QUERY_MS) if DB_SLOW_QUERY_MS else None
+STATEMENT_LOG_LENGTH = 500
+
+logger = logging.getLogger("app.query_stats")
+slow_query_logger = logging.getLogger("app.slow_query")
+
+_QUERY_STARTED_AT = "query_started_at"
+
+
+@dataclass
+class RequestQueryStats:
+    statements: int = 0
+    db_time_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_statement: str | None = None
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.statements += 1
+        self.db_time_ms += elapsed_ms
+        if elapsed_ms >= self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+
+
+# Shared by the threadpool and the gather() tasks of one request: they all get a copy of the
+# request context, so they see the same RequestQueryStats object.
+current_query_stats: ContextVar[RequestQueryStats | None] = ContextVar("current_query_stats", default=None)
+
+_route_stats: dict[str, dict] = {}
+_route_stats_lock = threading.Lock()
+
+
+def instrument_engine(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(_QUERY_STARTED_AT, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    _record_statement(conn, statement)
+
+
+def _handle_error(exception_context) -> None:
+    # Failed statements never reach after_cursor_execute.
+    if exception_context.connection is not None and exception_context.statement is not None:
+        _record_statement(exception_context.connection, exception_context.statement)
+
+
+def _record_statement(conn, statement: str) -> None:
+    started = conn.info.get(_QUERY_STARTED_AT)
+    if not started:
+        return
+    elapsed_ms = (time.perf_counter() - started.pop()) * 1000
+
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+
+    if SLOW_QUERY_THRESHOLD_MS is not None and elapsed_ms >= SLOW_QUERY_THRESHOLD_MS:
+        slow_query_logger.warning(
+            json.dumps(
+                {
+                    "event": "slow_query",
+                    "duration_ms": round(elapsed_ms, 2),
+                    "statement": statement[:STATEMENT_LOG_LENGTH],
+                },
+                ensure_ascii=False,
+            )
+        )
+
+
+def get_route_stats() -> dict[str, dict]:
+    with _route_stats_lock:
+        return {route: dict(stats) for route, stats in _route_stats.items()}
+
+
+def _record_route(route: str, stats: RequestQueryStats) -> None:
+    with _route_stats_lock:
+        route_stats = _route_stats.setdefault(
+            route,
+            {"requests": 0, "statements": 0, "max_statements": 0, "db_time_ms": 0.0, "max_db_time_ms": 0.0},
+        )
+        route_stats["requests"] += 1
+        route_stats["statements"] += stats.statements
+        route_stats["max_statements"] = max(route_stats["max_statements"], stats.statements)
+        route_stats["db_time_ms"] = round(route_stats["db_time_ms"] + stats.db_time_ms, 3)
+        route_stats["max_db_time_ms"] = round(max(route_stats["max_db_time_ms"], stats.db_time_ms), 3)
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = current_query_stats.set(stats)
+        started = time.perf_counter()
+        status_code = None
+
+        async def send_with_timing(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", self._server_timing(stats).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            route = self._route_path(scope)
+            _record_route(route, stats)
+            logger.info(
+                json.dumps(
+                    {
+                        "event": "request_finished",
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "route": route,
+                        "status": status_code,
+                        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                        "db_statements": stats.statements,
+                        "db_time_ms": round(stats.db_time_ms, 2),
+                        "db_slowest_ms": round(stats.slowest_ms, 2),
+                        "db_slowest_statement": (stats.slowest_statement or "")[:STATEMENT_LOG_LENGTH] or None,
+                    },
+                    ensure_ascii=False,
+                )
+            )
+
+    @staticmethod
+    def _server_timing(stats: RequestQueryStats) -> str:
+        return (
+            f'db;dur={stats.db_time_ms:.2f};desc="{stats.statements} statements", '
+            f"db-slowest;dur={stats.slowest_ms:.2f}"
+        )
+
+    @staticmethod
+    def _route_path(scope) -> str:
+        route = scope.get("route")
+        path = getattr(route, "path", None)
+        # Unmatched paths are grouped together to keep the route stats bounded.
+        return f"{scope['method']} {path or '<unmatched>'}"
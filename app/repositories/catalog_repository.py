@@ -3,6 +3,7 @@ import uuid
 from sqlalchemy.orm import Session
 
 from app.models.supply_request import NomenclatureRef, UnitRef, WarehouseCategoryRef
+from app.repositories.reference_table_repository import ReferenceTableRepository
 
 
 class CatalogRepository:
@@ -25,11 +26,13 @@ class CatalogRepository:
         )
         self.db.add(item)
         self.db.commit()
+        ReferenceTableRepository.invalidate(WarehouseCategoryRef.__tablename__)
         self.db.refresh(item)
         return item
 
     def save_warehouse_category(self, item: WarehouseCategoryRef) -> WarehouseCategoryRef:
         self.db.commit()
+        ReferenceTableRepository.invalidate(WarehouseCategoryRef.__tablename__)
         self.db.refresh(item)
         return item
 
@@ -1,78 +1,159 @@
-from sqlalchemy import text
+import os
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from sqlalchemy import TextClause, bindparam, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
+from app.cache import TTLCache
+
+COUNTERPARTY_SCHEMA_CACHE_TTL_SECONDS = float(os.getenv("COUNTERPARTY_SCHEMA_CACHE_TTL_SECONDS", "600"))
+
+schema_cache = TTLCache(ttl_seconds=COUNTERPARTY_SCHEMA_CACHE_TTL_SECONDS)
+
+_BRIEF_PLAN_KEY = "counterparty_brief_plan"
+
+_DETAILS_TABLES = (
+    ("IP", "details_ip", ["inn"]),
+    ("LLC", "details_llc", ["inn", "kpp"]),
+)
+
+
+@dataclass(frozen=True)
+class CounterpartyBriefPlan:
+    counterparties: TextClause | None = None
+    details: dict[str, TextClause] = field(default_factory=dict)
+    bank_accounts: TextClause | None = None
+
 
 class CounterpartyRepository:
     def __init__(self, db: Session) -> None:
         self.db = db
-        self._table_columns_cache: dict[str, set[str]] = {}
 
     def get_counterparty_brief(self, counterparty_id: str | None) -> dict | None:
         if not counterparty_id:
             return None
+        return self.get_counterparty_briefs([counterparty_id]).get(counterparty_id)
+
+    def get_counterparty_briefs(self, counterparty_ids: list[str | None]) -> dict[str, dict]:
+        unique_ids = list({counterparty_id for counterparty_id in counterparty_ids if counterparty_id})
+        if not unique_ids:
+            return {}
+
+        try:
+            return self._resolve_briefs(self._get_brief_plan(), unique_ids)
+        except SQLAlchemyError:
+            # The schema may have changed since the plan was compiled: recompile once and retry on
+            # a fresh transaction, the failed statement may have aborted the current one.
+            self.db.rollback()
+            self.invalidate_schema()
+            return self._resolve_briefs(self._get_brief_plan(), unique_ids)
+
+    @staticmethod
+    def invalidate_schema() -> None:
+        schema_cache.invalidate(_BRIEF_PLAN_KEY)
+
+    def _resolve_briefs(self, plan: CounterpartyBriefPlan, counterparty_ids: list[str]) -> dict[str, dict]:
+        if plan.counterparties is None:
+            return {}
+
+        counterparties = self._fetch(plan.counterparties, counterparty_ids)
+        if not counterparties:
+            return {}
+
+        ids_by_type = defaultdict(list)
+        for counterparty in counterparties:
+            counterparty_type = str(counterparty.get("type") or "").upper()
+            ids_by_type[counterparty_type].append(str(counterparty.get("id")))
+
+        details = {}
+        for counterparty_type, statement in plan.details.items():
+            if ids_by_type[counterparty_type]:
+                details.update(self._first_row_by_counterparty(self._fetch(statement, ids_by_type[counterparty_type])))
+
+        banks = {}
+        if plan.bank_accounts is not None:
+            banks = self._first_row_by_counterparty(
+                self._fetch(plan.bank_accounts, [str(counterparty.get("id")) for counterparty in counterparties])
+            )
+
+        result = {}
+        for counterparty in counterparties:
+            counterparty_id = str(counterparty.get("id"))
+            detail = details.get(counterparty_id)
+            bank = banks.get(counterparty_id)
+            result[counterparty_id] = {
+                "id": counterparty.get("id"),
+                "short_name": counterparty.get("short_name"),
+                "inn": detail.get("inn") if detail else None,
+                "kpp": detail.get("kpp") if detail else None,
+                "checking_account": bank.get("checking_account") if bank else None,
+            }
+        return result
+
+    def _fetch(self, statement: TextClause, counterparty_ids: list[str]):
+        return self.db.execute(statement, {"counterparty_ids": counterparty_ids}).mappings().all()
+
+    def _get_brief_plan(self) -> CounterpartyBriefPlan:
+        plan = schema_cache.get(_BRIEF_PLAN_KEY)
+        if plan is not None:
+            return plan
+
+        plan, complete = self._compile_brief_plan()
+        # A plan built from a failed introspection is used once but not cached.
+        if complete:
+            schema_cache.set(_BRIEF_PLAN_KEY, plan)
+        return plan
+
+    def _compile_brief_plan(self) -> tuple[CounterpartyBriefPlan, bool]:
+        complete = True
 
         counterparty_columns = self._get_table_columns("counterparties")
+        if counterparty_columns is None:
+            return CounterpartyBriefPlan(), False
         if "id" not in counterparty_columns:
-            return None
+            return CounterpartyBriefPlan(), True
 
         select_columns = ["id"]
         if "short_name" in counterparty_columns:
             select_columns.append("short_name")
         if "type" in counterparty_columns:
             select_columns.append("type")
+        counterparties_statement = self._in_statement(
+            f"SELECT {', '.join(select_columns)} "
+            "FROM counterparties "
+            "WHERE id IN :counterparty_ids"
+        )
 
-        counterparty = self.db.execute(
-            text(
-                f"SELECT {', '.join(select_columns)} "
-                "FROM counterparties "
-                "WHERE id = :counterparty_id "
-                "LIMIT 1"
-            ),
-            {"counterparty_id": counterparty_id},
-        ).mappings().first()
-        if not counterparty:
-            return None
-
-        inn: str | None = None
-        kpp: str | None = None
-        counterparty_type = str(counterparty.get("type") or "").upper()
-        if counterparty_type == "IP":
-            details = self._get_details_row(
-                table_name="details_ip",
-                counterparty_id=counterparty_id,
-                select_columns=["inn"],
-            )
-            inn = details.get("inn") if details else None
-        elif counterparty_type == "LLC":
-            details = self._get_details_row(
-                table_name="details_llc",
-                counterparty_id=counterparty_id,
-                select_columns=["inn", "kpp"],
-            )
-            if details:
-                inn = details.get("inn")
-                kpp = details.get("kpp")
-
-        bank = self._get_bank_account_row(counterparty_id)
-
-        return {
-            "id": counterparty.get("id"),
-            "short_name": counterparty.get("short_name"),
-            "inn": inn,
-            "kpp": kpp,
-            "checking_account": bank.get("checking_account") if bank else None,
-        }
+        details = {}
+        for counterparty_type, table_name, select_columns in _DETAILS_TABLES:
+            table_columns = self._get_table_columns(table_name)
+            if table_columns is None:
+                complete = False
+                continue
+            statement = self._compile_details_statement(table_name, table_columns, select_columns)
+            if statement is not None:
+                details[counterparty_type] = statement
+
+        bank_columns = self._get_table_columns("bank_accounts")
+        if bank_columns is None:
+            complete = False
+            bank_columns = set()
+
+        plan = CounterpartyBriefPlan(
+            counterparties=counterparties_statement,
+            details=details,
+            bank_accounts=self._compile_bank_account_statement(bank_columns),
+        )
+        return plan, complete
 
-    def _get_details_row(
+    def _compile_details_statement(
         self,
         table_name: str,
-        counterparty_id: str,
+        table_columns: set[str],
         select_columns: list[str],
-    ) -> dict | None:
-        table_columns = self._get_table_columns(table_name)
-        if not table_columns:
-            return None
-
+    ) -> TextClause | None:
         fk_column = self._resolve_counterparty_fk_column(table_columns)
         if not fk_column:
             return None
@@ -81,21 +162,13 @@ class CounterpartyRepository:
         if not columns:
             return None
 
-        return self.db.execute(
-            text(
-                f"SELECT {', '.join(columns)} "
-                f"FROM {table_name} "
-                f"WHERE {fk_column} = :counterparty_id "
-                "LIMIT 1"
-            ),
-            {"counterparty_id": counterparty_id},
-        ).mappings().first()
-
-    def _get_bank_account_row(self, counterparty_id: str) -> dict | None:
-        table_columns = self._get_table_columns("bank_accounts")
-        if not table_columns:
-            return None
+        return self._in_statement(
+            f"SELECT {fk_column} AS counterparty_id, {', '.join(columns)} "
+            f"FROM {table_name} "
+            f"WHERE {fk_column} IN :counterparty_ids"
+        )
 
+    def _compile_bank_account_statement(self, table_columns: set[str]) -> TextClause | None:
         fk_column = self._resolve_counterparty_fk_column(table_columns)
         if not fk_column:
             return None
@@ -107,34 +180,35 @@ class CounterpartyRepository:
         if not account_column:
             return None
 
-        where_parts = [f"{fk_column} = :counterparty_id"]
+        where_parts = [f"{fk_column} IN :counterparty_ids"]
         if "is_main" in table_columns:
             where_parts.append("is_main = 1")
         elif "main" in table_columns:
             where_parts.append("main = 1")
 
-        return self.db.execute(
-            text(
-                f"SELECT {account_column} AS checking_account "
-                "FROM bank_accounts "
-                f"WHERE {' AND '.join(where_parts)} "
-                "LIMIT 1"
-            ),
-            {"counterparty_id": counterparty_id},
-        ).mappings().first()
+        return self._in_statement(
+            f"SELECT {fk_column} AS counterparty_id, {account_column} AS checking_account "
+            "FROM bank_accounts "
+            f"WHERE {' AND '.join(where_parts)}"
+        )
+
+    @staticmethod
+    def _in_statement(sql: str) -> TextClause:
+        return text(sql).bindparams(bindparam("counterparty_ids", expanding=True))
 
-    def _get_table_columns(self, table_name: str) -> set[str]:
-        if table_name in self._table_columns_cache:
-            return self._table_columns_cache[table_name]
+    @staticmethod
+    def _first_row_by_counterparty(rows) -> dict[str, dict]:
+        result = {}
+        for row in rows:
+            result.setdefault(str(row["counterparty_id"]), row)
+        return result
 
+    def _get_table_columns(self, table_name: str) -> set[str] | None:
         try:
             rows = self.db.execute(text(f"SHOW COLUMNS FROM {table_name}")).mappings().all()
-            columns = {str(row["Field"]) for row in rows}
         except Exception:
-            columns = set()
-
-        self._table_columns_cache[table_name] = columns
-        return columns
+            return None
+        return {str(row["Field"]) for row in rows}
 
     @staticmethod
     def _resolve_first_existing(columns: set[str], candidates: list[str]) -> str | None:
@@ -1,15 +1,20 @@
 import uuid
 from datetime import datetime
 
+from sqlalchemy import exists, func, insert, or_
 from sqlalchemy.orm import Session
 
-from app.models.invoice import Invoice, InvoiceItem, InvoiceLog, InvoicePayment
-from app.models.supply_request import StatusRef, SupplyRequest, UnitRef
+from app.models.invoice import Invoice, InvoiceItem, InvoiceListQuery, InvoiceLog, InvoicePayment
+from app.models.supply_request import SupplyRequest
+from app.repositories.reference_table_repository import ReferenceTableRepository
+
+DEFAULT_PAGE_SIZE = 50
 
 
 class InvoiceRepository:
     def __init__(self, db: Session) -> None:
         self.db = db
+        self.reference_tables = ReferenceTableRepository(db)
 
     def create_invoice(self, payload: dict) -> Invoice:
         row = Invoice(**payload)
@@ -21,13 +26,69 @@ class InvoiceRepository:
     def get_invoice_by_id(self, invoice_id: int) -> Invoice | None:
         return self.db.query(Invoice).filter(Invoice.id == invoice_id).first()
 
-    def get_invoices(self) -> list[Invoice]:
-        return self.db.query(Invoice).order_by(Invoice.id.desc()).all()
-
-    def get_invoices_by_ids(self, invoice_ids: list[int]) -> list[Invoice]:
-        if not invoice_ids:
-            return []
-        return self.db.query(Invoice).filter(Invoice.id.in_(invoice_ids)).order_by(Invoice.id.desc()).all()
+    def get_invoices(
+        self,
+        filters: InvoiceListQuery | None = None,
+        visible_to: str | None = None,
+    ) -> list[Invoice]:
+        return self._list_query(filters, visible_to).all()
+
+    def get_invoice_page(
+        self,
+        filters: InvoiceListQuery,
+        visible_to: str | None = None,
+    ) -> tuple[list[Invoice], int | None]:
+        limit = filters.limit or DEFAULT_PAGE_SIZE
+        invoices = self._list_query(filters, visible_to).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(invoices) > limit:
+            invoices = invoices[:limit]
+            next_cursor = invoices[-1].id
+        return invoices, next_cursor
+
+    @staticmethod
+    def _visible_to_clause(user_id: str):
+        has_log = exists().where(
+            InvoiceLog.invoice_id == Invoice.id,
+            InvoiceLog.user_id == user_id,
+        )
+        return or_(Invoice.created_by == user_id, has_log)
+
+    def _list_query(
+        self,
+        filters: InvoiceListQuery | None = None,
+        visible_to: str | None = None,
+    ):
+        query = self.db.query(Invoice)
+        if visible_to:
+            query = query.filter(self._visible_to_clause(visible_to))
+        if filters is None:
+            return query.order_by(Invoice.id.desc())
+
+        if filters.status:
+            query = query.filter(Invoice.status == filters.status)
+        if filters.provider_id:
+            query = query.filter(Invoice.provider_id == filters.provider_id)
+        if filters.payer_id:
+            query = query.filter(Invoice.payer_id == filters.payer_id)
+        if filters.request_id is not None:
+            query = query.filter(Invoice.request_id == filters.request_id)
+        if filters.date_from:
+            query = query.filter(Invoice.date >= filters.date_from)
+        if filters.date_to:
+            query = query.filter(Invoice.date <= filters.date_to)
+        if filters.is_urgent is not None:
+            query = query.filter(Invoice.is_urgent == filters.is_urgent)
+
+        if filters.order == "asc":
+            if filters.cursor is not None:
+                query = query.filter(Invoice.id > filters.cursor)
+            return query.order_by(Invoice.id.asc())
+
+        if filters.cursor is not None:
+            query = query.filter(Invoice.id < filters.cursor)
+        return query.order_by(Invoice.id.desc())
 
     def save_invoice(self, row: Invoice) -> Invoice:
         row.updated_at = datetime.utcnow()
@@ -77,6 +138,52 @@ class InvoiceRepository:
         self.db.refresh(item)
         return item
 
+    def create_invoice_items(self, invoice_id: int, payloads: list[dict]) -> list[InvoiceItem]:
+        try:
+            item_ids = self._insert_invoice_items(invoice_id, payloads)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return self._get_invoice_items_by_ids(item_ids)
+
+    def replace_invoice_items(self, invoice: Invoice, header: dict, payloads: list[dict]) -> int:
+        # Header update, deletion of the old items and the new inserts commit or roll back together.
+        try:
+            for key, value in header.items():
+                setattr(invoice, key, value)
+            invoice.updated_at = datetime.utcnow()
+            (
+                self.db.query(InvoiceItem)
+                .filter(InvoiceItem.invoice_id == invoice.id)
+                .delete(synchronize_session=False)
+            )
+            item_ids = self._insert_invoice_items(invoice.id, payloads)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return len(item_ids)
+
+    def _insert_invoice_items(self, invoice_id: int, payloads: list[dict]) -> list[str]:
+        if not payloads:
+            return []
+        # One executemany for all rows; the driver batches the VALUES lists.
+        rows = [{"id": str(uuid.uuid4()), "invoice_id": invoice_id, **payload} for payload in payloads]
+        columns = {column for row in rows for column in row}
+        # render_nulls keeps rows with empty fields in the same INSERT instead of regrouping them.
+        self.db.execute(
+            insert(InvoiceItem).execution_options(render_nulls=True),
+            [{column: row.get(column) for column in columns} for row in rows],
+        )
+        return [row["id"] for row in rows]
+
+    def _get_invoice_items_by_ids(self, item_ids: list[str]) -> list[InvoiceItem]:
+        if not item_ids:
+            return []
+        items_by_id = {item.id: item for item in self.db.query(InvoiceItem).filter(InvoiceItem.id.in_(item_ids))}
+        return [items_by_id[item_id] for item_id in item_ids if item_id in items_by_id]
+
     def get_invoice_item_by_id(self, invoice_id: int, item_id: str) -> InvoiceItem | None:
         return (
             self.db.query(InvoiceItem)
@@ -96,14 +203,6 @@ class InvoiceRepository:
         self.db.delete(item)
         self.db.commit()
 
-    def delete_invoice_items_by_invoice_id(self, invoice_id: int) -> None:
-        (
-            self.db.query(InvoiceItem)
-            .filter(InvoiceItem.invoice_id == invoice_id)
-            .delete(synchronize_session=False)
-        )
-        self.db.commit()
-
     def get_invoice_logs(self, invoice_id: int) -> list[InvoiceLog]:
         return (
             self.db.query(InvoiceLog)
@@ -134,14 +233,6 @@ class InvoiceRepository:
         self.db.refresh(row)
         return row
 
-    def get_invoice_logs_by_user(self, user_id: str) -> list[InvoiceLog]:
-        return (
-            self.db.query(InvoiceLog)
-            .filter(InvoiceLog.user_id == user_id)
-            .order_by(InvoiceLog.id.desc())
-            .all()
-        )
-
     def get_invoice_logs_by_invoice_ids(self, invoice_ids: list[int]) -> list[InvoiceLog]:
         if not invoice_ids:
             return []
@@ -196,16 +287,70 @@ class InvoiceRepository:
     def get_status_name(self, status_id: str | None) -> str | None:
         if not status_id:
             return None
-        row = self.db.query(StatusRef).filter(StatusRef.id == status_id).first()
+        row = self.reference_tables.get_statuses().get(status_id)
         return row.name if row else None
 
-    def get_unit_names(self, unit_ids: list[str]) -> dict[str, str]:
-        if not unit_ids:
+    def get_status_names(self, status_ids: list[str]) -> dict[str, str]:
+        unique_ids = {status_id for status_id in status_ids if status_id}
+        if not unique_ids:
+            return {}
+        statuses = self.reference_tables.get_statuses()
+        return {status_id: statuses[status_id].name for status_id in unique_ids if status_id in statuses}
+
+    def get_invoice_counts(self, invoice_ids: list[int]) -> dict[int, dict]:
+        if not invoice_ids:
             return {}
 
+        # One round trip: correlated subqueries per invoice instead of a grouped query per table.
+        items_count = (
+            self.db.query(func.count(InvoiceItem.id))
+            .filter(InvoiceItem.invoice_id == Invoice.id)
+            .correlate(Invoice)
+            .scalar_subquery()
+        )
+        logs_count = (
+            self.db.query(func.count(InvoiceLog.id))
+            .filter(InvoiceLog.invoice_id == Invoice.id)
+            .correlate(Invoice)
+            .scalar_subquery()
+        )
+        payments_count = (
+            self.db.query(func.count(InvoicePayment.id))
+            .filter(InvoicePayment.invoice_id == Invoice.id)
+            .correlate(Invoice)
+            .scalar_subquery()
+        )
+        paid_total = (
+            self.db.query(func.coalesce(func.sum(InvoicePayment.paid), 0))
+            .filter(InvoicePayment.invoice_id == Invoice.id)
+            .correlate(Invoice)
+            .scalar_subquery()
+        )
         rows = (
-            self.db.query(UnitRef.id, UnitRef.name)
-            .filter(UnitRef.id.in_(unit_ids))
+            self.db.query(Invoice.id, items_count, logs_count, payments_count, paid_total)
+            .filter(Invoice.id.in_(invoice_ids))
             .all()
         )
-        return {str(unit_id): unit_name for unit_id, unit_name in rows}
+        counts = {
+            invoice_id: {
+                "items_count": items,
+                "logs_count": logs,
+                "payments_count": payments,
+                "paid_total": float(paid),
+            }
+            for invoice_id, items, logs, payments, paid in rows
+        }
+        return {
+            invoice_id: counts.get(
+                invoice_id,
+                {"items_count": 0, "logs_count": 0, "payments_count": 0, "paid_total": 0.0},
+            )
+            for invoice_id in invoice_ids
+        }
+
+    def get_unit_names(self, unit_ids: list[str]) -> dict[str, str]:
+        if not unit_ids:
+            return {}
+
+        units = self.reference_tables.get_units()
+        return {str(unit_id): units[unit_id].name for unit_id in unit_ids if unit_id in units}
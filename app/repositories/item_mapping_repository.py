@@ -1,15 +1,18 @@
 import uuid
 
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
 from app.models.invoice import InvoiceItem
 from app.models.item_mapping import ItemMapping
 from app.models.supply_request import RequestItem, UnitRef
+from app.repositories.reference_table_repository import ReferenceTableRepository
 
 
 class ItemMappingRepository:
     def __init__(self, db: Session) -> None:
         self.db = db
+        self.reference_tables = ReferenceTableRepository(db)
 
     def get_mapping_by_id(self, mapping_id: str) -> ItemMapping | None:
         return self.db.query(ItemMapping).filter(ItemMapping.id == mapping_id).first()
@@ -77,6 +80,38 @@ class ItemMappingRepository:
         row = query.first()
         return row.mapped_quantity if row else None
 
+    def get_kit_head_quantities(
+        self,
+        keys: list[tuple[int | None, int | None, int]],
+    ) -> dict[tuple[int | None, int | None, int], float | None]:
+        unique_keys = set(keys)
+        if not unique_keys:
+            return {}
+
+        query = self.db.query(ItemMapping).filter(
+            ItemMapping.match_type == "kit_head",
+            ItemMapping.group_number.in_({group_number for _, _, group_number in unique_keys}),
+        )
+        query = query.filter(self._in_or_null(ItemMapping.request_id, {request_id for request_id, _, _ in unique_keys}))
+        query = query.filter(self._in_or_null(ItemMapping.invoice_id, {invoice_id for _, invoice_id, _ in unique_keys}))
+
+        result = {}
+        for row in query.all():
+            key = (row.request_id, row.invoice_id, row.group_number)
+            if key in unique_keys:
+                result.setdefault(key, row.mapped_quantity)
+        return result
+
+    @staticmethod
+    def _in_or_null(column, values: set):
+        present = [value for value in values if value is not None]
+        clauses = []
+        if present:
+            clauses.append(column.in_(present))
+        if None in values:
+            clauses.append(column.is_(None))
+        return or_(*clauses)
+
     def create_mapping(self, payload: dict) -> ItemMapping:
         row = ItemMapping(id=str(uuid.uuid4()), **payload)
         self.db.add(row)
@@ -115,5 +150,5 @@ class ItemMappingRepository:
     def get_unit_names(self, unit_ids: list[str]) -> dict[str, str]:
         if not unit_ids:
             return {}
-        rows = self.db.query(UnitRef.id, UnitRef.name).filter(UnitRef.id.in_(unit_ids)).all()
-        return {str(unit_id): unit_name for unit_id, unit_name in rows}
+        units = self.reference_tables.get_units()
+        return {str(unit_id): units[unit_id].name for unit_id in unit_ids if unit_id in units}
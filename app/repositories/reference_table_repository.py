@@ -0,0 +1,58 @@
+import os
+from dataclasses import dataclass
+
+from sqlalchemy.orm import Session
+
+from app.cache import TTLCache
+from app.models.supply_request import StatusRef, UnitRef, WarehouseCategoryRef
+
+REFERENCE_CACHE_TTL_SECONDS = float(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "300"))
+
+reference_cache = TTLCache(ttl_seconds=REFERENCE_CACHE_TTL_SECONDS)
+
+
+@dataclass(frozen=True)
+class ReferenceRow:
+    id: str
+    name: str
+    parent_id: str | None = None
+
+
+class ReferenceTableRepository:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def get_statuses(self) -> dict[str, ReferenceRow]:
+        return reference_cache.get_or_load(StatusRef.__tablename__, self._load_statuses)
+
+    def get_units(self) -> dict[str, ReferenceRow]:
+        return reference_cache.get_or_load(UnitRef.__tablename__, self._load_units)
+
+    def get_warehouse_categories(self) -> dict[str, ReferenceRow]:
+        return reference_cache.get_or_load(
+            WarehouseCategoryRef.__tablename__,
+            self._load_warehouse_categories,
+        )
+
+    @staticmethod
+    def invalidate(table_name: str | None = None) -> None:
+        reference_cache.invalidate(table_name)
+
+    def _load_statuses(self) -> dict[str, ReferenceRow]:
+        rows = self.db.query(StatusRef.id, StatusRef.name).all()
+        return {row_id: ReferenceRow(id=row_id, name=row_name) for row_id, row_name in rows}
+
+    def _load_units(self) -> dict[str, ReferenceRow]:
+        rows = self.db.query(UnitRef.id, UnitRef.name).all()
+        return {row_id: ReferenceRow(id=row_id, name=row_name) for row_id, row_name in rows}
+
+    def _load_warehouse_categories(self) -> dict[str, ReferenceRow]:
+        rows = self.db.query(
+            WarehouseCategoryRef.id,
+            WarehouseCategoryRef.name,
+            WarehouseCategoryRef.parent_id,
+        ).all()
+        return {
+            row_id: ReferenceRow(id=row_id, name=row_name, parent_id=parent_id)
+            for row_id, row_name, parent_id in rows
+        }
@@ -1,3 +1,4 @@
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.models.request_file import FileAudit, FileDB, FileType, RequestFile
@@ -31,18 +32,16 @@ class RequestFileRepository:
             .first()
         )
 
-    def create_file_and_link(self, file_row: FileDB, request_file_row: RequestFile) -> FileDB:
-        self.db.add(file_row)
-        self.db.add(request_file_row)
-        self.db.commit()
-        self.db.refresh(file_row)
-        return file_row
-
-    def create_file(self, file_row: FileDB) -> FileDB:
-        self.db.add(file_row)
-        self.db.commit()
-        self.db.refresh(file_row)
-        return file_row
+    def add_file_rows(self, file_row: FileDB, related_rows: list) -> None:
+        try:
+            self.db.add(file_row)
+            # Links and audit rows reference files.id, so the file row is flushed first.
+            self.db.flush()
+            self.db.add_all(related_rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
 
     def get_request_files(self, request_id: int, link_type: str | None = None):
         query = (
@@ -78,9 +77,13 @@ class RequestFileRepository:
         )
         return row
 
-    def add_audit(self, audit: FileAudit) -> None:
-        self.db.add(audit)
-        self.db.commit()
+    def add_audits(self, rows: list[dict]) -> None:
+        try:
+            self.db.execute(insert(FileAudit), rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
 
     def mark_file_deleted(self, file_row: FileDB) -> None:
         file_row.status = "deleted"
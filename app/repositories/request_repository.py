@@ -1,6 +1,7 @@
 import uuid
 from collections import defaultdict
 
+from sqlalchemy import String, cast, exists, func, insert, or_
 from sqlalchemy.orm import Session
 
 from app.models.invoice import Invoice
@@ -8,27 +9,160 @@ from app.models.supply_request import (
     NomenclatureRef,
     RequestItem,
     RequestLog,
-    StatusRef,
     SupplyRequest,
-    UnitRef,
-    WarehouseCategoryRef,
+    SupplyRequestListQuery,
 )
+from app.repositories.reference_table_repository import ReferenceRow, ReferenceTableRepository
+
+DEFAULT_PAGE_SIZE = 50
 
 
 class RequestRepository:
     def __init__(self, db: Session) -> None:
         self.db = db
+        self.reference_tables = ReferenceTableRepository(db)
+
+    def get_all(
+        self,
+        filters: SupplyRequestListQuery | None = None,
+        visible_to: str | None = None,
+    ) -> list[dict]:
+        requests = self._list_query(filters, visible_to).all()
+        return self._serializer_for(filters)(requests)
+
+    def get_page(
+        self,
+        filters: SupplyRequestListQuery,
+        visible_to: str | None = None,
+    ) -> tuple[list[dict], int | None]:
+        limit = filters.limit or DEFAULT_PAGE_SIZE
+        requests = self._list_query(filters, visible_to).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(requests) > limit:
+            requests = requests[:limit]
+            next_cursor = requests[-1].id
+        return self._serializer_for(filters)(requests), next_cursor
+
+    @staticmethod
+    def _visible_to_clause(user_id: str):
+        has_log = exists().where(
+            RequestLog.request_id == cast(SupplyRequest.id, String),
+            RequestLog.user_id == user_id,
+        )
+        return or_(
+            SupplyRequest.created_by == user_id,
+            SupplyRequest.executor == user_id,
+            has_log,
+        )
 
-    def get_all(self):
-        requests = self.db.query(SupplyRequest).order_by(SupplyRequest.id.desc()).all()
+    def _list_query(
+        self,
+        filters: SupplyRequestListQuery | None = None,
+        visible_to: str | None = None,
+    ):
+        query = self.db.query(SupplyRequest)
+        if visible_to:
+            query = query.filter(self._visible_to_clause(visible_to))
+        if filters is None:
+            return query.order_by(SupplyRequest.id.desc())
+
+        if filters.status_id:
+            query = query.filter(SupplyRequest.status_id == filters.status_id)
+        if filters.object_levels_id:
+            query = query.filter(SupplyRequest.object_levels_id == filters.object_levels_id)
+        if filters.created_by:
+            query = query.filter(SupplyRequest.created_by == filters.created_by)
+        if filters.executor:
+            query = query.filter(SupplyRequest.executor == filters.executor)
+        if filters.created_from:
+            query = query.filter(SupplyRequest.created_at >= filters.created_from)
+        if filters.created_to:
+            query = query.filter(SupplyRequest.created_at <= filters.created_to)
+        if filters.deadline_from:
+            query = query.filter(SupplyRequest.deadline >= filters.deadline_from)
+        if filters.deadline_to:
+            query = query.filter(SupplyRequest.deadline <= filters.deadline_to)
+
+        if filters.order == "asc":
+            if filters.cursor is not None:
+                query = query.filter(SupplyRequest.id > filters.cursor)
+            return query.order_by(SupplyRequest.id.asc())
+
+        if filters.cursor is not None:
+            query = query.filter(SupplyRequest.id < filters.cursor)
+        return query.order_by(SupplyRequest.id.desc())
+
+    def get_by_id(self, request_id: int, visible_to: str | None = None) -> dict | None:
+        query = self.db.query(SupplyRequest).filter(SupplyRequest.id == request_id)
+        if visible_to:
+            query = query.filter(self._visible_to_clause(visible_to))
+
+        request_row = query.first()
+        if not request_row:
+            return None
+        return self._serialize_requests([request_row])[0]
+
+    def _serializer_for(self, filters: SupplyRequestListQuery | None):
+        if filters is not None and filters.view == "summary":
+            return self._summarize_requests
+        return self._serialize_requests
+
+    def _summarize_requests(self, requests: list[SupplyRequest]) -> list[dict]:
         if not requests:
             return []
 
         request_ids = [req.id for req in requests]
         request_ids_str = [str(req_id) for req_id in request_ids]
 
-        statuses = self.db.query(StatusRef).all()
-        statuses_by_id = {status.id: status for status in statuses}
+        statuses_by_id = self.reference_tables.get_statuses()
+
+        items_count = dict(
+            self.db.query(RequestItem.request_id, func.count(RequestItem.id))
+            .filter(RequestItem.request_id.in_(request_ids))
+            .group_by(RequestItem.request_id)
+            .all()
+        )
+        logs_count = dict(
+            self.db.query(RequestLog.request_id, func.count(RequestLog.id))
+            .filter(RequestLog.request_id.in_(request_ids_str))
+            .group_by(RequestLog.request_id)
+            .all()
+        )
+        invoices_count = dict(
+            self.db.query(Invoice.request_id, func.count(Invoice.id))
+            .filter(Invoice.request_id.in_(request_ids))
+            .group_by(Invoice.request_id)
+            .all()
+        )
+
+        result = []
+        for req in requests:
+            status = statuses_by_id.get(req.status_id)
+            result.append(
+                {
+                    "id": req.id,
+                    "object_levels_id": req.object_levels_id,
+                    "name": req.name,
+                    "created_by": req.created_by,
+                    "executor": req.executor,
+                    "created_at": req.created_at,
+                    "deadline": req.deadline,
+                    "status": None if not status else {"id": status.id, "name": status.name},
+                    "items_count": items_count.get(req.id, 0),
+                    "logs_count": logs_count.get(str(req.id), 0),
+                    "invoices_count": invoices_count.get(req.id, 0),
+                }
+            )
+
+        return result
+
+    def _serialize_requests(self, requests: list[SupplyRequest]) -> list[dict]:
+        if not requests:
+            return []
+
+        request_ids = [req.id for req in requests]
+        request_ids_str = [str(req_id) for req_id in request_ids]
 
         items = self.db.query(RequestItem).filter(RequestItem.request_id.in_(request_ids)).all()
         items_by_request_id = defaultdict(list)
@@ -36,9 +170,6 @@ class RequestRepository:
             items_by_request_id[item.request_id].append(item)
 
         nomenclature_ids = list({item.nomenclature_id for item in items if item.nomenclature_id})
-        unit_ids = {item.unit_id for item in items if item.unit_id}
-        warehouse_ids = {item.warehouse_category_id for item in items if item.warehouse_category_id}
-
         nomenclature_rows = []
         if nomenclature_ids:
             nomenclature_rows = (
@@ -47,25 +178,9 @@ class RequestRepository:
                 .all()
             )
         nomenclature_by_id = {row.id: row for row in nomenclature_rows}
-        for nomenclature in nomenclature_rows:
-            if nomenclature.unit_id:
-                unit_ids.add(nomenclature.unit_id)
-            if nomenclature.warehouse_category_id:
-                warehouse_ids.add(nomenclature.warehouse_category_id)
-
-        unit_rows = []
-        if unit_ids:
-            unit_rows = self.db.query(UnitRef).filter(UnitRef.id.in_(list(unit_ids))).all()
-        units_by_id = {row.id: row for row in unit_rows}
-
-        warehouse_rows = []
-        if warehouse_ids:
-            warehouse_rows = (
-                self.db.query(WarehouseCategoryRef)
-                .filter(WarehouseCategoryRef.id.in_(list(warehouse_ids)))
-                .all()
-            )
-        warehouse_by_id = {row.id: row for row in warehouse_rows}
+
+        units_by_id = self.reference_tables.get_units()
+        warehouse_by_id = self.reference_tables.get_warehouse_categories()
 
         logs = self.db.query(RequestLog).filter(RequestLog.request_id.in_(request_ids_str)).all()
         logs_by_request_id = defaultdict(list)
@@ -73,6 +188,8 @@ class RequestRepository:
             logs_by_request_id[log.request_id].append(log)
 
         invoices = self.db.query(Invoice).filter(Invoice.request_id.in_(request_ids)).all()
+        statuses_by_id = self.reference_tables.get_statuses()
+
         invoices_by_request_id = defaultdict(list)
         for invoice in invoices:
             status = statuses_by_id.get(invoice.status)
@@ -205,21 +322,78 @@ class RequestRepository:
             self.db.query(SupplyRequest.id).filter(SupplyRequest.id == request_id).first() is not None
         )
 
-    def get_units_by_ids(self, unit_ids: list[str]) -> list[UnitRef]:
+    def get_units_by_ids(self, unit_ids: list[str]) -> list[ReferenceRow]:
         unique_ids = list({item for item in unit_ids if item})
         if not unique_ids:
             return []
-        return self.db.query(UnitRef).filter(UnitRef.id.in_(unique_ids)).all()
+        units_by_id = self.reference_tables.get_units()
+        return [units_by_id[unit_id] for unit_id in unique_ids if unit_id in units_by_id]
 
-    def get_warehouse_categories_by_ids(self, category_ids: list[str]) -> list[WarehouseCategoryRef]:
+    def get_warehouse_categories_by_ids(self, category_ids: list[str]) -> list[ReferenceRow]:
         unique_ids = list({item for item in category_ids if item})
         if not unique_ids:
             return []
-        return self.db.query(WarehouseCategoryRef).filter(WarehouseCategoryRef.id.in_(unique_ids)).all()
+        categories_by_id = self.reference_tables.get_warehouse_categories()
+        return [categories_by_id[category_id] for category_id in unique_ids if category_id in categories_by_id]
 
     def get_nomenclature_by_id(self, nomenclature_id: str) -> NomenclatureRef | None:
         return self.db.query(NomenclatureRef).filter(NomenclatureRef.id == nomenclature_id).first()
 
+    def get_nomenclature_by_ids(self, nomenclature_ids: list[str]) -> dict[str, NomenclatureRef]:
+        unique_ids = list({item for item in nomenclature_ids if item})
+        if not unique_ids:
+            return {}
+        rows = self.db.query(NomenclatureRef).filter(NomenclatureRef.id.in_(unique_ids)).all()
+        return {row.id: row for row in rows}
+
+    def get_request_items_by_ids(self, request_id: int, item_ids: list[str]) -> dict[str, RequestItem]:
+        if not item_ids:
+            return {}
+        rows = (
+            self.db.query(RequestItem)
+            .filter(
+                RequestItem.request_id == request_id,
+                RequestItem.id.in_(list(set(item_ids))),
+            )
+            .all()
+        )
+        return {row.id: row for row in rows}
+
+    def apply_request_item_batch(
+        self,
+        request_id: int,
+        creates: list[dict],
+        updates: list[tuple[RequestItem, dict]],
+        deletes: list[RequestItem],
+    ) -> list[str]:
+        # Deletes, updates and inserts share one transaction: either the whole batch lands or none of it.
+        try:
+            if deletes:
+                (
+                    self.db.query(RequestItem)
+                    .filter(RequestItem.id.in_([item.id for item in deletes]))
+                    .delete(synchronize_session=False)
+                )
+            for item, payload in updates:
+                for key, value in payload.items():
+                    setattr(item, key, value)
+
+            created_ids = []
+            if creates:
+                rows = [{"id": str(uuid.uuid4()), "request_id": request_id, **payload} for payload in creates]
+                columns = {column for row in rows for column in row}
+                # render_nulls keeps rows with empty fields in the same INSERT instead of regrouping them.
+                self.db.execute(
+                    insert(RequestItem).execution_options(render_nulls=True),
+                    [{column: row.get(column) for column in columns} for row in rows],
+                )
+                created_ids = [row["id"] for row in rows]
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return created_ids
+
     def get_next_request_item_num(self, request_id: int) -> int:
         max_num = (
             self.db.query(RequestItem.num).filter(RequestItem.request_id == request_id).order_by(RequestItem.num.desc()).first()
@@ -10,13 +10,20 @@ class SessionRepository:
     def __init__(self, db: Session) -> None:
         self.db = db
 
+    @staticmethod
+    def hash_token(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
     def get_by_token(self, token: str):
+        return self.get_by_token_hash(self.hash_token(token))
+
+    def get_by_token_hash(self, token_hash: str):
         current_time = datetime.now(timezone.utc)
 
         session = (
             self.db.query(SessionDB)
             .filter(
-                SessionDB.token_hash == hashlib.sha256(token.encode()).hexdigest(),
+                SessionDB.token_hash == token_hash,
                 SessionDB.expires_at > current_time,
             )
             .first()
@@ -1,15 +1,18 @@
 import uuid
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from app.models.supply_request import NomenclatureRef, StatusRef
+from app.models.supply_request import NomenclatureRef
 from app.models.warehouse import Warehouse
 from app.models.warehouse_receipt import WarehouseReceipt, WarehouseReceiptItem
+from app.repositories.reference_table_repository import ReferenceTableRepository
 
 
 class WarehouseReceiptRepository:
     def __init__(self, db: Session) -> None:
         self.db = db
+        self.reference_tables = ReferenceTableRepository(db)
 
     def get_receipts(self) -> list[WarehouseReceipt]:
         return self.db.query(WarehouseReceipt).order_by(WarehouseReceipt.created_at.desc()).all()
@@ -53,6 +56,27 @@ class WarehouseReceiptRepository:
             .all()
         )
 
+    def get_receipt_item_totals(self, receipt_ids: list[str]) -> dict[str, dict]:
+        if not receipt_ids:
+            return {}
+        rows = (
+            self.db.query(
+                WarehouseReceiptItem.warehouse_receipt_id,
+                func.count(WarehouseReceiptItem.id),
+                func.coalesce(
+                    func.sum(func.coalesce(WarehouseReceiptItem.quantity, 0) * WarehouseReceiptItem.price),
+                    0,
+                ),
+            )
+            .filter(WarehouseReceiptItem.warehouse_receipt_id.in_(receipt_ids))
+            .group_by(WarehouseReceiptItem.warehouse_receipt_id)
+            .all()
+        )
+        return {
+            receipt_id: {"items_count": items_count, "items_total": float(items_total)}
+            for receipt_id, items_count, items_total in rows
+        }
+
     def get_receipt_item_by_id(self, receipt_id: str, item_id: str) -> WarehouseReceiptItem | None:
         return (
             self.db.query(WarehouseReceiptItem)
@@ -84,11 +108,11 @@ class WarehouseReceiptRepository:
         self.db.commit()
 
     def get_status_names(self, status_ids: list[str]) -> dict[str, str]:
-        unique_ids = list({status_id for status_id in status_ids if status_id})
+        unique_ids = {status_id for status_id in status_ids if status_id}
         if not unique_ids:
             return {}
-        rows = self.db.query(StatusRef.id, StatusRef.name).filter(StatusRef.id.in_(unique_ids)).all()
-        return {row_id: row_name for row_id, row_name in rows}
+        statuses = self.reference_tables.get_statuses()
+        return {status_id: statuses[status_id].name for status_id in unique_ids if status_id in statuses}
 
     def get_warehouses(self, warehouse_ids: list[str]) -> dict[str, Warehouse]:
         unique_ids = list({warehouse_id for warehouse_id in warehouse_ids if warehouse_id})
@@ -1,8 +1,10 @@
 from fastapi import APIRouter
 
+from app.database import DB_ASYNC_ENABLED
 from app.routes.catalog_routes import catalog_router
 from app.routes.invoices_routes import invoices_router
 from app.routes.item_mappings_routes import item_mappings_router
+from app.routes.metrics_routes import metrics_router
 from app.routes.project_user_roles_routes import project_user_roles_router
 from app.routes.projects_routes import projects_router
 from app.routes.request_approvers_routes import request_approvers_router
@@ -14,6 +16,11 @@ from app.routes.warehouse_receipts_routes import warehouse_receipts_router
 
 main_router = APIRouter(prefix="/api/supply")
 
+if DB_ASYNC_ENABLED:
+    from app.routes.async_read_routes import async_read_router
+
+    main_router.include_router(async_read_router)
+
 main_router.include_router(projects_router)
 main_router.include_router(invoices_router)
 main_router.include_router(item_mappings_router)
@@ -25,3 +32,4 @@ main_router.include_router(request_objects_router)
 main_router.include_router(warehouses_router)
 main_router.include_router(warehouse_receipts_router)
 main_router.include_router(catalog_router)
+main_router.include_router(metrics_router)
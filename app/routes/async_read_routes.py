@@ -0,0 +1,90 @@
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, Query, Response, status
+
+from app.async_database import DbAsyncAuthSession, DbAsyncReferenceSession, DbAsyncSupplySession
+from app.middleware.async_auth_middleware import get_async_session
+from app.models.invoice import InvoiceListQuery
+from app.models.supply_request import SupplyRequestListQuery
+from app.routes.pagination import set_next_cursor
+from app.services.async_read_service import AsyncReadService
+
+# Async variants of the hot read endpoints. Included ahead of the sync routers when
+# DB_ASYNC_ENABLED is set, so they take precedence for the same paths.
+async_read_router = APIRouter()
+
+
+@async_read_router.get(
+    "/requests",
+    status_code=status.HTTP_200_OK,
+    summary="Получить список всех заявок",
+    tags=["Requests"],
+)
+async def get_all_requests(
+    response: Response,
+    supply_db: DbAsyncSupplySession,
+    auth_db: DbAsyncAuthSession,
+    reference_db: DbAsyncReferenceSession,
+    filters: Annotated[SupplyRequestListQuery, Query()],
+    _session=Depends(get_async_session),
+):
+    service = AsyncReadService(supply_db, auth_db, reference_db)
+    items, next_cursor = await service.get_requests(filters)
+    if filters.limit is not None:
+        set_next_cursor(response, next_cursor)
+    return items
+
+
+@async_read_router.get(
+    "/invoices",
+    status_code=status.HTTP_200_OK,
+    summary="Получить список всех счетов",
+    tags=["Invoices"],
+)
+async def get_invoices(
+    response: Response,
+    supply_db: DbAsyncSupplySession,
+    auth_db: DbAsyncAuthSession,
+    reference_db: DbAsyncReferenceSession,
+    filters: Annotated[InvoiceListQuery, Query()],
+    _session=Depends(get_async_session),
+):
+    service = AsyncReadService(supply_db, auth_db, reference_db)
+    items, next_cursor = await service.get_invoices(filters)
+    if filters.limit is not None:
+        set_next_cursor(response, next_cursor)
+    return items
+
+
+@async_read_router.get(
+    "/invoices/{invoice_id:int}",
+    status_code=status.HTTP_200_OK,
+    summary="Получить счет и его позиции",
+    tags=["Invoices"],
+)
+async def get_invoice(
+    invoice_id: int,
+    supply_db: DbAsyncSupplySession,
+    auth_db: DbAsyncAuthSession,
+    reference_db: DbAsyncReferenceSession,
+    _session=Depends(get_async_session),
+):
+    service = AsyncReadService(supply_db, auth_db, reference_db)
+    return await service.get_invoice(invoice_id)
+
+
+@async_read_router.get(
+    "/warehouse-receipts",
+    status_code=status.HTTP_200_OK,
+    summary="Получить список приходных накладных",
+    tags=["WarehouseReceipts"],
+)
+async def get_warehouse_receipts(
+    supply_db: DbAsyncSupplySession,
+    auth_db: DbAsyncAuthSession,
+    reference_db: DbAsyncReferenceSession,
+    view: Literal["full", "summary"] = Query(default="full"),
+    _session=Depends(get_async_session),
+):
+    service = AsyncReadService(supply_db, auth_db, reference_db)
+    return await service.get_receipts(view)
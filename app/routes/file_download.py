@@ -0,0 +1,54 @@
+import os
+from collections.abc import Callable
+from email.utils import formatdate, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+from fastapi.responses import FileResponse
+
+# File rows are never rewritten in place (a new upload is a new id), so a downloaded file can be
+# cached by the browser for good. "private" keeps shared proxies from storing authorised content.
+DOWNLOAD_CACHE_CONTROL = os.getenv("FILE_DOWNLOAD_CACHE_CONTROL", "private, max-age=31536000, immutable")
+
+
+def build_download_response(request: Request, payload: dict, on_transfer: Callable[[], None]) -> Response:
+    file_stat = os.stat(payload["path"])
+    headers = {
+        "Cache-Control": DOWNLOAD_CACHE_CONTROL,
+        "Last-Modified": formatdate(file_stat.st_mtime, usegmt=True),
+    }
+    if payload.get("md5_hash"):
+        headers["ETag"] = f'"{payload["md5_hash"]}"'
+
+    if _not_modified(request, headers.get("ETag"), file_stat.st_mtime):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Viewers fetch a PDF in many ranges; only the request that starts at the beginning counts as
+    # a download.
+    range_header = request.headers.get("range", "")
+    if not range_header or range_header.replace(" ", "").startswith("bytes=0-"):
+        on_transfer()
+
+    return FileResponse(
+        path=payload["path"],
+        filename=payload["filename"],
+        media_type=payload["media_type"],
+        headers=headers,
+        stat_result=file_stat,
+    )
+
+
+def _not_modified(request: Request, etag: str | None, mtime: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match wins over If-Modified-Since (RFC 9110, 13.1.3).
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or (etag is not None and etag in tags)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(mtime) <= since
+    return False
@@ -1,7 +1,10 @@
+import asyncio
 import json
+from typing import Annotated
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from pydantic import ValidationError
 
 from app.database import DbAuthSession, DbReferenceSession, DbSupplySession
@@ -10,8 +13,10 @@ from app.models.invoice import (
     InvoiceCreate,
     InvoiceLogCreate,
     InvoiceLogUpdate,
+    InvoiceItemBatchCreate,
     InvoiceItemCreate,
     InvoiceItemUpdate,
+    InvoiceListQuery,
     InvoiceParseRequest,
     InvoicePaymentCreate,
     InvoicePaymentUpdate,
@@ -23,10 +28,15 @@ from app.repositories.counterparty_repository import CounterpartyRepository
 from app.repositories.invoice_repository import InvoiceRepository
 from app.repositories.reference_object_repository import ReferenceObjectRepository
 from app.repositories.request_file_repository import RequestFileRepository
+from app.routes.file_download import build_download_response
+from app.routes.pagination import set_next_cursor
+from app.services.invoice_parse_jobs import FINISHED_STATUSES, invoice_parse_queue
 from app.services.invoice_service import InvoiceService
 
 invoices_router = APIRouter(prefix="/invoices", tags=["Invoices"])
 
+PARSE_JOB_EVENTS_INTERVAL_SECONDS = 0.5
+
 
 def build_invoice_service(
     supply_db: DbSupplySession,
@@ -42,19 +52,33 @@ def build_invoice_service(
     )
 
 
+def get_parse_job_or_404(invoice_id: int, job_id: str) -> dict:
+    job = invoice_parse_queue.get(job_id)
+    if job is None or job["invoice_id"] != invoice_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Parse job not found")
+    return job
+
+
 @invoices_router.get(
     "",
     status_code=status.HTTP_200_OK,
     summary="Получить список всех счетов",
 )
 def get_invoices(
+    response: Response,
     supply_db: DbSupplySession,
     auth_db: DbAuthSession,
     reference_db: DbReferenceSession,
+    filters: Annotated[InvoiceListQuery, Query()],
     _session=Depends(get_session),
 ):
     service = build_invoice_service(supply_db, auth_db, reference_db)
-    return service.get_all()
+    if filters.limit is None:
+        return service.get_all(filters)
+
+    items, next_cursor = service.get_page(filters)
+    set_next_cursor(response, next_cursor)
+    return items
 
 
 @invoices_router.get(
@@ -63,13 +87,20 @@ def get_invoices(
     summary="Получить список доступных мне счетов",
 )
 def get_my_invoices(
+    response: Response,
     supply_db: DbSupplySession,
     auth_db: DbAuthSession,
     reference_db: DbReferenceSession,
+    filters: Annotated[InvoiceListQuery, Query()],
     session: SessionDB = Depends(get_session),
 ):
     service = build_invoice_service(supply_db, auth_db, reference_db)
-    return service.get_available_for_user(str(session.user_id))
+    if filters.limit is None:
+        return service.get_available_for_user(str(session.user_id), filters)
+
+    items, next_cursor = service.get_available_page(str(session.user_id), filters)
+    set_next_cursor(response, next_cursor)
+    return items
 
 
 @invoices_router.post(
@@ -93,7 +124,7 @@ def create_invoice(
     status_code=status.HTTP_201_CREATED,
     summary="Создать счет сразу с файлом",
 )
-async def create_invoice_with_file(
+def create_invoice_with_file(
     supply_db: DbSupplySession,
     auth_db: DbAuthSession,
     reference_db: DbReferenceSession,
@@ -110,13 +141,12 @@ async def create_invoice_with_file(
         ) from exc
 
     service = build_invoice_service(supply_db, auth_db, reference_db)
-    file_bytes = await file.read()
     return service.create_invoice_with_file(
         payload=payload,
         user_id=str(session.user_id),
         original_name=file.filename or "file",
         mime_type=file.content_type or "application/octet-stream",
-        file_bytes=file_bytes,
+        file_stream=file.file,
     )
 
 
@@ -180,14 +210,15 @@ def download_invoice_file(
     supply_db: DbSupplySession,
     auth_db: DbAuthSession,
     reference_db: DbReferenceSession,
+    request: Request,
     session: SessionDB = Depends(get_session),
 ):
     service = build_invoice_service(supply_db, auth_db, reference_db)
-    payload = service.get_invoice_file_download_payload(invoice_id, str(session.user_id))
-    return FileResponse(
-        path=payload["path"],
-        filename=payload["filename"],
-        media_type=payload["media_type"],
+    payload = service.get_invoice_file_download_payload(invoice_id)
+    return build_download_response(
+        request,
+        payload,
+        lambda: service.record_file_download(payload["file_id"], str(session.user_id)),
     )
 
 
@@ -208,6 +239,69 @@ def parse_invoice_file(
     return service.parse_invoice_file_and_update(invoice_id, payload.file_path, str(session.user_id))
 
 
+# Parse jobs live in the memory of the worker that accepted them: status polls and event streams
+# only find a job on that worker, and a restart forgets it. Run the API as a single worker (or
+# pin parse-job clients to one) while the registry is process-local.
+@invoices_router.post(
+    "/{invoice_id}/parse-jobs",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Поставить распознавание счета из файла в очередь",
+)
+def create_invoice_parse_job(
+    invoice_id: int,
+    payload: InvoiceParseRequest,
+    supply_db: DbSupplySession,
+    auth_db: DbAuthSession,
+    reference_db: DbReferenceSession,
+    session: SessionDB = Depends(get_session),
+):
+    service = build_invoice_service(supply_db, auth_db, reference_db)
+    service.validate_parse_request(invoice_id, payload.file_path)
+    return invoice_parse_queue.submit(invoice_id, payload.file_path, str(session.user_id))
+
+
+@invoices_router.get(
+    "/{invoice_id}/parse-jobs/{job_id}",
+    status_code=status.HTTP_200_OK,
+    summary="Получить статус распознавания счета",
+)
+def get_invoice_parse_job(
+    invoice_id: int,
+    job_id: str,
+    _session=Depends(get_session),
+):
+    return get_parse_job_or_404(invoice_id, job_id)
+
+
+@invoices_router.get(
+    "/{invoice_id}/parse-jobs/{job_id}/events",
+    status_code=status.HTTP_200_OK,
+    summary="Получать статус распознавания счета потоком (text/event-stream)",
+)
+def stream_invoice_parse_job(
+    invoice_id: int,
+    job_id: str,
+    _session=Depends(get_session),
+):
+    get_parse_job_or_404(invoice_id, job_id)
+
+    async def events():
+        last_event = None
+        while True:
+            job = invoice_parse_queue.get(job_id)
+            if job is None:
+                return
+            event = json.dumps(jsonable_encoder(job), ensure_ascii=False)
+            if event != last_event:
+                last_event = event
+                yield f"data: {event}\n\n"
+            if job["status"] in FINISHED_STATUSES:
+                return
+            await asyncio.sleep(PARSE_JOB_EVENTS_INTERVAL_SECONDS)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 @invoices_router.post(
     "/{invoice_id}/items",
     status_code=status.HTTP_201_CREATED,
@@ -225,6 +319,23 @@ def create_invoice_item(
     return service.create_invoice_item(invoice_id, payload)
 
 
+@invoices_router.post(
+    "/{invoice_id}/items/batch",
+    status_code=status.HTTP_201_CREATED,
+    summary="Добавить несколько позиций в счет одной транзакцией",
+)
+def create_invoice_items(
+    invoice_id: int,
+    payload: InvoiceItemBatchCreate,
+    supply_db: DbSupplySession,
+    auth_db: DbAuthSession,
+    reference_db: DbReferenceSession,
+    _session=Depends(get_session),
+):
+    service = build_invoice_service(supply_db, auth_db, reference_db)
+    return service.create_invoice_items(invoice_id, payload)
+
+
 @invoices_router.patch(
     "/{invoice_id}/items/{item_id}",
     status_code=status.HTTP_200_OK,
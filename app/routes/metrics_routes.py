@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, status
+
+from app.middleware.auth_middleware import get_session
+from app.middleware.session_cache import session_cache
+from app.pool_metrics import get_pool_metrics
+from app.query_stats import get_route_stats
+from app.repositories.counterparty_repository import schema_cache
+from app.repositories.reference_table_repository import reference_cache
+from app.services.file_audit_sink import file_audit_sink
+from app.services.file_ingest import file_type_cache
+from app.services.file_storage import blob_store
+from app.services.invoice_parse_jobs import invoice_parse_queue
+from app.services.invoice_service import invoice_parse_cache
+
+metrics_router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@metrics_router.get(
+    "",
+    status_code=status.HTTP_200_OK,
+    summary="Получить метрики пулов соединений и кэшей",
+)
+def get_metrics(
+    _session=Depends(get_session),
+):
+    return {
+        "pools": get_pool_metrics(),
+        "routes": get_route_stats(),
+        "caches": {
+            "reference_tables": reference_cache.stats(),
+            "counterparty_schema": schema_cache.stats(),
+            "sessions": session_cache.stats(),
+            "invoice_parse": invoice_parse_cache.stats(),
+            "file_types": file_type_cache.stats(),
+        },
+        "invoice_parse_jobs": invoice_parse_queue.stats(),
+        "file_blobs": blob_store.stats(),
+        "file_audit": file_audit_sink.stats(),
+    }
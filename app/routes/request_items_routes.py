@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, status
 
 from app.database import DbSupplySession
 from app.middleware.auth_middleware import get_session
-from app.models.supply_request import RequestItemCreate, RequestItemUpdate
+from app.models.supply_request import RequestItemBatch, RequestItemCreate, RequestItemUpdate
 from app.repositories.request_repository import RequestRepository
 from app.services.request_item_service import RequestItemService
 
@@ -24,6 +24,21 @@ def create_request_item(
     return service.create(request_id, payload)
 
 
+@request_items_router.post(
+    "/{request_id}/items/batch",
+    status_code=status.HTTP_200_OK,
+    summary="Добавить, изменить и удалить предметы заявки одной транзакцией",
+)
+def apply_request_items_batch(
+    request_id: int,
+    payload: RequestItemBatch,
+    db: DbSupplySession,
+    _session=Depends(get_session),
+):
+    service = RequestItemService(RequestRepository(db))
+    return service.apply_batch(request_id, payload)
+
+
 @request_items_router.patch(
     "/{request_id}/items/{item_id}",
     status_code=status.HTTP_200_OK,
@@ -1,14 +1,31 @@
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from fastapi.responses import FileResponse
+from typing import Annotated
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
 
 from app.database import DbAuthSession, DbReferenceSession, DbSupplySession
 from app.middleware.auth_middleware import get_session
 from app.models.session import SessionDB
-from app.models.supply_request import SupplyRequestCreate, SupplyRequestUpdate
+from app.models.supply_request import (
+    SupplyRequestCreate,
+    SupplyRequestListQuery,
+    SupplyRequestUpdate,
+)
 from app.repositories.auth_user_repository import AuthUserRepository
 from app.repositories.reference_object_repository import ReferenceObjectRepository
 from app.repositories.request_file_repository import RequestFileRepository
 from app.repositories.request_repository import RequestRepository
+from app.routes.file_download import build_download_response
+from app.routes.pagination import set_next_cursor
 from app.services.request_file_service import RequestFileService
 from app.services.request_service import RequestService
 
@@ -33,13 +50,20 @@ def build_request_service(
     summary="Получить список всех заявок",
 )
 def get_all_requests(
+    response: Response,
     supply_db: DbSupplySession,
     auth_db: DbAuthSession,
     reference_db: DbReferenceSession,
+    filters: Annotated[SupplyRequestListQuery, Query()],
     _session=Depends(get_session),
 ):
     service = build_request_service(supply_db, auth_db, reference_db)
-    return service.get_all()
+    if filters.limit is None:
+        return service.get_all(filters)
+
+    items, next_cursor = service.get_page(filters)
+    set_next_cursor(response, next_cursor)
+    return items
 
 
 @requests_router.get(
@@ -48,13 +72,20 @@ def get_all_requests(
     summary="Получить список доступных мне заявок",
 )
 def get_my_requests(
+    response: Response,
     supply_db: DbSupplySession,
     auth_db: DbAuthSession,
     reference_db: DbReferenceSession,
+    filters: Annotated[SupplyRequestListQuery, Query()],
     session: SessionDB = Depends(get_session),
 ):
     service = build_request_service(supply_db, auth_db, reference_db)
-    return service.get_available_for_user(str(session.user_id))
+    if filters.limit is None:
+        return service.get_available_for_user(str(session.user_id), filters)
+
+    items, next_cursor = service.get_available_page(str(session.user_id), filters)
+    set_next_cursor(response, next_cursor)
+    return items
 
 
 @requests_router.get(
@@ -133,19 +164,18 @@ def update_request(
     status_code=status.HTTP_201_CREATED,
     summary="Загрузить файл-приложение к заявке",
 )
-async def upload_request_attachment(
+def upload_request_attachment(
     request_id: int,
     db: DbSupplySession,
     session: SessionDB = Depends(get_session),
     file: UploadFile = File(...),
 ):
     service = RequestFileService(RequestFileRepository(db))
-    file_bytes = await file.read()
     return service.upload_request_attachment(
         request_id=request_id,
         original_name=file.filename or "file",
         mime_type=file.content_type or "application/octet-stream",
-        file_bytes=file_bytes,
+        file_stream=file.file,
         user_id=str(session.user_id),
     )
 
@@ -173,14 +203,15 @@ def download_request_attachment(
     request_id: int,
     file_id: str,
     db: DbSupplySession,
+    request: Request,
     session: SessionDB = Depends(get_session),
 ):
     service = RequestFileService(RequestFileRepository(db))
-    payload = service.get_download_file_payload(request_id, file_id, str(session.user_id))
-    return FileResponse(
-        path=payload["path"],
-        filename=payload["filename"],
-        media_type=payload["media_type"],
+    payload = service.get_download_file_payload(request_id, file_id)
+    return build_download_response(
+        request,
+        payload,
+        lambda: service.record_file_download(payload["file_id"], str(session.user_id)),
     )
 
 
@@ -205,19 +236,18 @@ def delete_request_attachment(
     status_code=status.HTTP_201_CREATED,
     summary="Загрузить файл счета к заявке",
 )
-async def upload_request_invoice_file(
+def upload_request_invoice_file(
     request_id: int,
     db: DbSupplySession,
     session: SessionDB = Depends(get_session),
     file: UploadFile = File(...),
 ):
     service = RequestFileService(RequestFileRepository(db))
-    file_bytes = await file.read()
     return service.upload_request_invoice_file(
         request_id=request_id,
         original_name=file.filename or "file",
         mime_type=file.content_type or "application/octet-stream",
-        file_bytes=file_bytes,
+        file_stream=file.file,
         user_id=str(session.user_id),
     )
 
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, status
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, status
 
 from app.database import DbReferenceSession, DbSupplySession
 from app.middleware.auth_middleware import get_session
@@ -35,10 +37,11 @@ def build_warehouse_receipt_service(
 def get_warehouse_receipts(
     supply_db: DbSupplySession,
     reference_db: DbReferenceSession,
+    view: Literal["full", "summary"] = Query(default="full"),
     _session=Depends(get_session),
 ):
     service = build_warehouse_receipt_service(supply_db, reference_db)
-    return service.get_receipts()
+    return service.get_receipts(view)
 
 
 @warehouse_receipts_router.post(
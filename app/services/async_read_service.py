@@ -0,0 +1,131 @@
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.invoice import InvoiceListQuery
+from app.models.supply_request import SupplyRequestListQuery
+from app.repositories.auth_user_repository import AuthUserRepository
+from app.repositories.counterparty_repository import CounterpartyRepository
+from app.repositories.invoice_repository import InvoiceRepository
+from app.repositories.reference_object_repository import ReferenceObjectRepository
+from app.repositories.request_file_repository import RequestFileRepository
+from app.repositories.request_repository import RequestRepository
+from app.repositories.warehouse_receipt_repository import WarehouseReceiptRepository
+from app.services.invoice_service import InvoiceService
+from app.services.project_name_builder import load_project_reference_maps
+from app.services.request_service import RequestService
+from app.services.warehouse_receipt_service import WarehouseReceiptService
+
+
+# Repositories are bound to each AsyncSession's sync_session and only called inside run_sync on
+# that session, so their SQL goes through the async driver. Phases on different databases are
+# awaited together.
+class AsyncReadService:
+    def __init__(
+        self,
+        supply_db: AsyncSession,
+        auth_db: AsyncSession,
+        reference_db: AsyncSession,
+    ) -> None:
+        self.supply_db = supply_db
+        self.auth_db = auth_db
+        self.reference_db = reference_db
+
+    async def get_requests(self, filters: SupplyRequestListQuery):
+        service = RequestService(
+            RequestRepository(self.supply_db.sync_session),
+            AuthUserRepository(self.auth_db.sync_session),
+            ReferenceObjectRepository(self.reference_db.sync_session),
+        )
+        if filters.limit is None:
+            requests = await self._run(self.supply_db, service.repo.get_all, filters)
+            next_cursor = None
+        else:
+            requests, next_cursor = await self._run(self.supply_db, service.repo.get_page, filters)
+
+        if not requests:
+            return [], next_cursor
+
+        user_ids, counterparty_ids, object_level_ids = service.collect_lookup_ids(requests)
+        if filters.view == "summary":
+            project_maps = await self._run(
+                self.reference_db,
+                load_project_reference_maps,
+                service.reference_repo,
+                object_level_ids,
+            )
+            return service.apply_project_names(requests, project_maps), next_cursor
+
+        users_by_id, (counterparty_names, project_maps) = await asyncio.gather(
+            self._run(self.auth_db, service.load_users, user_ids),
+            self._run(self.reference_db, service.load_reference_lookups, counterparty_ids, object_level_ids),
+        )
+        return service.apply_lookups(requests, users_by_id, counterparty_names, project_maps), next_cursor
+
+    async def get_invoices(self, filters: InvoiceListQuery):
+        service = self._invoice_service()
+        if filters.limit is None:
+            invoices = await self._run(self.supply_db, service.repo.get_invoices, filters)
+            next_cursor = None
+        else:
+            invoices, next_cursor = await self._run(self.supply_db, service.repo.get_invoice_page, filters)
+
+        if not invoices:
+            return [], next_cursor
+
+        rows = await self._run(self.supply_db, service.load_invoice_list_rows, invoices, filters.view)
+        users_by_id, (counterparty_names, project_maps) = await asyncio.gather(
+            self._run(self.auth_db, service.load_users, rows["user_ids"]),
+            self._run(
+                self.reference_db,
+                service.load_list_reference_lookups,
+                rows["counterparty_ids"],
+                list(rows["object_levels_by_invoice_id"].values()),
+            ),
+        )
+        return service.build_invoice_list(invoices, rows, users_by_id, counterparty_names, project_maps), next_cursor
+
+    async def get_invoice(self, invoice_id: int):
+        service = self._invoice_service()
+        detail = await self._run(self.supply_db, service.load_invoice_detail, invoice_id)
+        users_by_id, reference = await asyncio.gather(
+            self._run(self.auth_db, service.load_users, detail["user_ids"]),
+            self._run(
+                self.reference_db,
+                service.load_invoice_reference,
+                detail["object_levels_id"],
+                detail["counterparty_ids"],
+            ),
+        )
+        return service.build_invoice_detail(detail, users_by_id, reference)
+
+    async def get_receipts(self, view: str):
+        service = WarehouseReceiptService(
+            WarehouseReceiptRepository(self.supply_db.sync_session),
+            CounterpartyRepository(self.reference_db.sync_session),
+            ReferenceObjectRepository(self.reference_db.sync_session),
+        )
+        receipts = await self._run(self.supply_db, service.repo.get_receipts)
+        rows = await self._run(self.supply_db, service.load_receipt_rows, receipts, view)
+        counterparties, object_names = await self._run(
+            self.reference_db,
+            service.load_receipt_reference,
+            rows["from_ids"],
+            rows["object_ids"],
+        )
+        return service.build_receipts(receipts, rows, counterparties, object_names)
+
+    def _invoice_service(self) -> InvoiceService:
+        return InvoiceService(
+            InvoiceRepository(self.supply_db.sync_session),
+            RequestFileRepository(self.supply_db.sync_session),
+            CounterpartyRepository(self.reference_db.sync_session),
+            AuthUserRepository(self.auth_db.sync_session),
+            ReferenceObjectRepository(self.reference_db.sync_session),
+        )
+
+    @staticmethod
+    async def _run(db: AsyncSession, phase: Callable[..., Any], *args):
+        return await db.run_sync(lambda _sync_db: phase(*args))
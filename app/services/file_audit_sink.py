@@ -0,0 +1,286 @@
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime
+
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database import SupplySessionLocal
+from app.repositories.request_file_repository import RequestFileRepository
+
+FILE_AUDIT_BATCH_SIZE = int(os.getenv("FILE_AUDIT_BATCH_SIZE", "200"))
+FILE_AUDIT_FLUSH_INTERVAL_SECONDS = float(os.getenv("FILE_AUDIT_FLUSH_INTERVAL_SECONDS", "1"))
+FILE_AUDIT_MAX_QUEUE = int(os.getenv("FILE_AUDIT_MAX_QUEUE", "10000"))
+FILE_AUDIT_SPILL_PATH = os.getenv("FILE_AUDIT_SPILL_PATH") or os.path.join(
+    os.getenv("SUPPLY_REQUEST_FILES_DIR", os.path.join(os.getcwd(), "storage", "request")),
+    ".file_audit_spill.jsonl",
+)
+
+logger = logging.getLogger("app.file_audit")
+
+_STOP = object()
+
+
+# Takes file_audit rows off the request path: record() only enqueues, and a background thread
+# writes them in multi-row INSERTs once FILE_AUDIT_BATCH_SIZE rows are waiting or the oldest one
+# is FILE_AUDIT_FLUSH_INTERVAL_SECONDS old. Rows the database does not accept, or that do not fit
+# into the queue, are appended to a JSONL spill file and replayed when the writer is idle.
+class FileAuditSink:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SupplySessionLocal,
+        batch_size: int = FILE_AUDIT_BATCH_SIZE,
+        flush_interval_seconds: float = FILE_AUDIT_FLUSH_INTERVAL_SECONDS,
+        max_queue: int = FILE_AUDIT_MAX_QUEUE,
+        spill_path: str = FILE_AUDIT_SPILL_PATH,
+    ) -> None:
+        self.session_factory = session_factory
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.spill_path = spill_path
+        self.recorded = 0
+        self.written = 0
+        self.batches = 0
+        self.spilled = 0
+        self.replayed = 0
+        self.quarantined = 0
+        self.lost = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+        self._lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+
+    def record(self, file_id: str, action: str, user_id: str) -> None:
+        row = {
+            "id": str(uuid.uuid4()),
+            "file_id": file_id,
+            "action": action,
+            "user_id": user_id,
+            "created_at": datetime.utcnow(),
+        }
+        with self._lock:
+            self.recorded += 1
+            stopped = self._stopped
+
+        if stopped:
+            # Late events during shutdown are written directly.
+            self._write([row])
+            return
+
+        self.start()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            # Never make the request wait for the database.
+            self._spill([row])
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None or self._stopped:
+                return
+            self._thread = threading.Thread(target=self._run, name="file-audit-sink", daemon=True)
+            self._thread.start()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        # Blocks until everything recorded so far has been written or spilled.
+        with self._lock:
+            thread = self._thread
+        if thread is None or not thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(done, timeout=timeout)
+        return done.wait(timeout)
+
+    def shutdown(self, timeout: float | None = 10) -> None:
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "recorded_total": self.recorded,
+                "written_total": self.written,
+                "batches_total": self.batches,
+                "spilled_total": self.spilled,
+                "replayed_total": self.replayed,
+                "quarantined_total": self.quarantined,
+                "lost_total": self.lost,
+                "spill_pending": os.path.exists(self.spill_path) or os.path.exists(self._replay_path),
+            }
+
+    def _run(self) -> None:
+        batch: list[dict] = []
+        batch_started = 0.0
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval_seconds)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, dict):
+                if not batch:
+                    batch_started = time.monotonic()
+                batch.append(item)
+                if (
+                    len(batch) < self.batch_size
+                    and time.monotonic() - batch_started < self.flush_interval_seconds
+                ):
+                    continue
+
+            if batch:
+                self._write(batch)
+                batch = []
+
+            if item is None:
+                self._replay_spill()
+            elif item is _STOP:
+                return
+            elif isinstance(item, threading.Event):
+                item.set()
+
+    def _write(self, rows: list[dict]) -> None:
+        try:
+            self._insert(rows)
+        except Exception:
+            logger.warning(
+                "Cannot write %s file audit rows, spilling to %s", len(rows), self.spill_path, exc_info=True
+            )
+            self._spill(rows)
+            return
+
+        with self._lock:
+            self.written += len(rows)
+            self.batches += 1
+
+    def _insert(self, rows: list[dict]) -> None:
+        db = self.session_factory()
+        try:
+            RequestFileRepository(db).add_audits(rows)
+        finally:
+            db.close()
+
+    def _spill(self, rows: list[dict]) -> None:
+        lines = [json.dumps({**row, "created_at": row["created_at"].isoformat()}) + "\n" for row in rows]
+        try:
+            with self._spill_lock:
+                self._append_lines(self.spill_path, lines)
+        except OSError:
+            logger.exception("Cannot spill %s file audit rows to %s", len(rows), self.spill_path)
+            with self._lock:
+                self.lost += len(rows)
+            return
+
+        with self._lock:
+            self.spilled += len(rows)
+
+    def _replay_spill(self) -> None:
+        # Runs on the writer thread, which has to outlive whatever a damaged spill file throws.
+        try:
+            with self._spill_lock:
+                if not os.path.exists(self._replay_path):
+                    if not os.path.exists(self.spill_path):
+                        return
+                    # Moved aside so new spills do not mix with the rows being replayed.
+                    os.replace(self.spill_path, self._replay_path)
+            self._replay_file()
+        except Exception:
+            logger.exception("Cannot replay file audit spill %s", self._replay_path)
+
+    def _replay_file(self) -> None:
+        # Replays in batches of batch_size. Lines that do not parse and rows the database rejects
+        # are moved to the quarantine file instead of blocking everything behind them; when the
+        # database is unavailable, the rows not written yet stay for the next idle tick.
+        with open(self._replay_path, encoding="utf-8") as replay_file:
+            lines = [line for line in replay_file if line.strip()]
+
+        pending: list[tuple[str, dict]] = []
+        rejected: list[str] = []
+        for line in lines:
+            try:
+                pending.append((line, self._parse_spilled(line)))
+            except (KeyError, TypeError, ValueError):
+                rejected.append(line)
+
+        replayed = 0
+        index = 0
+        single_until = 0
+        while index < len(pending):
+            size = 1 if index < single_until else self.batch_size
+            batch = pending[index : index + size]
+            try:
+                self._insert([row for _, row in batch])
+            except (DataError, IntegrityError):
+                if size > 1:
+                    # Retry this batch row by row to find the rejected ones.
+                    single_until = index + len(batch)
+                    continue
+                rejected.append(batch[0][0])
+            except Exception:
+                logger.warning(
+                    "Cannot replay %s spilled file audit rows", len(pending) - index, exc_info=True
+                )
+                break
+            else:
+                replayed += len(batch)
+            index += len(batch)
+
+        if rejected:
+            logger.error("Moving %s file audit rows to %s", len(rejected), self._quarantine_path)
+            self._append_lines(self._quarantine_path, rejected)
+        remaining = [line for line, _ in pending[index:]]
+        if remaining:
+            temp_path = self._replay_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as temp_file:
+                temp_file.writelines(remaining)
+            os.replace(temp_path, self._replay_path)
+        else:
+            os.remove(self._replay_path)
+
+        with self._lock:
+            self.replayed += replayed
+            self.quarantined += len(rejected)
+
+    @staticmethod
+    def _parse_spilled(line: str) -> dict:
+        row = json.loads(line)
+        return {
+            "id": row["id"],
+            "file_id": row["file_id"],
+            "action": row["action"],
+            "user_id": row["user_id"],
+            "created_at": datetime.fromisoformat(row["created_at"]),
+        }
+
+    @staticmethod
+    def _append_lines(path: str, lines: list[str]) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as target:
+            target.writelines(lines)
+            target.flush()
+            os.fsync(target.fileno())
+
+    @property
+    def _quarantine_path(self) -> str:
+        return self.spill_path + ".rejected"
+
+    @property
+    def _replay_path(self) -> str:
+        return self.spill_path + ".replay"
+
+
+file_audit_sink = FileAuditSink()
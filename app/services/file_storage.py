@@ -0,0 +1,179 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import BinaryIO
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of one process are serialized
+    fcntl = None
+
+from fastapi import HTTPException, status
+
+# Defaults to a folder inside the request files directory, which deployments already keep writable.
+FILE_BLOBS_DIR = os.getenv("SUPPLY_FILE_BLOBS_DIR") or os.path.join(
+    os.getenv("SUPPLY_REQUEST_FILES_DIR", os.path.join(os.getcwd(), "storage", "request")),
+    ".blobs",
+)
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE_KB", "1024")) * 1024
+CONTENT_LOCK_STRIPES = 64
+
+
+@dataclass
+class StoredFile:
+    path: str
+    size: int
+    md5_hash: str
+    sha256_hash: str
+    is_new: bool
+
+
+# Content-addressed store: each distinct upload is kept once under a directory named after its
+# SHA-256, sharded as ab/cd/<sha256>/. Every FileDB row gets its own name (storage_name) in that
+# directory, hard-linked to the same content, so identical files uploaded to different requests and
+# invoices share one copy on disk while each row still owns a real path. The filesystem link count
+# is the reference count: removing a row's name never touches the others, and the content is freed
+# with its last name.
+class BlobStore:
+    backend = "local"
+
+    def __init__(self, directory: str, chunk_size: int = UPLOAD_CHUNK_SIZE) -> None:
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.writes = 0
+        self.deduplicated = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+        self._content_locks = [threading.Lock() for _ in range(CONTENT_LOCK_STRIPES)]
+
+    def save(self, stream: BinaryIO, max_size_mb: int, storage_name: str) -> StoredFile:
+        self._ensure_directory(self.directory)
+
+        # The upload is copied chunk by chunk into a temp file next to the blobs and renamed into
+        # place only when complete, so readers never see a partial file and a rejected upload
+        # leaves nothing behind.
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".upload-", suffix=".part")
+        try:
+            with os.fdopen(file_descriptor, "wb") as temp_file:
+                size, md5_hash, sha256_hash = self._copy(stream, temp_file, max_size_mb)
+
+            content_dir = self.path_for(sha256_hash)
+            path = os.path.join(content_dir, storage_name)
+            with self._content_lock(sha256_hash):
+                is_new = not self._link_existing(content_dir, path)
+                if is_new:
+                    self._ensure_directory(content_dir)
+                    os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        return self._stored(path, size, md5_hash, sha256_hash, is_new)
+
+    def remove(self, path: str) -> None:
+        # Drops one file's name only. Files stored before the blob store keep their own paths.
+        content_dir = os.path.dirname(path)
+        sha256_hash = os.path.basename(content_dir)
+        if content_dir != self.path_for(sha256_hash):
+            if os.path.exists(path):
+                os.remove(path)
+            return
+
+        with self._content_lock(sha256_hash):
+            if os.path.exists(path):
+                os.remove(path)
+            try:
+                os.rmdir(content_dir)
+            except OSError:
+                # Other files still share the content.
+                pass
+
+    def path_for(self, sha256_hash: str) -> str:
+        return os.path.join(self.directory, sha256_hash[:2], sha256_hash[2:4], sha256_hash)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "writes": self.writes,
+                "deduplicated": self.deduplicated,
+                "bytes_saved": self.bytes_saved,
+            }
+
+    @contextmanager
+    def _content_lock(self, sha256_hash: str) -> Iterator[None]:
+        # Adding the first name of a content and removing its last one (together with the content
+        # directory) must not interleave. The thread lock covers this process, flock on a lock file
+        # per shard covers the other workers.
+        with self._content_locks[int(sha256_hash[:8], 16) % CONTENT_LOCK_STRIPES]:
+            if fcntl is None:
+                yield
+                return
+            lock_dir = os.path.join(self.directory, ".locks")
+            self._ensure_directory(lock_dir)
+            with open(os.path.join(lock_dir, f"{sha256_hash[:2]}.lock"), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                yield
+
+    @staticmethod
+    def _link_existing(content_dir: str, path: str) -> bool:
+        try:
+            names = os.listdir(content_dir)
+        except FileNotFoundError:
+            return False
+        for name in names:
+            try:
+                os.link(os.path.join(content_dir, name), path)
+                return True
+            except FileNotFoundError:
+                continue
+            except OSError:
+                # Link limit reached or no hard links on this filesystem: keep a separate copy.
+                return False
+        return False
+
+    def _copy(self, stream: BinaryIO, target: BinaryIO, max_size_mb: int) -> tuple[int, str, str]:
+        max_bytes = max_size_mb * 1024 * 1024
+        md5 = hashlib.md5()
+        sha256 = hashlib.sha256()
+        size = 0
+        while chunk := stream.read(self.chunk_size):
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"File size exceeds {max_size_mb} MB",
+                )
+            md5.update(chunk)
+            sha256.update(chunk)
+            target.write(chunk)
+        return size, md5.hexdigest(), sha256.hexdigest()
+
+    def _stored(self, path: str, size: int, md5_hash: str, sha256_hash: str, is_new: bool) -> StoredFile:
+        with self._lock:
+            if is_new:
+                self.writes += 1
+            else:
+                self.deduplicated += 1
+                self.bytes_saved += size
+        return StoredFile(path=path, size=size, md5_hash=md5_hash, sha256_hash=sha256_hash, is_new=is_new)
+
+    @staticmethod
+    def _ensure_directory(path: str) -> None:
+        try:
+            os.makedirs(path, exist_ok=True)
+        except OSError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=(
+                    f"Cannot create directory '{path}'. "
+                    "Set SUPPLY_FILE_BLOBS_DIR to a writable path."
+                ),
+            ) from exc
+
+
+blob_store = BlobStore(FILE_BLOBS_DIR)
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+
+OCR_MODEL = "mistral-ocr-latest"
+EXTRACTION_MODEL = "mistral-large-latest"
+DOCUMENT_TEXT_LIMIT = 15000
+
+EXTRACTION_PROMPT = (
+    "Extract invoice data from the document.\n"
+    "Return ONLY valid JSON object with keys:\n"
+    "{\n"
+    '  "invoice_num": string|null,\n'
+    '  "invoice_date": "YYYY-MM-DD"|null,\n'
+    '  "vat_rate": int|null,\n'
+    '  "vat_amount": number|null,\n'
+    '  "total_amount": number|null,\n'
+    '  "items": [\n'
+    "    {\n"
+    '      "name": string|null,\n'
+    '      "unit_name": string|null,\n'
+    '      "quantity": number|null,\n'
+    '      "price": number|null,\n'
+    '      "sum": number|null\n'
+    "    }\n"
+    "  ]\n"
+    "}\n"
+    "If field is missing in document, set null.\n"
+    "Document:\n"
+)
+
+
+# Part of the parse cache key: editing the prompt invalidates cached extractions.
+PROMPT_VERSION = hashlib.sha256(f"{EXTRACTION_PROMPT}{DOCUMENT_TEXT_LIMIT}".encode()).hexdigest()[:12]
+
+
+def build_extraction_prompt(document_text: str) -> str:
+    return EXTRACTION_PROMPT + document_text[:DOCUMENT_TEXT_LIMIT]
+
+
+class MistralExtractionClient:
+    ocr_version = OCR_MODEL
+    extraction_version = f"{EXTRACTION_MODEL}:{PROMPT_VERSION}"
+
+    def __init__(self, api_key: str) -> None:
+        try:
+            from mistralai import Mistral
+        except Exception as exc:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="mistralai package is not installed",
+            ) from exc
+        self.client = Mistral(api_key=api_key)
+
+    def ocr(self, file_name: str, content: bytes) -> str:
+        uploaded_file = self.client.files.upload(
+            file={
+                "file_name": file_name,
+                "content": content,
+            },
+            purpose="ocr",
+        )
+        signed_url = self.client.files.get_signed_url(file_id=uploaded_file.id)
+        ocr_response = self.client.ocr.process(
+            model=OCR_MODEL,
+            document={
+                "type": "document_url",
+                "document_url": signed_url.url,
+            },
+        )
+        return "\n\n".join(page.markdown for page in ocr_response.pages)
+
+    def complete(self, prompt: str) -> str:
+        chat_response = self.client.chat.complete(
+            model=EXTRACTION_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        raw_content = chat_response.choices[0].message.content
+        if isinstance(raw_content, list):
+            raw_content = "".join(
+                part.get("text", "") if isinstance(part, dict) else str(part)
+                for part in raw_content
+            )
+        return raw_content
+
+
+# Local stand-in for Mistral: returns a fixed payload without any network calls.
+class StubExtractionClient:
+    def __init__(self, payload: dict | None = None, markdown: str = "") -> None:
+        self.payload = payload if payload is not None else {"items": []}
+        self.markdown = markdown
+        # Different canned answers must not share parse cache entries.
+        self.ocr_version = "stub:" + hashlib.sha256(markdown.encode("utf-8")).hexdigest()[:12]
+        answer = json.dumps(self.payload, ensure_ascii=False, sort_keys=True)
+        self.extraction_version = "stub:" + hashlib.sha256(answer.encode("utf-8")).hexdigest()[:12]
+
+    def ocr(self, file_name: str, content: bytes) -> str:
+        return self.markdown
+
+    def complete(self, prompt: str) -> str:
+        return json.dumps(self.payload, ensure_ascii=False)
+
+
+def get_extraction_client():
+    if os.getenv("INVOICE_EXTRACTION_CLIENT", "mistral").lower() == "stub":
+        return StubExtractionClient()
+
+    mistral_api_key = os.getenv("MISTRAL_API_KEY")
+    if not mistral_api_key:
+        project_root = Path(__file__).resolve().parents[2]
+        load_dotenv(project_root / ".env", override=True)
+        mistral_api_key = os.getenv("MISTRAL_API_KEY")
+    if not mistral_api_key:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="MISTRAL_API_KEY is not set",
+        )
+    return MistralExtractionClient(mistral_api_key)
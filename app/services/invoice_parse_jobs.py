@@ -0,0 +1,203 @@
+import os
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import httpx
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.database import SupplySessionLocal
+from app.repositories.invoice_repository import InvoiceRepository
+from app.repositories.request_file_repository import RequestFileRepository
+from app.services.invoice_extraction import get_extraction_client
+from app.services.invoice_service import InvoiceService
+
+INVOICE_PARSE_WORKERS = int(os.getenv("INVOICE_PARSE_WORKERS", "2"))
+INVOICE_PARSE_MAX_PENDING = int(os.getenv("INVOICE_PARSE_MAX_PENDING", "100"))
+INVOICE_PARSE_MAX_ATTEMPTS = int(os.getenv("INVOICE_PARSE_MAX_ATTEMPTS", "3"))
+INVOICE_PARSE_RETRY_BACKOFF_SECONDS = float(os.getenv("INVOICE_PARSE_RETRY_BACKOFF_SECONDS", "2"))
+INVOICE_PARSE_JOB_TTL_SECONDS = float(os.getenv("INVOICE_PARSE_JOB_TTL_SECONDS", "3600"))
+
+# Throttling and upstream failures; other 4xx (auth, validation) answer the same on every attempt.
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429})
+
+ACTIVE_STATUSES = ("queued", "running", "retrying")
+FINISHED_STATUSES = ("succeeded", "failed")
+
+
+@dataclass
+class ParseJob:
+    id: str
+    invoice_id: int
+    file_path: str
+    user_id: str
+    status: str = "queued"
+    attempts: int = 0
+    error: str | None = None
+    result: dict | None = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "invoice_id": self.invoice_id,
+            "status": self.status,
+            "attempts": self.attempts,
+            "error": self.error,
+            "result": self.result,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class InvoiceParseQueue:
+    def __init__(
+        self,
+        client_factory: Callable[[], object] = get_extraction_client,
+        session_factory: Callable[[], Session] = SupplySessionLocal,
+        max_workers: int = INVOICE_PARSE_WORKERS,
+        max_pending: int = INVOICE_PARSE_MAX_PENDING,
+        max_attempts: int = INVOICE_PARSE_MAX_ATTEMPTS,
+        backoff_seconds: float = INVOICE_PARSE_RETRY_BACKOFF_SECONDS,
+        job_ttl_seconds: float = INVOICE_PARSE_JOB_TTL_SECONDS,
+    ) -> None:
+        self.client_factory = client_factory
+        self.session_factory = session_factory
+        self.max_pending = max_pending
+        self.max_attempts = max(max_attempts, 1)
+        self.backoff_seconds = backoff_seconds
+        self.job_ttl_seconds = job_ttl_seconds
+        self.succeeded = 0
+        self.failed = 0
+        self.retries = 0
+        self._jobs: dict[str, ParseJob] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="invoice-parse")
+
+    def submit(self, invoice_id: int, file_path: str, user_id: str) -> dict:
+        with self._lock:
+            self._prune()
+            for job in self._jobs.values():
+                # Parsing the same file again while a job is still in flight would only race it.
+                if job.status in ACTIVE_STATUSES and job.invoice_id == invoice_id and job.file_path == file_path:
+                    return job.to_dict()
+
+            if self._pending() >= self.max_pending:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Invoice parse queue is full",
+                )
+
+            job = ParseJob(id=str(uuid.uuid4()), invoice_id=invoice_id, file_path=file_path, user_id=user_id)
+            self._jobs[job.id] = job
+            snapshot = job.to_dict()
+
+        self._executor.submit(self._run, job)
+        return snapshot
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.to_dict() if job else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = {job_status: 0 for job_status in (*ACTIVE_STATUSES, *FINISHED_STATUSES)}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return {
+                "jobs": counts,
+                "succeeded_total": self.succeeded,
+                "failed_total": self.failed,
+                "retries_total": self.retries,
+                "max_pending": self.max_pending,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        # Queued jobs are dropped; with wait=True the running ones still commit their result.
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job: ParseJob) -> None:
+        self._update(job, status="running", started_at=datetime.utcnow())
+        db = self.session_factory()
+        try:
+            service = InvoiceService(InvoiceRepository(db), RequestFileRepository(db))
+            normalized = self._extract_with_retry(service, job)
+            result = service.apply_parsed_invoice(job.invoice_id, normalized, job.user_id)
+        except Exception as exc:
+            db.rollback()
+            self._update(job, status="failed", error=self._error_message(exc), finished_at=datetime.utcnow())
+            with self._lock:
+                self.failed += 1
+            return
+        finally:
+            db.close()
+
+        self._update(job, status="succeeded", error=None, result=result, finished_at=datetime.utcnow())
+        with self._lock:
+            self.succeeded += 1
+
+    def _extract_with_retry(self, service: InvoiceService, job: ParseJob) -> dict:
+        client = self.client_factory()
+        for attempt in range(1, self.max_attempts + 1):
+            self._update(job, attempts=attempt)
+            try:
+                return service.extract_invoice_payload(job.file_path, client)
+            except Exception as exc:
+                if not self._is_retryable(exc) or attempt == self.max_attempts:
+                    raise
+                self._update(job, status="retrying", error=self._error_message(exc))
+                with self._lock:
+                    self.retries += 1
+                time.sleep(self.backoff_seconds * 2 ** (attempt - 1))
+                self._update(job, status="running")
+
+    @staticmethod
+    def _is_retryable(exc: Exception) -> bool:
+        # HTTPExceptions are our own validation errors (bad file, unparsable answer) and will not
+        # change on retry.
+        if isinstance(exc, HTTPException):
+            return False
+        # Mistral SDK errors carry the upstream status_code, httpx status errors a response.
+        status_code = getattr(exc, "status_code", None)
+        if status_code is None:
+            status_code = getattr(getattr(exc, "response", None), "status_code", None)
+        if isinstance(status_code, int):
+            return status_code >= 500 or status_code in RETRYABLE_STATUS_CODES
+        # Without a status only connection problems and timeouts are transient.
+        return isinstance(exc, (httpx.TransportError, ConnectionError, TimeoutError))
+
+    @staticmethod
+    def _error_message(exc: Exception) -> str:
+        if isinstance(exc, HTTPException):
+            return str(exc.detail)
+        return f"{type(exc).__name__}: {exc}"
+
+    def _update(self, job: ParseJob, **changes) -> None:
+        with self._lock:
+            for name, value in changes.items():
+                setattr(job, name, value)
+
+    def _pending(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.status in ACTIVE_STATUSES)
+
+    def _prune(self) -> None:
+        now = datetime.utcnow()
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and (now - job.finished_at).total_seconds() > self.job_ttl_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+invoice_parse_queue = InvoiceParseQueue()
@@ -2,22 +2,23 @@ import hashlib
 import json
 import os
 import re
-import uuid
 from collections import defaultdict
 from datetime import date as dt_date
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
-from pathlib import Path
+from typing import BinaryIO
 
-from dotenv import load_dotenv
 from fastapi import HTTPException, status
 
-from app.models.request_file import FileAudit, FileDB
+from app.file_cache import FileCache
 from app.models.invoice import (
+    Invoice,
     InvoiceCreate,
     InvoiceLogCreate,
     InvoiceLogUpdate,
+    InvoiceItemBatchCreate,
     InvoiceItemCreate,
     InvoiceItemUpdate,
+    InvoiceListQuery,
     InvoicePaymentCreate,
     InvoicePaymentUpdate,
     InvoiceUpdate,
@@ -27,6 +28,9 @@ from app.repositories.counterparty_repository import CounterpartyRepository
 from app.repositories.auth_user_repository import AuthUserRepository
 from app.repositories.reference_object_repository import ReferenceObjectRepository
 from app.repositories.request_file_repository import RequestFileRepository
+from app.services.file_audit_sink import file_audit_sink
+from app.services.file_ingest import FileIngestService
+from app.services.invoice_extraction import build_extraction_prompt, get_extraction_client
 from app.services.project_name_builder import build_project_name, load_project_reference_maps
 
 DEFAULT_NEW_STATUS_ID = "1ff34436-1312-11f1-aa8c-bc241127d0bd"
@@ -35,6 +39,11 @@ BASE_INVOICE_FILES_DIR = os.getenv(
     "SUPPLY_INVOICE_FILES_DIR",
     "/home/webserver/models/supply/invoices",
 )
+INVOICE_PARSE_CACHE_DIR = os.getenv("INVOICE_PARSE_CACHE_DIR") or os.path.join(BASE_INVOICE_FILES_DIR, ".parse_cache")
+# Per worker process, see FileCache.
+INVOICE_PARSE_CACHE_MAX_MB = float(os.getenv("INVOICE_PARSE_CACHE_MAX_MB", "256"))
+
+invoice_parse_cache = FileCache(INVOICE_PARSE_CACHE_DIR, int(INVOICE_PARSE_CACHE_MAX_MB * 1024 * 1024))
 
 
 class InvoiceService:
@@ -52,25 +61,33 @@ class InvoiceService:
         self.auth_user_repo = auth_user_repo
         self.reference_repo = reference_repo
 
-    def get_all(self):
-        invoices = self.repo.get_invoices()
-        return self._serialize_invoice_list(invoices)
+    def get_all(self, filters: InvoiceListQuery | None = None):
+        invoices = self.repo.get_invoices(filters)
+        return self._serialize_for_view(invoices, self._view(filters))
 
-    def get_available_for_user(self, user_id: str):
-        logs = self.repo.get_invoice_logs_by_user(user_id)
-        invoice_ids = {log.invoice_id for log in logs}
+    def get_page(self, filters: InvoiceListQuery):
+        invoices, next_cursor = self.repo.get_invoice_page(filters)
+        return self._serialize_for_view(invoices, filters.view), next_cursor
 
-        all_invoices = self.repo.get_invoices()
-        for invoice in all_invoices:
-            if invoice.created_by == user_id:
-                invoice_ids.add(invoice.id)
+    def get_available_for_user(self, user_id: str, filters: InvoiceListQuery | None = None):
+        invoices = self.repo.get_invoices(filters, visible_to=user_id)
+        return self._serialize_for_view(invoices, self._view(filters))
 
-        invoices = self.repo.get_invoices_by_ids(list(invoice_ids))
-        return self._serialize_invoice_list(invoices)
+    def get_available_page(self, user_id: str, filters: InvoiceListQuery):
+        invoices, next_cursor = self.repo.get_invoice_page(filters, visible_to=user_id)
+        return self._serialize_for_view(invoices, filters.view), next_cursor
 
-    def parse_invoice_file_and_update(self, invoice_id: int, file_path: str, user_id: str):
-        invoice = self.repo.get_invoice_by_id(invoice_id)
-        if not invoice:
+    @staticmethod
+    def _view(filters: InvoiceListQuery | None) -> str:
+        return filters.view if filters is not None else "full"
+
+    def parse_invoice_file_and_update(self, invoice_id: int, file_path: str, user_id: str, client=None):
+        self.validate_parse_request(invoice_id, file_path)
+        normalized = self.extract_invoice_payload(file_path, client or get_extraction_client())
+        return self.apply_parsed_invoice(invoice_id, normalized, user_id)
+
+    def validate_parse_request(self, invoice_id: int, file_path: str) -> None:
+        if not self.repo.get_invoice_by_id(invoice_id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invoice not found")
 
         if not os.path.isabs(file_path):
@@ -84,25 +101,8 @@ class InvoiceService:
                 detail="File not found by file_path",
             )
 
-        mistral_api_key = os.getenv("MISTRAL_API_KEY")
-        if not mistral_api_key:
-            project_root = Path(__file__).resolve().parents[2]
-            load_dotenv(project_root / ".env", override=True)
-            mistral_api_key = os.getenv("MISTRAL_API_KEY")
-        if not mistral_api_key:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="MISTRAL_API_KEY is not set",
-            )
-
-        try:
-            from mistralai import Mistral
-        except Exception as exc:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="mistralai package is not installed",
-            ) from exc
-
+    # The external calls run without touching the database, so a parse job can retry them on its own.
+    def extract_invoice_payload(self, file_path: str, client) -> dict:
         try:
             with open(file_path, "rb") as file_stream:
                 file_bytes = file_stream.read()
@@ -112,83 +112,44 @@ class InvoiceService:
                 detail=f"Cannot read file: {file_path}",
             ) from exc
 
-        client = Mistral(api_key=mistral_api_key)
-        uploaded_file = client.files.upload(
-            file={
-                "file_name": os.path.basename(file_path),
-                "content": file_bytes,
-            },
-            purpose="ocr",
-        )
-        signed_url = client.files.get_signed_url(file_id=uploaded_file.id)
-        ocr_response = client.ocr.process(
-            model="mistral-ocr-latest",
-            document={
-                "type": "document_url",
-                "document_url": signed_url.url,
-            },
-        )
+        # Same content hash as FileDB.md5_hash; re-uploads of one PDF share the cached results.
+        content_hash = hashlib.md5(file_bytes).hexdigest()
+        extraction_key = self._parse_cache_key("extraction", content_hash, client.ocr_version, client.extraction_version)
+        cached_payload = invoice_parse_cache.get(extraction_key)
+        if cached_payload is not None:
+            return self._normalize_invoice_payload(json.loads(cached_payload))
 
-        document_text = "\n\n".join(page.markdown for page in ocr_response.pages)
-        prompt = (
-            "Extract invoice data from the document.\n"
-            "Return ONLY valid JSON object with keys:\n"
-            "{\n"
-            '  "invoice_num": string|null,\n'
-            '  "invoice_date": "YYYY-MM-DD"|null,\n'
-            '  "vat_rate": int|null,\n'
-            '  "vat_amount": number|null,\n'
-            '  "total_amount": number|null,\n'
-            '  "items": [\n'
-            "    {\n"
-            '      "name": string|null,\n'
-            '      "unit_name": string|null,\n'
-            '      "quantity": number|null,\n'
-            '      "price": number|null,\n'
-            '      "sum": number|null\n'
-            "    }\n"
-            "  ]\n"
-            "}\n"
-            "If field is missing in document, set null.\n"
-            "Document:\n"
-            f"{document_text[:15000]}"
-        )
+        ocr_key = self._parse_cache_key("ocr", content_hash, client.ocr_version)
+        document_text = invoice_parse_cache.get(ocr_key)
+        if document_text is None:
+            document_text = client.ocr(os.path.basename(file_path), file_bytes)
+            invoice_parse_cache.set(ocr_key, document_text)
 
-        chat_response = client.chat.complete(
-            model="mistral-large-latest",
-            messages=[{"role": "user", "content": prompt}],
-        )
-        raw_content = chat_response.choices[0].message.content
-        if isinstance(raw_content, list):
-            raw_content = "".join(
-                part.get("text", "") if isinstance(part, dict) else str(part)
-                for part in raw_content
-            )
+        raw_content = client.complete(build_extraction_prompt(document_text))
         parsed_payload = self._extract_json_payload(raw_content)
+        invoice_parse_cache.set(extraction_key, json.dumps(parsed_payload, ensure_ascii=False))
+        return self._normalize_invoice_payload(parsed_payload)
+
+    @staticmethod
+    def _parse_cache_key(*parts: str) -> str:
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
 
-        normalized = self._normalize_invoice_payload(parsed_payload)
-        invoice.num = normalized["invoice_num"]
-        invoice.date = normalized["invoice_date"]
-        invoice.total_amount = normalized["total_amount"] if normalized["total_amount"] is not None else 0
-        invoice.vat_rate = normalized["vat_rate"] if normalized["vat_rate"] is not None else 0
-        invoice.vat_amount = normalized["vat_amount"] if normalized["vat_amount"] is not None else 0
-        self.repo.save_invoice(invoice)
+    def apply_parsed_invoice(self, invoice_id: int, normalized: dict, user_id: str):
+        invoice = self.repo.get_invoice_by_id(invoice_id)
+        if not invoice:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invoice not found")
 
-        self.repo.delete_invoice_items_by_invoice_id(invoice_id)
-        created_items = []
-        for item in normalized["items"]:
-            created = self.repo.create_invoice_item(invoice_id, item)
-            created_items.append(created)
+        header = {
+            "num": normalized["invoice_num"],
+            "date": normalized["invoice_date"],
+            "total_amount": normalized["total_amount"] if normalized["total_amount"] is not None else 0,
+            "vat_rate": normalized["vat_rate"] if normalized["vat_rate"] is not None else 0,
+            "vat_amount": normalized["vat_amount"] if normalized["vat_amount"] is not None else 0,
+        }
+        items_count = self.repo.replace_invoice_items(invoice, header, normalized["items"])
 
         if invoice.file_id and self.file_repo:
-            self.file_repo.add_audit(
-                FileAudit(
-                    id=str(uuid.uuid4()),
-                    file_id=invoice.file_id,
-                    action="view",
-                    user_id=user_id,
-                )
-            )
+            file_audit_sink.record(invoice.file_id, "view", user_id)
 
         return {
             "status": "success",
@@ -200,24 +161,11 @@ class InvoiceService:
                 "vat_amount": normalized["vat_amount"],
                 "total_amount": normalized["total_amount"],
             },
-            "items_count": len(created_items),
+            "items_count": items_count,
         }
 
     def create_invoice(self, payload: InvoiceCreate, user_id: str):
-        data = payload.model_dump(exclude_unset=True)
-        data = self._apply_request_object_levels_fallback(data)
-        data.setdefault("is_delivery_included", False)
-        data.setdefault("prepayment_percent", 0)
-        data.setdefault("due_days", 0)
-        data.setdefault("valid_until", 0)
-        data.setdefault("is_urgent", False)
-        data.setdefault("total_amount", 0)
-        data.setdefault("vat_rate", 0)
-        data.setdefault("vat_amount", 0)
-        data.setdefault("status", DEFAULT_NEW_STATUS_ID)
-        data["created_by"] = user_id
-
-        created = self.repo.create_invoice(data)
+        created = self.repo.create_invoice(self._new_invoice_data(payload, user_id))
         return self.get_invoice(created.id)
 
     def create_invoice_with_file(
@@ -226,7 +174,7 @@ class InvoiceService:
         user_id: str,
         original_name: str,
         mime_type: str,
-        file_bytes: bytes,
+        file_stream: BinaryIO,
     ):
         if not self.file_repo:
             raise HTTPException(
@@ -234,81 +182,27 @@ class InvoiceService:
                 detail="File repository is not configured",
             )
 
-        file_type = self.file_repo.get_file_type_by_id(INVOICE_FILE_TYPE_ID)
+        ingest = FileIngestService(self.file_repo)
+        file_type = ingest.get_file_type(INVOICE_FILE_TYPE_ID)
         if not file_type:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Active invoice file type not found",
             )
 
-        extension = Path(original_name).suffix.lower().lstrip(".")
-        if not extension:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File extension is required",
-            )
+        invoice = Invoice(**self._new_invoice_data(payload, user_id))
 
-        allowed_extensions = file_type.allowed_extensions or []
-        if isinstance(allowed_extensions, str):
-            allowed_extensions = [allowed_extensions]
-        normalized_allowed = [str(item).lower().lstrip(".") for item in allowed_extensions]
-        if normalized_allowed and extension not in normalized_allowed:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File extension .{extension} is not allowed",
-            )
-
-        max_size_mb = file_type.max_size_mb or 10
-        if len(file_bytes) > max_size_mb * 1024 * 1024:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File size exceeds {max_size_mb} MB",
-            )
+        def link_invoice(file_id: str) -> list:
+            invoice.file_id = file_id
+            return [invoice]
 
-        file_id = str(uuid.uuid4())
-        storage_name = f"{uuid.uuid4().hex}.{extension}"
-        directory_suffix = str(payload.request_id) if payload.request_id is not None else user_id
-        invoice_dir = os.path.join(BASE_INVOICE_FILES_DIR, directory_suffix)
-        self._ensure_directory(invoice_dir)
-
-        file_path = os.path.join(invoice_dir, storage_name)
-        with open(file_path, "wb") as file_stream:
-            file_stream.write(file_bytes)
-
-        md5_hash = hashlib.md5(file_bytes).hexdigest()
-        file_row = FileDB(
-            id=file_id,
-            original_name=original_name,
-            storage_name=storage_name,
-            file_type_id=file_type.id,
-            mime_type=mime_type or "application/octet-stream",
-            extension=extension,
-            file_size=len(file_bytes),
-            md5_hash=md5_hash,
-            file_path=file_path,
-            version=1,
-            uploaded_by=user_id,
-            status="active",
-        )
-
-        try:
-            created_file = self.file_repo.create_file(file_row)
-            self.file_repo.add_audit(
-                FileAudit(
-                    id=str(uuid.uuid4()),
-                    file_id=created_file.id,
-                    action="upload",
-                    user_id=user_id,
-                )
-            )
-        except Exception:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-            raise
+        # File, invoice and upload audit are committed together.
+        ingest.ingest(file_type, original_name, mime_type, file_stream, user_id, link_invoice)
+        return self.get_invoice(invoice.id)
 
+    def _new_invoice_data(self, payload: InvoiceCreate, user_id: str) -> dict:
         data = payload.model_dump(exclude_unset=True)
         data = self._apply_request_object_levels_fallback(data)
-        data["file_id"] = created_file.id
         data.setdefault("is_delivery_included", False)
         data.setdefault("prepayment_percent", 0)
         data.setdefault("due_days", 0)
@@ -319,22 +213,7 @@ class InvoiceService:
         data.setdefault("vat_amount", 0)
         data.setdefault("status", DEFAULT_NEW_STATUS_ID)
         data["created_by"] = user_id
-
-        created = self.repo.create_invoice(data)
-        return self.get_invoice(created.id)
-
-    @staticmethod
-    def _ensure_directory(path: str) -> None:
-        try:
-            os.makedirs(path, exist_ok=True)
-        except OSError as exc:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=(
-                    f"Cannot create directory '{path}'. "
-                    "Set SUPPLY_INVOICE_FILES_DIR to a writable path."
-                ),
-            ) from exc
+        return data
 
     def update_invoice(self, invoice_id: int, payload: InvoiceUpdate):
         invoice = self.repo.get_invoice_by_id(invoice_id)
@@ -357,7 +236,7 @@ class InvoiceService:
         self.repo.delete_invoice(invoice)
         return None
 
-    def get_invoice_file_download_payload(self, invoice_id: int, user_id: str):
+    def get_invoice_file_download_payload(self, invoice_id: int):
         if not self.file_repo:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -385,21 +264,17 @@ class InvoiceService:
                 detail="File not found on disk",
             )
 
-        self.file_repo.add_audit(
-            FileAudit(
-                id=str(uuid.uuid4()),
-                file_id=file_row.id,
-                action="download",
-                user_id=user_id,
-            )
-        )
-
         return {
+            "file_id": file_row.id,
             "path": file_row.file_path,
             "filename": file_row.original_name,
             "media_type": file_row.mime_type,
+            "md5_hash": file_row.md5_hash,
         }
 
+    def record_file_download(self, file_id: str, user_id: str) -> None:
+        file_audit_sink.record(file_id, "download", user_id)
+
     def create_invoice_item(self, invoice_id: int, payload: InvoiceItemCreate):
         invoice = self.repo.get_invoice_by_id(invoice_id)
         if not invoice:
@@ -410,6 +285,18 @@ class InvoiceService:
         unit_names = self.repo.get_unit_names([item.unit_id] if item.unit_id else [])
         return self._item_to_dict(item, unit_names)
 
+    def create_invoice_items(self, invoice_id: int, payload: InvoiceItemBatchCreate):
+        invoice = self.repo.get_invoice_by_id(invoice_id)
+        if not invoice:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invoice not found")
+
+        items = self.repo.create_invoice_items(
+            invoice_id,
+            [item.model_dump(exclude_unset=True) for item in payload.items],
+        )
+        unit_names = self.repo.get_unit_names([item.unit_id for item in items if item.unit_id])
+        return [self._item_to_dict(item, unit_names) for item in items]
+
     def update_invoice_item(self, invoice_id: int, item_id: str, payload: InvoiceItemUpdate):
         item = self.repo.get_invoice_item_by_id(invoice_id, item_id)
         if not item:
@@ -500,6 +387,15 @@ class InvoiceService:
         return self._map_payment(updated, users_by_id)
 
     def get_invoice(self, invoice_id: int):
+        detail = self.load_invoice_detail(invoice_id)
+        users_by_id = self.load_users(detail["user_ids"])
+        reference = self.load_invoice_reference(detail["object_levels_id"], detail["counterparty_ids"])
+        return self.build_invoice_detail(detail, users_by_id, reference)
+
+    # get_invoice and the list serializers are split into phases that each touch one database
+    # (supply, then auth and reference), so the async routes can run the last two concurrently.
+
+    def load_invoice_detail(self, invoice_id: int) -> dict:
         invoice = self.repo.get_invoice_by_id(invoice_id)
         if not invoice:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invoice not found")
@@ -513,7 +409,6 @@ class InvoiceService:
         object_levels_id = invoice.object_levels_id
         if not object_levels_id and invoice.request_id is not None:
             object_levels_id = request_meta.get(invoice.request_id, {}).get("object_levels_id")
-        project_name, project = self._build_project_block(object_levels_id)
 
         logs = self.repo.get_invoice_logs(invoice.id)
         payments = self.repo.get_invoice_payments(invoice.id)
@@ -524,29 +419,55 @@ class InvoiceService:
                 payment_user_ids.append(payment.created_by)
             if payment.paid_by:
                 payment_user_ids.append(payment.paid_by)
-        users_by_id = self._get_users_map(
-            log_user_ids + payment_user_ids + ([invoice.created_by] if invoice.created_by else [])
-        )
 
-        grouped_logs = self._group_invoice_logs(logs, users_by_id)
+        return {
+            "invoice": invoice,
+            "items": items,
+            "unit_names": unit_names,
+            "request_meta": request_meta,
+            "object_levels_id": object_levels_id,
+            "logs": logs,
+            "payments": payments,
+            "status_name": self.repo.get_status_name(invoice.status),
+            "file": self._build_file_payload(invoice.file_id),
+            "user_ids": log_user_ids + payment_user_ids + ([invoice.created_by] if invoice.created_by else []),
+            "counterparty_ids": [invoice.provider_id, invoice.payer_id],
+        }
+
+    def load_invoice_reference(self, object_levels_id: str | None, counterparty_ids: list[str | None]) -> dict:
+        project_name, project = self._build_project_block(object_levels_id)
+        return {
+            "project_name": project_name,
+            "project": project,
+            "counterparties": self._build_counterparty_payloads(counterparty_ids),
+            "counterparty_names": self._build_counterparty_names(counterparty_ids),
+        }
+
+    def build_invoice_detail(self, detail: dict, users_by_id: dict[str, object], reference: dict) -> dict:
+        invoice = detail["invoice"]
+        request_meta = detail["request_meta"]
+        project = reference["project"]
+        counterparties = reference["counterparties"]
+        counterparty_names = reference["counterparty_names"]
+        grouped_logs = self._group_invoice_logs(detail["logs"], users_by_id)
 
         return {
             "id": invoice.id,
-            "object_levels_id": object_levels_id,
+            "object_levels_id": detail["object_levels_id"],
             "project_id": project.id if project else None,
-            "project_name": project_name,
+            "project_name": reference["project_name"],
             "num": invoice.num,
             "date": invoice.date,
             "request_id": invoice.request_id,
             "request_name": request_meta.get(invoice.request_id, {}).get("name"),
             "file_id": invoice.file_id,
-            "file": self._build_file_payload(invoice.file_id),
+            "file": detail["file"],
             "provider_id": invoice.provider_id,
-            "provider": self._build_counterparty_payload(invoice.provider_id),
-            "provider_name": self._build_counterparty_name(invoice.provider_id),
+            "provider": counterparties.get(invoice.provider_id),
+            "provider_name": counterparty_names.get(invoice.provider_id),
             "payer_id": invoice.payer_id,
-            "payer": self._build_counterparty_payload(invoice.payer_id),
-            "payer_name": self._build_counterparty_name(invoice.payer_id),
+            "payer": counterparties.get(invoice.payer_id),
+            "payer_name": counterparty_names.get(invoice.payer_id),
             "is_delivery_included": invoice.is_delivery_included,
             "prepayment_percent": invoice.prepayment_percent,
             "due_days": invoice.due_days,
@@ -556,7 +477,7 @@ class InvoiceService:
             "vat_rate": invoice.vat_rate,
             "vat_amount": invoice.vat_amount,
             "status": invoice.status,
-            "status_name": self.repo.get_status_name(invoice.status),
+            "status_name": detail["status_name"],
             "created_at": invoice.created_at,
             "updated_at": invoice.updated_at,
             "created_by": invoice.created_by,
@@ -564,8 +485,8 @@ class InvoiceService:
             "approvals": grouped_logs["approval"],
             "planning": grouped_logs["planning"],
             "payment": grouped_logs["payment"],
-            "payments": [self._map_payment(payment, users_by_id) for payment in payments],
-            "items": [self._item_to_dict(item, unit_names) for item in items],
+            "payments": [self._map_payment(payment, users_by_id) for payment in detail["payments"]],
+            "items": [self._item_to_dict(item, detail["unit_names"]) for item in detail["items"]],
         }
 
     @staticmethod
@@ -586,10 +507,10 @@ class InvoiceService:
             "converted_quantity": item.converted_quantity,
         }
 
-    def _build_counterparty_payload(self, counterparty_id: str | None) -> dict | None:
+    def _build_counterparty_payloads(self, counterparty_ids: list[str | None]) -> dict[str, dict]:
         if not self.counterparty_repo:
-            return None
-        return self.counterparty_repo.get_counterparty_brief(counterparty_id)
+            return {}
+        return self.counterparty_repo.get_counterparty_briefs(counterparty_ids)
 
     def _build_file_payload(self, file_id: str | None) -> dict | None:
         if not file_id or not self.file_repo:
@@ -608,83 +529,131 @@ class InvoiceService:
             "file_size": file_row.file_size,
         }
 
-    def _serialize_invoice_list(self, invoices):
+    def _serialize_for_view(self, invoices, view: str):
         if not invoices:
             return []
 
+        rows = self.load_invoice_list_rows(invoices, view)
+        users_by_id = self.load_users(rows["user_ids"])
+        counterparty_names, project_maps = self.load_list_reference_lookups(
+            rows["counterparty_ids"],
+            list(rows["object_levels_by_invoice_id"].values()),
+        )
+        return self.build_invoice_list(invoices, rows, users_by_id, counterparty_names, project_maps)
+
+    def load_invoice_list_rows(self, invoices, view: str) -> dict:
         request_ids = [invoice.request_id for invoice in invoices if invoice.request_id is not None]
         request_meta = self.repo.get_requests_meta_by_ids(request_ids)
 
         counterparty_ids = set()
         user_ids = set()
-        object_level_ids = []
-        invoice_ids = []
+        object_levels_by_invoice_id = {}
         for invoice in invoices:
-            invoice_ids.append(invoice.id)
             if invoice.provider_id:
                 counterparty_ids.add(invoice.provider_id)
             if invoice.payer_id:
                 counterparty_ids.add(invoice.payer_id)
-            if invoice.created_by:
-                user_ids.add(invoice.created_by)
             object_levels_id = invoice.object_levels_id
             if not object_levels_id and invoice.request_id is not None:
                 object_levels_id = request_meta.get(invoice.request_id, {}).get("object_levels_id")
-            if object_levels_id:
-                object_level_ids.append(object_levels_id)
+            object_levels_by_invoice_id[invoice.id] = object_levels_id
+
+        rows = {
+            "view": view,
+            "request_meta": request_meta,
+            "object_levels_by_invoice_id": object_levels_by_invoice_id,
+            "counterparty_ids": list(counterparty_ids),
+            "status_names": self.repo.get_status_names([invoice.status for invoice in invoices]),
+            "user_ids": [],
+        }
+        invoice_ids = [invoice.id for invoice in invoices]
+        if view == "summary":
+            rows["counts"] = self.repo.get_invoice_counts(invoice_ids)
+            return rows
+
+        for invoice in invoices:
+            if invoice.created_by:
+                user_ids.add(invoice.created_by)
 
-        logs = self.repo.get_invoice_logs_by_invoice_ids(invoice_ids)
         logs_by_invoice_id = defaultdict(list)
-        for log in logs:
+        for log in self.repo.get_invoice_logs_by_invoice_ids(invoice_ids):
             logs_by_invoice_id[log.invoice_id].append(log)
             if log.user_id:
                 user_ids.add(log.user_id)
 
-        payments = self.repo.get_invoice_payments_by_invoice_ids(invoice_ids)
         payments_by_invoice_id = defaultdict(list)
-        for payment in payments:
+        for payment in self.repo.get_invoice_payments_by_invoice_ids(invoice_ids):
             payments_by_invoice_id[payment.invoice_id].append(payment)
             if payment.created_by:
                 user_ids.add(payment.created_by)
             if payment.paid_by:
                 user_ids.add(payment.paid_by)
 
-        counterparty_names = self.reference_repo.get_counterparty_names(list(counterparty_ids)) if self.reference_repo else {}
-        users_by_id = self._get_users_map(list(user_ids))
+        rows["logs_by_invoice_id"] = logs_by_invoice_id
+        rows["payments_by_invoice_id"] = payments_by_invoice_id
+        rows["user_ids"] = list(user_ids)
+        return rows
 
-        levels_by_id, objects_by_id, contracts_by_id, work_types_by_id = load_project_reference_maps(
+    def load_users(self, user_ids: list[str]) -> dict[str, object]:
+        return self._get_users_map(user_ids)
+
+    def load_list_reference_lookups(self, counterparty_ids: list[str], object_level_ids: list[str | None]):
+        if not self.reference_repo:
+            return {}, None
+
+        counterparty_names = self.reference_repo.get_counterparty_names(counterparty_ids)
+        project_maps = load_project_reference_maps(
             self.reference_repo,
-            object_level_ids,
-        ) if self.reference_repo else ({}, {}, {}, {})
+            [level_id for level_id in object_level_ids if level_id],
+        )
+        return counterparty_names, project_maps
+
+    def build_invoice_list(
+        self,
+        invoices,
+        rows: dict,
+        users_by_id: dict[str, object],
+        counterparty_names: dict[str, str],
+        project_maps,
+    ) -> list[dict]:
+        request_meta = rows["request_meta"]
+        status_names = rows["status_names"]
 
         result = []
         for invoice in invoices:
-            object_levels_id = invoice.object_levels_id
-            if not object_levels_id and invoice.request_id is not None:
-                object_levels_id = request_meta.get(invoice.request_id, {}).get("object_levels_id")
-            project_name = build_project_name(
-                object_levels_id,
-                levels_by_id,
-                objects_by_id,
-                contracts_by_id,
-                work_types_by_id,
-            ) if self.reference_repo else None
-            grouped_logs = self._group_invoice_logs(logs_by_invoice_id.get(invoice.id, []), users_by_id)
-            result.append(
+            object_levels_id = rows["object_levels_by_invoice_id"].get(invoice.id)
+            data = {
+                "id": invoice.id,
+                "object_levels_id": object_levels_id,
+                "project_name": build_project_name(object_levels_id, *project_maps) if project_maps else None,
+                "num": invoice.num,
+                "date": invoice.date,
+                "request_id": invoice.request_id,
+                "request_name": request_meta.get(invoice.request_id, {}).get("name"),
+                "provider_id": invoice.provider_id,
+                "provider_name": counterparty_names.get(invoice.provider_id),
+                "payer_id": invoice.payer_id,
+                "payer_name": counterparty_names.get(invoice.payer_id),
+                "status": invoice.status,
+                "status_name": status_names.get(invoice.status),
+            }
+
+            if rows["view"] == "summary":
+                data.update(
+                    {
+                        "is_urgent": invoice.is_urgent,
+                        "total_amount": invoice.total_amount,
+                        "created_at": invoice.created_at,
+                        "created_by": invoice.created_by,
+                        **rows["counts"].get(invoice.id, {}),
+                    }
+                )
+                result.append(data)
+                continue
+
+            grouped_logs = self._group_invoice_logs(rows["logs_by_invoice_id"].get(invoice.id, []), users_by_id)
+            data.update(
                 {
-                    "id": invoice.id,
-                    "object_levels_id": object_levels_id,
-                    "project_name": project_name,
-                    "num": invoice.num,
-                    "date": invoice.date,
-                    "request_id": invoice.request_id,
-                    "request_name": request_meta.get(invoice.request_id, {}).get("name"),
-                    "provider_id": invoice.provider_id,
-                    "provider_name": counterparty_names.get(invoice.provider_id),
-                    "payer_id": invoice.payer_id,
-                    "payer_name": counterparty_names.get(invoice.payer_id),
-                    "status": invoice.status,
-                    "status_name": self.repo.get_status_name(invoice.status),
                     "total_amount": invoice.total_amount,
                     "created_at": invoice.created_at,
                     "created_by": invoice.created_by,
@@ -694,10 +663,11 @@ class InvoiceService:
                     "payment": grouped_logs["payment"],
                     "payments": [
                         self._map_payment(payment, users_by_id)
-                        for payment in payments_by_invoice_id.get(invoice.id, [])
+                        for payment in rows["payments_by_invoice_id"].get(invoice.id, [])
                     ],
                 }
             )
+            result.append(data)
         return result
 
     def _build_project_block(self, object_levels_id: str | None):
@@ -743,11 +713,10 @@ class InvoiceService:
             "payment": grouped["payment"],
         }
 
-    def _build_counterparty_name(self, counterparty_id: str | None) -> str | None:
-        if not counterparty_id or not self.reference_repo:
-            return None
-        mapping = self.reference_repo.get_counterparty_names([counterparty_id])
-        return mapping.get(counterparty_id)
+    def _build_counterparty_names(self, counterparty_ids: list[str | None]) -> dict[str, str]:
+        if not self.reference_repo:
+            return {}
+        return self.reference_repo.get_counterparty_names(counterparty_ids)
 
     def _get_users_map(self, user_ids: list[str]):
         if not self.auth_user_repo:
@@ -31,8 +31,15 @@ class ItemMappingService:
         )
         unit_ids = [mapping.unit_id for mapping, _, _ in rows if mapping.unit_id]
         unit_names = self.repo.get_unit_names(unit_ids)
+        kit_head_quantities = self.repo.get_kit_head_quantities(
+            [
+                (mapping.request_id, mapping.invoice_id, mapping.group_number)
+                for mapping, _, _ in rows
+                if mapping.match_type == "kit_component"
+            ]
+        )
         return [
-            self._to_response(mapping, request_item, invoice_item, unit_names)
+            self._to_response(mapping, request_item, invoice_item, unit_names, kit_head_quantities)
             for mapping, request_item, invoice_item in rows
         ]
 
@@ -224,12 +231,23 @@ class ItemMappingService:
 
         return request_item, invoice_item
 
-    def _to_response(self, mapping, request_item, invoice_item, unit_names: dict[str, str] | None = None):
+    def _to_response(
+        self,
+        mapping,
+        request_item,
+        invoice_item,
+        unit_names: dict[str, str] | None = None,
+        kit_head_quantities: dict | None = None,
+    ):
         unit_names = unit_names or {}
         mapped_quantity_sum = mapping.mapped_quantity if mapping.match_type == "sum" else None
         mapped_quantity_head = None
         if mapping.match_type == "kit_head":
             mapped_quantity_head = mapping.mapped_quantity
+        elif mapping.match_type == "kit_component" and kit_head_quantities is not None:
+            mapped_quantity_head = kit_head_quantities.get(
+                (mapping.request_id, mapping.invoice_id, mapping.group_number)
+            )
         elif mapping.match_type == "kit_component":
             mapped_quantity_head = self.repo.get_kit_head_quantity(
                 request_id=mapping.request_id,
@@ -1,126 +1,45 @@
-import hashlib
 import os
 import uuid
-from pathlib import Path
+from typing import BinaryIO
 
 from fastapi import HTTPException, status
 
-from app.models.request_file import FileAudit, FileDB, RequestFile
+from app.models.request_file import RequestFile
 from app.repositories.request_file_repository import RequestFileRepository
+from app.services.file_audit_sink import file_audit_sink
+from app.services.file_ingest import FileIngestService, FileTypeRule
+from app.services.file_storage import blob_store
 
-BASE_REQUEST_FILES_DIR = os.getenv(
-    "SUPPLY_REQUEST_FILES_DIR",
-    os.path.join(os.getcwd(), "storage", "request"),
-)
 INVOICE_FILE_TYPE_ID = "4594a94b-140f-11f1-aa8c-bc241127d0bd"
 
 
 class RequestFileService:
-    def __init__(self, repo: RequestFileRepository) -> None:
+    def __init__(self, repo: RequestFileRepository, ingest: FileIngestService | None = None) -> None:
         self.repo = repo
+        self.ingest = ingest or FileIngestService(repo)
 
     def upload_request_attachment(
         self,
         request_id: int,
         original_name: str,
         mime_type: str,
-        file_bytes: bytes,
+        file_stream: BinaryIO,
         user_id: str,
     ):
         if not self.repo.request_exists(request_id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Request not found")
 
-        attachment_type = self.repo.get_request_attachment_type()
+        attachment_type = self.ingest.get_request_attachment_type()
         if not attachment_type:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Active file type 'request_attachment' not found",
             )
 
-        extension = Path(original_name).suffix.lower().lstrip(".")
-        if not extension:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File extension is required",
-            )
-
-        allowed_extensions = attachment_type.allowed_extensions or []
-        if isinstance(allowed_extensions, str):
-            allowed_extensions = [allowed_extensions]
-        normalized_allowed = [str(item).lower().lstrip(".") for item in allowed_extensions]
-        if normalized_allowed and extension not in normalized_allowed:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File extension .{extension} is not allowed",
-            )
-
-        max_size_mb = attachment_type.max_size_mb or 10
-        if len(file_bytes) > max_size_mb * 1024 * 1024:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File size exceeds {max_size_mb} MB",
-            )
-
-        file_id = str(uuid.uuid4())
-        storage_name = f"{uuid.uuid4().hex}.{extension}"
-        request_dir = os.path.join(BASE_REQUEST_FILES_DIR, str(request_id))
-        self._ensure_directory(request_dir)
-        file_path = os.path.join(request_dir, storage_name)
-
-        with open(file_path, "wb") as f:
-            f.write(file_bytes)
-
-        md5_hash = hashlib.md5(file_bytes).hexdigest()
-
-        file_row = FileDB(
-            id=file_id,
-            original_name=original_name,
-            storage_name=storage_name,
-            file_type_id=attachment_type.id,
-            mime_type=mime_type or "application/octet-stream",
-            extension=extension,
-            file_size=len(file_bytes),
-            md5_hash=md5_hash,
-            file_path=file_path,
-            version=1,
-            uploaded_by=user_id,
-            status="active",
-        )
-        request_file_row = RequestFile(
-            id=str(uuid.uuid4()),
-            request_id=request_id,
-            file_id=file_id,
-            link_type="attachment",
-            created_by=user_id,
-            is_main=False,
-            sort_order=0,
+        return self._ingest_request_file(
+            request_id, attachment_type, "attachment", original_name, mime_type, file_stream, user_id
         )
 
-        try:
-            created = self.repo.create_file_and_link(file_row, request_file_row)
-            self.repo.add_audit(
-                FileAudit(
-                    id=str(uuid.uuid4()),
-                    file_id=file_id,
-                    action="upload",
-                    user_id=user_id,
-                )
-            )
-        except Exception:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-            raise
-
-        return {
-            "id": created.id,
-            "request_id": request_id,
-            "original_name": created.original_name,
-            "mime_type": created.mime_type,
-            "extension": created.extension,
-            "file_size": created.file_size,
-            "file_path": created.file_path,
-        }
-
     def get_request_files(self, request_id: int):
         if not self.repo.request_exists(request_id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Request not found")
@@ -156,102 +75,56 @@ class RequestFileService:
         request_id: int,
         original_name: str,
         mime_type: str,
-        file_bytes: bytes,
+        file_stream: BinaryIO,
         user_id: str,
     ):
         if not self.repo.request_exists(request_id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Request not found")
 
-        invoice_type = self.repo.get_file_type_by_id(INVOICE_FILE_TYPE_ID)
+        invoice_type = self.ingest.get_file_type(INVOICE_FILE_TYPE_ID)
         if not invoice_type:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Active file type for invoice not found",
             )
 
-        extension = Path(original_name).suffix.lower().lstrip(".")
-        if not extension:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File extension is required",
-            )
-
-        allowed_extensions = invoice_type.allowed_extensions or []
-        if isinstance(allowed_extensions, str):
-            allowed_extensions = [allowed_extensions]
-        normalized_allowed = [str(item).lower().lstrip(".") for item in allowed_extensions]
-        if normalized_allowed and extension not in normalized_allowed:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File extension .{extension} is not allowed",
-            )
-
-        max_size_mb = invoice_type.max_size_mb or 10
-        if len(file_bytes) > max_size_mb * 1024 * 1024:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File size exceeds {max_size_mb} MB",
-            )
-
-        file_id = str(uuid.uuid4())
-        storage_name = f"{uuid.uuid4().hex}.{extension}"
-        request_dir = os.path.join(BASE_REQUEST_FILES_DIR, str(request_id))
-        self._ensure_directory(request_dir)
-        file_path = os.path.join(request_dir, storage_name)
-
-        with open(file_path, "wb") as f:
-            f.write(file_bytes)
-
-        md5_hash = hashlib.md5(file_bytes).hexdigest()
-
-        file_row = FileDB(
-            id=file_id,
-            original_name=original_name,
-            storage_name=storage_name,
-            file_type_id=invoice_type.id,
-            mime_type=mime_type or "application/octet-stream",
-            extension=extension,
-            file_size=len(file_bytes),
-            md5_hash=md5_hash,
-            file_path=file_path,
-            version=1,
-            uploaded_by=user_id,
-            status="active",
-        )
-        request_file_row = RequestFile(
-            id=str(uuid.uuid4()),
-            request_id=request_id,
-            file_id=file_id,
-            link_type="invoice",
-            created_by=user_id,
-            is_main=False,
-            sort_order=0,
+        created = self._ingest_request_file(
+            request_id, invoice_type, "invoice", original_name, mime_type, file_stream, user_id
         )
+        return {**created, "link_type": "invoice"}
 
-        try:
-            created = self.repo.create_file_and_link(file_row, request_file_row)
-            self.repo.add_audit(
-                FileAudit(
+    def _ingest_request_file(
+        self,
+        request_id: int,
+        file_type: FileTypeRule,
+        link_type: str,
+        original_name: str,
+        mime_type: str,
+        file_stream: BinaryIO,
+        user_id: str,
+    ) -> dict:
+        def link(file_id: str) -> list:
+            return [
+                RequestFile(
                     id=str(uuid.uuid4()),
+                    request_id=request_id,
                     file_id=file_id,
-                    action="upload",
-                    user_id=user_id,
+                    link_type=link_type,
+                    created_by=user_id,
+                    is_main=False,
+                    sort_order=0,
                 )
-            )
-        except Exception:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-            raise
+            ]
 
+        created = self.ingest.ingest(file_type, original_name, mime_type, file_stream, user_id, link)
         return {
-            "id": created.id,
+            "id": created["id"],
             "request_id": request_id,
-            "original_name": created.original_name,
-            "mime_type": created.mime_type,
-            "extension": created.extension,
-            "file_size": created.file_size,
-            "file_path": created.file_path,
-            "link_type": "invoice",
+            "original_name": created["original_name"],
+            "mime_type": created["mime_type"],
+            "extension": created["extension"],
+            "file_size": created["file_size"],
+            "file_path": created["file_path"],
         }
 
     def get_request_invoice_files(self, request_id: int):
@@ -284,20 +157,7 @@ class RequestFileService:
             for request_file, file_row, file_type in rows
         ]
 
-    @staticmethod
-    def _ensure_directory(path: str) -> None:
-        try:
-            os.makedirs(path, exist_ok=True)
-        except OSError as exc:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=(
-                    f"Cannot create directory '{path}'. "
-                    "Set SUPPLY_REQUEST_FILES_DIR to a writable path."
-                ),
-            ) from exc
-
-    def get_download_file_payload(self, request_id: int, file_id: str, user_id: str):
+    def get_download_file_payload(self, request_id: int, file_id: str):
         if not self.repo.request_exists(request_id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Request not found")
 
@@ -309,21 +169,17 @@ class RequestFileService:
         if not os.path.exists(file_row.file_path):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found on disk")
 
-        self.repo.add_audit(
-            FileAudit(
-                id=str(uuid.uuid4()),
-                file_id=file_row.id,
-                action="download",
-                user_id=user_id,
-            )
-        )
-
         return {
+            "file_id": file_row.id,
             "path": file_row.file_path,
             "filename": file_row.original_name,
             "media_type": file_row.mime_type,
+            "md5_hash": file_row.md5_hash,
         }
 
+    def record_file_download(self, file_id: str, user_id: str) -> None:
+        file_audit_sink.record(file_id, "download", user_id)
+
     def delete_request_file(self, request_id: int, file_id: str, user_id: str):
         if not self.repo.request_exists(request_id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Request not found")
@@ -334,16 +190,9 @@ class RequestFileService:
 
         _, file_row, _ = row
         self.repo.mark_file_deleted(file_row)
-        self.repo.add_audit(
-            FileAudit(
-                id=str(uuid.uuid4()),
-                file_id=file_row.id,
-                action="delete",
-                user_id=user_id,
-            )
-        )
+        file_audit_sink.record(file_row.id, "delete", user_id)
 
-        if os.path.exists(file_row.file_path):
-            os.remove(file_row.file_path)
+        # Only this file's name goes; content shared with other files stays until its last name.
+        blob_store.remove(file_row.file_path)
 
         return None
@@ -1,6 +1,6 @@
 from fastapi import HTTPException, status
 
-from app.models.supply_request import RequestItemCreate, RequestItemUpdate
+from app.models.supply_request import RequestItemBatch, RequestItemCreate, RequestItemUpdate
 from app.repositories.request_repository import RequestRepository
 
 
@@ -27,12 +27,7 @@ class RequestItemService:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Nomenclature not found",
                 )
-            if not payload.get("unit_id"):
-                payload["unit_id"] = nomenclature.unit_id
-            if not payload.get("warehouse_category_id"):
-                payload["warehouse_category_id"] = nomenclature.warehouse_category_id
-            if not payload.get("name"):
-                payload["name"] = nomenclature.name
+            self._apply_nomenclature_defaults(payload, nomenclature)
 
         created = self.repo.create_request_item(request_id, payload)
         return self._to_response(created)
@@ -73,6 +68,77 @@ class RequestItemService:
         self.repo.delete_request_item(item)
         return None
 
+    def apply_batch(self, request_id: int, data: RequestItemBatch):
+        if not self.repo.request_exists(request_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Request not found")
+
+        create_payloads = [item.model_dump(exclude_unset=True) for item in data.create]
+        update_payloads = [item.model_dump(exclude_unset=True, exclude={"id"}) for item in data.update]
+        update_ids = [item.id for item in data.update]
+
+        existing = self.repo.get_request_items_by_ids(request_id, update_ids + data.delete)
+        nomenclature_by_id = self.repo.get_nomenclature_by_ids(
+            [payload.get("nomenclature_id") for payload in create_payloads + update_payloads]
+        )
+
+        errors = []
+        seen_ids = set()
+        for operation, item_ids in (("update", update_ids), ("delete", data.delete)):
+            for index, item_id in enumerate(item_ids):
+                if item_id in seen_ids:
+                    errors.append(self._row_error(operation, index, "Request item is used twice in the batch", item_id))
+                elif item_id not in existing:
+                    errors.append(self._row_error(operation, index, "Request item not found", item_id))
+                seen_ids.add(item_id)
+        for operation, payloads in (("create", create_payloads), ("update", update_payloads)):
+            for index, payload in enumerate(payloads):
+                nomenclature_id = payload.get("nomenclature_id")
+                if nomenclature_id and nomenclature_id not in nomenclature_by_id:
+                    errors.append(self._row_error(operation, index, "Nomenclature not found"))
+        if errors:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=errors)
+
+        # Rows without num continue the request's numbering in the order they were sent.
+        next_num = None
+        for payload in create_payloads:
+            if payload.get("num") is None:
+                if next_num is None:
+                    next_num = self.repo.get_next_request_item_num(request_id)
+                payload["num"] = next_num
+                next_num += 1
+            if payload.get("quantity") is None:
+                payload["quantity"] = 1.0
+            self._apply_nomenclature_defaults(payload, nomenclature_by_id.get(payload.get("nomenclature_id")))
+
+        created_ids = self.repo.apply_request_item_batch(
+            request_id,
+            create_payloads,
+            [(existing[item_id], payload) for item_id, payload in zip(update_ids, update_payloads, strict=True)],
+            [existing[item_id] for item_id in data.delete],
+        )
+
+        items = self.repo.get_request_items_by_ids(request_id, created_ids + update_ids)
+        return {
+            "created": [self._to_response(items[item_id]) for item_id in created_ids],
+            "updated": [self._to_response(items[item_id]) for item_id in update_ids],
+            "deleted": data.delete,
+        }
+
+    @staticmethod
+    def _apply_nomenclature_defaults(payload: dict, nomenclature) -> None:
+        if not nomenclature:
+            return
+        if not payload.get("unit_id"):
+            payload["unit_id"] = nomenclature.unit_id
+        if not payload.get("warehouse_category_id"):
+            payload["warehouse_category_id"] = nomenclature.warehouse_category_id
+        if not payload.get("name"):
+            payload["name"] = nomenclature.name
+
+    @staticmethod
+    def _row_error(operation: str, index: int, detail: str, item_id: str | None = None) -> dict:
+        return {"operation": operation, "index": index, "id": item_id, "detail": detail}
+
     @staticmethod
     def _to_response(item):
         return {
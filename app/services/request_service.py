@@ -1,6 +1,11 @@
 from fastapi import HTTPException, status
 
-from app.models.supply_request import SupplyRequest, SupplyRequestCreate, SupplyRequestUpdate
+from app.models.supply_request import (
+    SupplyRequest,
+    SupplyRequestCreate,
+    SupplyRequestListQuery,
+    SupplyRequestUpdate,
+)
 from app.repositories.auth_user_repository import AuthUserRepository
 from app.repositories.reference_object_repository import ReferenceObjectRepository
 from app.repositories.request_repository import RequestRepository
@@ -20,12 +25,39 @@ class RequestService:
         self.auth_user_repo = auth_user_repo
         self.reference_repo = reference_repo
 
-    def get_all(self):
-        requests = self.repo.get_all()
+    def get_all(self, filters: SupplyRequestListQuery | None = None):
+        requests = self.repo.get_all(filters)
+        return self._enrich_list(requests, filters)
+
+    def get_page(self, filters: SupplyRequestListQuery):
+        requests, next_cursor = self.repo.get_page(filters)
+        return self._enrich_list(requests, filters), next_cursor
+
+    def _enrich_list(self, requests: list[dict], filters: SupplyRequestListQuery | None) -> list[dict]:
+        if filters is not None and filters.view == "summary":
+            return self._enrich_summary(requests)
+        return self._enrich(requests)
+
+    def _enrich_summary(self, requests: list[dict]) -> list[dict]:
+        _, _, object_level_ids = self.collect_lookup_ids(requests)
+        project_maps = load_project_reference_maps(self.reference_repo, object_level_ids)
+        return self.apply_project_names(requests, project_maps)
+
+    def _enrich(self, requests: list[dict]) -> list[dict]:
         if not requests:
             return []
 
+        user_ids, counterparty_ids, object_level_ids = self.collect_lookup_ids(requests)
+        users_by_id = self.load_users(user_ids)
+        counterparty_names, project_maps = self.load_reference_lookups(counterparty_ids, object_level_ids)
+        return self.apply_lookups(requests, users_by_id, counterparty_names, project_maps)
+
+    # The lookup phases below touch one database each, so the async routes can run them concurrently.
+
+    @staticmethod
+    def collect_lookup_ids(requests: list[dict]) -> tuple[list[str], list[str], list[str]]:
         user_ids = set()
+        counterparty_ids = set()
         for item in requests:
             if item.get("created_by"):
                 user_ids.add(item["created_by"])
@@ -34,27 +66,27 @@ class RequestService:
             for log in item.get("logs", []):
                 if log.get("user_id"):
                     user_ids.add(log["user_id"])
-
-        users = self.auth_user_repo.get_by_ids(list(user_ids))
-        users_by_id = {user.id: user for user in users}
-
-        counterparty_ids = set()
-        for item in requests:
             for invoice in item.get("documents", {}).get("invoices", []):
                 if invoice.get("provider_id"):
                     counterparty_ids.add(invoice["provider_id"])
                 if invoice.get("payer_id"):
                     counterparty_ids.add(invoice["payer_id"])
-        counterparty_names = self.reference_repo.get_counterparty_names(list(counterparty_ids))
 
         object_level_ids = [item["object_levels_id"] for item in requests if item.get("object_levels_id")]
-        (
-            levels_by_id,
-            objects_by_id,
-            contracts_by_id,
-            work_types_by_id,
-        ) = load_project_reference_maps(self.reference_repo, object_level_ids)
+        return list(user_ids), list(counterparty_ids), object_level_ids
 
+    def load_users(self, user_ids: list[str]) -> dict:
+        users = self.auth_user_repo.get_by_ids(user_ids)
+        return {user.id: user for user in users}
+
+    def load_reference_lookups(self, counterparty_ids: list[str], object_level_ids: list[str]):
+        counterparty_names = self.reference_repo.get_counterparty_names(counterparty_ids)
+        project_maps = load_project_reference_maps(self.reference_repo, object_level_ids)
+        return counterparty_names, project_maps
+
+    @staticmethod
+    def apply_project_names(requests: list[dict], project_maps) -> list[dict]:
+        levels_by_id, objects_by_id, contracts_by_id, work_types_by_id = project_maps
         for item in requests:
             item["project_name"] = build_project_name(
                 item.get("object_levels_id"),
@@ -63,11 +95,23 @@ class RequestService:
                 contracts_by_id,
                 work_types_by_id,
             )
-            item["created_by_user"] = self._map_user(users_by_id.get(item.get("created_by")))
-            item["executor_user"] = self._map_user(users_by_id.get(item.get("executor")))
+        return requests
+
+    @classmethod
+    def apply_lookups(
+        cls,
+        requests: list[dict],
+        users_by_id: dict,
+        counterparty_names: dict[str, str],
+        project_maps,
+    ) -> list[dict]:
+        cls.apply_project_names(requests, project_maps)
+        for item in requests:
+            item["created_by_user"] = cls._map_user(users_by_id.get(item.get("created_by")))
+            item["executor_user"] = cls._map_user(users_by_id.get(item.get("executor")))
 
             for log in item.get("logs", []):
-                log["user"] = self._map_user(users_by_id.get(log.get("user_id")))
+                log["user"] = cls._map_user(users_by_id.get(log.get("user_id")))
 
             for invoice in item.get("documents", {}).get("invoices", []):
                 invoice["provider_name"] = counterparty_names.get(invoice.get("provider_id"))
@@ -75,29 +119,25 @@ class RequestService:
 
         return requests
 
-    def get_available_for_user(self, user_id: str):
-        requests = self.get_all()
-        return [
-            item
-            for item in requests
-            if item.get("created_by") == user_id
-            or item.get("executor") == user_id
-            or any(log.get("user_id") == user_id for log in item.get("logs", []))
-        ]
+    def get_available_for_user(self, user_id: str, filters: SupplyRequestListQuery | None = None):
+        requests = self.repo.get_all(filters, visible_to=user_id)
+        return self._enrich_list(requests, filters)
+
+    def get_available_page(self, user_id: str, filters: SupplyRequestListQuery):
+        requests, next_cursor = self.repo.get_page(filters, visible_to=user_id)
+        return self._enrich_list(requests, filters), next_cursor
 
     def get_by_id(self, request_id: int):
-        requests = self.get_all()
-        for item in requests:
-            if item.get("id") == request_id:
-                return item
-        return None
+        item = self.repo.get_by_id(request_id)
+        if not item:
+            return None
+        return self._enrich([item])[0]
 
     def get_available_for_user_by_id(self, user_id: str, request_id: int):
-        requests = self.get_available_for_user(user_id)
-        for item in requests:
-            if item.get("id") == request_id:
-                return item
-        return None
+        item = self.repo.get_by_id(request_id, visible_to=user_id)
+        if not item:
+            return None
+        return self._enrich([item])[0]
 
     def create(self, data: SupplyRequestCreate, user_id: str):
         payload = data.model_dump(exclude_none=True)
@@ -26,9 +26,9 @@ class WarehouseReceiptService:
         self.counterparty_repo = counterparty_repo
         self.reference_repo = reference_repo
 
-    def get_receipts(self):
+    def get_receipts(self, view: str = "full"):
         receipts = self.repo.get_receipts()
-        return self._serialize_receipts(receipts)
+        return self._serialize_for_view(receipts, view)
 
     def get_receipt(self, receipt_id: str):
         receipt = self.repo.get_receipt_by_id(receipt_id)
@@ -37,7 +37,7 @@ class WarehouseReceiptService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Warehouse receipt not found",
             )
-        return self._serialize_receipts([receipt])[0]
+        return self._serialize_for_view([receipt], "full")[0]
 
     def create_receipt(self, payload: WarehouseReceiptCreate):
         data = payload.model_dump(exclude_unset=True, by_alias=False)
@@ -130,56 +130,110 @@ class WarehouseReceiptService:
         self.repo.delete_receipt_item(item)
         return None
 
-    def _serialize_receipts(self, receipts):
+    def _serialize_for_view(self, receipts, view: str):
+        rows = self.load_receipt_rows(receipts, view)
+        counterparties, object_names = self.load_receipt_reference(rows["from_ids"], rows["object_ids"])
+        return self.build_receipts(receipts, rows, counterparties, object_names)
+
+    # Supply rows and reference names are loaded in separate phases so the async routes
+    # can run each of them on its own session.
+
+    def load_receipt_rows(self, receipts, view: str) -> dict:
         receipt_ids = [receipt.id for receipt in receipts]
+        object_ids = [receipt.object_id for receipt in receipts if receipt.object_id]
+        rows = {
+            "view": view,
+            "status_names": self.repo.get_status_names(
+                [receipt.status_id for receipt in receipts if receipt.status_id]
+            ),
+            "warehouses": self.repo.get_warehouses(
+                [receipt.warehouse_id for receipt in receipts if receipt.warehouse_id]
+            ),
+            "from_ids": [receipt.from_id for receipt in receipts if receipt.from_id],
+            "object_ids": object_ids,
+        }
+        if view == "summary":
+            rows["totals"] = self.repo.get_receipt_item_totals(receipt_ids)
+            return rows
+
         items = self.repo.get_receipt_items_by_receipt_ids(receipt_ids)
         items_by_receipt_id = defaultdict(list)
         for item in items:
             items_by_receipt_id[item.warehouse_receipt_id].append(item)
-
-        status_ids = [receipt.status_id for receipt in receipts if receipt.status_id]
-        warehouse_ids = [receipt.warehouse_id for receipt in receipts if receipt.warehouse_id]
-        from_ids = [receipt.from_id for receipt in receipts if receipt.from_id]
-        object_ids = [receipt.object_id for receipt in receipts if receipt.object_id]
-
-        for item in items:
             if item.object_id:
                 object_ids.append(item.object_id)
 
-        status_names = self.repo.get_status_names(status_ids)
-        warehouses = self.repo.get_warehouses(warehouse_ids)
+        rows["items_by_receipt_id"] = items_by_receipt_id
+        rows["nomenclature"] = self.repo.get_nomenclature(
+            [item.nomenclature_id for item in items if item.nomenclature_id]
+        )
+        return rows
+
+    def load_receipt_reference(self, from_ids: list[str], object_ids: list[str]):
         counterparties = self.reference_repo.get_counterparty_names(from_ids)
         object_rows = self.reference_repo.get_objects_by_ids(object_ids)
         object_names = {row.id: (row.short_name or row.full_name) for row in object_rows}
+        return counterparties, object_names
+
+    def build_receipts(
+        self,
+        receipts,
+        rows: dict,
+        counterparties: dict[str, str],
+        object_names: dict[str, str],
+    ) -> list[dict]:
+        status_names = rows["status_names"]
+        warehouses = rows["warehouses"]
 
         result = []
         for receipt in receipts:
-            receipt_items = self._serialize_items(
-                items_by_receipt_id.get(receipt.id, []),
-                object_names,
-            )
-            result.append(
+            warehouse = warehouses.get(receipt.warehouse_id)
+            data = {
+                "id": receipt.id,
+                "num": receipt.num,
+                "from": receipt.from_id,
+                "from_name": counterparties.get(receipt.from_id),
+                "object_id": receipt.object_id,
+                "object_name": object_names.get(receipt.object_id),
+            }
+
+            if rows["view"] == "summary":
+                receipt_totals = rows["totals"].get(receipt.id, {})
+                data.update(
+                    {
+                        "created_at": receipt.created_at,
+                        "date_arrival": receipt.date_arrival,
+                        "date_completed": receipt.date_completed,
+                        "warehouse_id": receipt.warehouse_id,
+                        "warehouse_name": warehouse.name if warehouse else None,
+                        "status_id": receipt.status_id,
+                        "status_name": status_names.get(receipt.status_id),
+                        "items_count": receipt_totals.get("items_count", 0),
+                        "items_total": receipt_totals.get("items_total", 0.0),
+                    }
+                )
+                result.append(data)
+                continue
+
+            data.update(
                 {
-                    "id": receipt.id,
-                    "num": receipt.num,
-                    "from": receipt.from_id,
-                    "from_name": counterparties.get(receipt.from_id),
-                    "object_id": receipt.object_id,
-                    "object_name": object_names.get(receipt.object_id),
                     "file_id": receipt.file_id,
                     "created_at": receipt.created_at,
                     "date_arrival": receipt.date_arrival,
                     "date_completed": receipt.date_completed,
                     "warehouse_id": receipt.warehouse_id,
-                    "warehouse_name": warehouses.get(receipt.warehouse_id).name
-                    if warehouses.get(receipt.warehouse_id)
-                    else None,
+                    "warehouse_name": warehouse.name if warehouse else None,
                     "delivery_id": receipt.delivery_id,
                     "status_id": receipt.status_id,
                     "status_name": status_names.get(receipt.status_id),
-                    "items": receipt_items,
+                    "items": self._build_items(
+                        rows["items_by_receipt_id"].get(receipt.id, []),
+                        rows["nomenclature"],
+                        object_names,
+                    ),
                 }
             )
+            result.append(data)
 
         return result
 
@@ -194,6 +248,10 @@ class WarehouseReceiptService:
             )
             object_names = {row.id: (row.short_name or row.full_name) for row in object_rows}
 
+        return self._build_items(items, nomenclature, object_names)
+
+    @staticmethod
+    def _build_items(items, nomenclature: dict, object_names: dict[str, str]) -> list[dict]:
         result = []
         for item in items:
             nom = nomenclature.get(item.nomenclature_id)
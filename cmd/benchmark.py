@@ -0,0 +1,275 @@
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# app.database builds its MySQL URLs at import time; the local run never connects to them.
+for _name, _value in {"DB_HOST": "localhost", "DB_PORT": "3306", "DB_USER": "bench", "DB_PASSWORD": "", "DB_NAME": "auth"}.items():
+    os.environ.setdefault(_name, _value)
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+
+import app.database as database  # noqa: E402
+from cmd.synthetic_data import bind_session_factories, create_schema, generate  # noqa: E402
+
+# (name, path template, weight): roughly the share of each call in production traffic.
+MIX: list[tuple[str, str, int]] = [
+    ("requests my", "/requests/my?limit=50", 20),
+    ("requests", "/requests?limit=50", 10),
+    ("requests summary", "/requests?view=summary&limit=50", 5),
+    ("request detail", "/requests/{request_id}", 12),
+    ("request invoices", "/requests/{request_id}/invoices", 5),
+    ("request approvals", "/requests/my/approvals", 6),
+    ("invoices my", "/invoices/my?limit=50", 10),
+    ("invoices summary", "/invoices?view=summary&limit=50", 5),
+    ("invoice detail", "/invoices/{invoice_id}", 10),
+    ("item mappings", "/item-mappings", 3),
+    ("warehouse receipts summary", "/warehouse-receipts?view=summary", 4),
+    ("warehouse receipt detail", "/warehouse-receipts/{receipt_id}", 4),
+    ("nomenclature", "/nomenclature", 3),
+    ("request objects my", "/request-objects/my", 2),
+    ("units", "/units", 1),
+]
+
+# List endpoints used to discover ids on a live server.
+_ID_SOURCES = {
+    "request_id": "/requests?limit=200&view=summary",
+    "invoice_id": "/invoices?view=summary",
+    "receipt_id": "/warehouse-receipts?view=summary",
+}
+
+
+class EndpointStats:
+    def __init__(self) -> None:
+        self.latencies_ms: list[float] = []
+        self.errors = 0
+        self.rss_peak_kb = 0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ms: float, ok: bool, rss_kb: int | None) -> None:
+        with self._lock:
+            self.latencies_ms.append(elapsed_ms)
+            if not ok:
+                self.errors += 1
+            if rss_kb is not None:
+                self.rss_peak_kb = max(self.rss_peak_kb, rss_kb)
+
+    def summary(self, duration_seconds: float) -> dict:
+        latencies = sorted(self.latencies_ms)
+        return {
+            "requests": len(latencies),
+            "errors": self.errors,
+            "p50_ms": _percentile(latencies, 50),
+            "p95_ms": _percentile(latencies, 95),
+            "p99_ms": _percentile(latencies, 99),
+            "throughput_rps": round(len(latencies) / duration_seconds, 2) if duration_seconds else None,
+            "rss_peak_mb": round(self.rss_peak_kb / 1024, 1) if self.rss_peak_kb else None,
+        }
+
+
+def _percentile(sorted_values: list[float], percent: int) -> float | None:
+    if not sorted_values:
+        return None
+    # Nearest-rank percentile.
+    index = max(0, -(-percent * len(sorted_values) // 100) - 1)
+    return round(sorted_values[index], 2)
+
+
+def _rss_kb(pid: int | None, local: bool) -> int | None:
+    # Current resident size; the per-endpoint peak is the maximum seen right after its calls.
+    # A remote server without --server-pid cannot be measured from here.
+    if not local and pid is None:
+        return None
+    try:
+        with open(f"/proc/{'self' if local else pid}/status", encoding="ascii") as status_file:
+            for line in status_file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    if local:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return None
+
+
+def prepare_local(size: int, seed: int, directory: str):
+    from fastapi.testclient import TestClient
+
+    from app.api import app
+
+    engines = [
+        create_engine(f"sqlite:///{os.path.join(directory, name)}.db", connect_args={"check_same_thread": False})
+        for name in ("auth", "supply", "reference")
+    ]
+    create_schema(*engines)
+    bind_session_factories(*engines)
+
+    auth_db = database.AuthSessionLocal()
+    supply_db = database.SupplySessionLocal()
+    reference_db = database.ReferenceSessionLocal()
+    try:
+        dataset = generate(auth_db, supply_db, reference_db, size, seed)
+    finally:
+        for db in (auth_db, supply_db, reference_db):
+            db.close()
+
+    params = {
+        "request_id": dataset.request_ids,
+        "invoice_id": dataset.invoice_ids,
+        "receipt_id": dataset.receipt_ids,
+    }
+
+    def client_factory():
+        client = TestClient(app, base_url="http://benchmark")
+        client.cookies.set("session", dataset.token)
+        return client
+
+    return client_factory, params
+
+
+def prepare_remote(base_url: str, token: str):
+    def client_factory():
+        return httpx.Client(base_url=base_url, cookies={"session": token}, timeout=60)
+
+    params = {}
+    with client_factory() as client:
+        for param, path in _ID_SOURCES.items():
+            response = client.get("/api/supply" + path)
+            response.raise_for_status()
+            params[param] = [row["id"] for row in response.json() if row.get("id") is not None]
+    return client_factory, params
+
+
+def build_plan(total: int, params: dict[str, list], rnd: random.Random) -> list[tuple[str, str]]:
+    mix = [
+        (name, template, weight)
+        for name, template, weight in MIX
+        if all(params.get(param) for param in _template_params(template))
+    ]
+    names = [name for name, _, _ in mix]
+    weights = [weight for _, _, weight in mix]
+    templates = {name: template for name, template, _ in mix}
+
+    plan = []
+    for name in rnd.choices(names, weights=weights, k=total):
+        template = templates[name]
+        values = {param: rnd.choice(params[param]) for param in _template_params(template)}
+        plan.append((name, "/api/supply" + template.format(**values)))
+    return plan
+
+
+def _template_params(template: str) -> list[str]:
+    return [part.split("}", 1)[0] for part in template.split("{")[1:]]
+
+
+def replay(client_factory, plan, concurrency: int, server_pid: int | None, local: bool):
+    stats = {name: EndpointStats() for name, _, _ in MIX}
+    position = iter(plan)
+    position_lock = threading.Lock()
+
+    def worker() -> None:
+        client = client_factory()
+        try:
+            while True:
+                with position_lock:
+                    item = next(position, None)
+                if item is None:
+                    return
+                name, url = item
+                started = time.perf_counter()
+                try:
+                    ok = client.get(url).status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                stats[name].record(elapsed_ms, ok, _rss_kb(server_pid, local))
+        finally:
+            client.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return stats, time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Нагрузочный прогон смешанного профиля GET-запросов")
+    parser.add_argument("--size", type=int, default=500, help="Количество заявок в синтетических данных")
+    parser.add_argument("--requests", type=int, default=2000, help="Количество вызовов в прогоне")
+    parser.add_argument("--warmup", type=int, default=100, help="Вызовы до начала замеров")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--base-url", help="Прогон против запущенного сервера вместо локальной SQLite")
+    parser.add_argument("--token", help="Токен сессии для --base-url")
+    parser.add_argument("--server-pid", type=int, help="PID сервера для замера RSS при --base-url")
+    parser.add_argument("--json", dest="json_path", help="Сохранить результаты в JSON")
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        if args.base_url:
+            if not args.token:
+                parser.error("--token обязателен вместе с --base-url")
+            client_factory, params = prepare_remote(args.base_url, args.token)
+        else:
+            client_factory, params = prepare_local(args.size, args.seed, directory)
+
+        warmup_stats, _ = replay(
+            client_factory,
+            build_plan(args.warmup, params, rnd),
+            args.concurrency,
+            args.server_pid,
+            not args.base_url,
+        )
+        warmup_errors = sum(endpoint.errors for endpoint in warmup_stats.values())
+        stats, duration = replay(
+            client_factory,
+            build_plan(args.requests, params, rnd),
+            args.concurrency,
+            args.server_pid,
+            not args.base_url,
+        )
+
+    report = {
+        "size": None if args.base_url else args.size,
+        "concurrency": args.concurrency,
+        "duration_seconds": round(duration, 3),
+        "throughput_rps": round(args.requests / duration, 2),
+        "warmup_errors": warmup_errors,
+        "process_peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "endpoints": {
+            name: endpoint.summary(duration) for name, endpoint in stats.items() if endpoint.latencies_ms
+        },
+    }
+
+    print(f"{'endpoint':<28}{'calls':>7}{'err':>5}{'p50':>9}{'p95':>9}{'p99':>9}{'rps':>9}{'rss MB':>9}")
+    for name, row in report["endpoints"].items():
+        rss = "n/a" if row["rss_peak_mb"] is None else f"{row['rss_peak_mb']:.1f}"
+        print(
+            f"{name:<28}{row['requests']:>7}{row['errors']:>5}"
+            f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}"
+            f"{row['throughput_rps']:>9.1f}{rss:>9}"
+        )
+    print(
+        f"total: {args.requests} calls in {report['duration_seconds']} s, "
+        f"{report['throughput_rps']} rps, peak RSS {report['process_peak_rss_mb']} MB"
+    )
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as json_file:
+            json.dump(report, json_file, ensure_ascii=False, indent=2)
+
+    errors = warmup_errors + sum(row["errors"] for row in report["endpoints"].values())
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import BinaryIO
+
+# app.database builds its MySQL URLs at import time; the local run never connects to them.
+for _name, _value in {"DB_HOST": "localhost", "DB_PORT": "3306", "DB_USER": "bench", "DB_PASSWORD": "", "DB_NAME": "auth"}.items():
+    os.environ.setdefault(_name, _value)
+
+from sqlalchemy import create_engine, event  # noqa: E402
+
+import app.database as database  # noqa: E402
+from app.repositories.request_file_repository import RequestFileRepository  # noqa: E402
+from app.services.file_ingest import FileIngestService  # noqa: E402
+from app.services.file_storage import UPLOAD_CHUNK_SIZE, BlobStore, StoredFile  # noqa: E402
+from app.services.request_file_service import RequestFileService  # noqa: E402
+from cmd.synthetic_data import bind_session_factories, create_schema, generate  # noqa: E402
+
+BACKENDS = ("local", "memory")
+
+
+# Object-store stand-in that keeps blobs in process memory. It has the same hashing, size limit
+# and dedup behaviour as the local store without touching the disk, which makes it a baseline for
+# the ingest path. It lives here rather than in the app: downloads are served from disk.
+class InMemoryBlobStore(BlobStore):
+    backend = "memory"
+
+    def __init__(self, chunk_size: int = UPLOAD_CHUNK_SIZE) -> None:
+        super().__init__("memory://", chunk_size)
+        self._contents: dict[str, bytes] = {}
+        self._names: dict[str, str] = {}
+
+    def save(self, stream: BinaryIO, max_size_mb: int, storage_name: str) -> StoredFile:
+        buffer = io.BytesIO()
+        size, md5_hash, sha256_hash = self._copy(stream, buffer, max_size_mb)
+        path = f"{self.path_for(sha256_hash)}/{storage_name}"
+        with self._lock:
+            is_new = sha256_hash not in self._contents
+            if is_new:
+                self._contents[sha256_hash] = buffer.getvalue()
+            self._names[path] = sha256_hash
+        return self._stored(path, size, md5_hash, sha256_hash, is_new)
+
+    def remove(self, path: str) -> None:
+        with self._lock:
+            sha256_hash = self._names.pop(path, None)
+            if sha256_hash and sha256_hash not in self._names.values():
+                del self._contents[sha256_hash]
+
+    def path_for(self, sha256_hash: str) -> str:
+        return f"memory://{sha256_hash[:2]}/{sha256_hash[2:4]}/{sha256_hash}"
+
+
+def build_storage(backend: str, directory: str) -> BlobStore:
+    if backend == "memory":
+        return InMemoryBlobStore()
+    return BlobStore(os.path.join(directory, "blobs"))
+
+
+def build_payloads(count: int, size_kb: int, duplicate_share: float, rnd: random.Random) -> list[bytes]:
+    payloads: list[bytes] = []
+    for _ in range(count):
+        if payloads and rnd.random() < duplicate_share:
+            payloads.append(rnd.choice(payloads))
+        else:
+            payloads.append(rnd.randbytes(size_kb * 1024))
+    return payloads
+
+
+def run_backend(backend: str, payloads: list[bytes], seed: int, directory: str) -> dict:
+    engines = [
+        create_engine(f"sqlite:///{os.path.join(directory, name)}.db", connect_args={"check_same_thread": False})
+        for name in ("auth", "supply", "reference")
+    ]
+    create_schema(*engines)
+    bind_session_factories(*engines)
+
+    auth_db = database.AuthSessionLocal()
+    supply_db = database.SupplySessionLocal()
+    reference_db = database.ReferenceSessionLocal()
+    try:
+        dataset = generate(auth_db, supply_db, reference_db, 10, seed)
+    finally:
+        for db in (auth_db, reference_db):
+            db.close()
+
+    statements = 0
+
+    def count_statement(*_args) -> None:
+        nonlocal statements
+        statements += 1
+
+    event.listen(engines[1], "before_cursor_execute", count_statement)
+
+    storage = build_storage(backend, directory)
+    repo = RequestFileRepository(supply_db)
+    service = RequestFileService(repo, FileIngestService(repo, storage))
+    latencies_ms = []
+    started = time.perf_counter()
+    try:
+        for index, payload in enumerate(payloads):
+            call_started = time.perf_counter()
+            service.upload_request_attachment(
+                request_id=dataset.request_ids[index % len(dataset.request_ids)],
+                original_name=f"scan-{index}.pdf",
+                mime_type="application/pdf",
+                file_stream=io.BytesIO(payload),
+                user_id=dataset.user_id,
+            )
+            latencies_ms.append((time.perf_counter() - call_started) * 1000)
+    finally:
+        supply_db.close()
+        event.remove(engines[1], "before_cursor_execute", count_statement)
+    duration = time.perf_counter() - started
+
+    latencies_ms.sort()
+    total_bytes = sum(len(payload) for payload in payloads)
+    return {
+        "uploads": len(payloads),
+        "p50_ms": round(latencies_ms[len(latencies_ms) // 2], 2),
+        "p95_ms": round(latencies_ms[min(len(latencies_ms) - 1, len(latencies_ms) * 95 // 100)], 2),
+        "throughput_mb_s": round(total_bytes / 1024 / 1024 / duration, 1),
+        "statements_per_upload": round(statements / len(payloads), 2),
+        "storage": storage.stats(),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Замер пути загрузки файлов на разных хранилищах")
+    parser.add_argument("--files", type=int, default=200, help="Количество загрузок")
+    parser.add_argument("--size-kb", type=int, default=512, help="Размер одного файла")
+    parser.add_argument("--duplicates", type=float, default=0.3, help="Доля повторных загрузок того же файла")
+    parser.add_argument("--backend", choices=BACKENDS, action="append", help="По умолчанию все хранилища")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="Сохранить результаты в JSON")
+    args = parser.parse_args()
+
+    payloads = build_payloads(args.files, args.size_kb, args.duplicates, random.Random(args.seed))
+    report = {}
+    for backend in args.backend or BACKENDS:
+        with tempfile.TemporaryDirectory() as directory:
+            report[backend] = run_backend(backend, payloads, args.seed, directory)
+
+    print(f"{'backend':<10}{'uploads':>9}{'p50':>9}{'p95':>9}{'MB/s':>9}{'stmts':>8}{'dedup':>8}")
+    for backend, row in report.items():
+        print(
+            f"{backend:<10}{row['uploads']:>9}{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}"
+            f"{row['throughput_mb_s']:>9.1f}{row['statements_per_upload']:>8.2f}"
+            f"{row['storage']['deduplicated']:>8}"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as json_file:
+            json.dump(report, json_file, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
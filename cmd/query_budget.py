@@ -0,0 +1,192 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# app.database builds its MySQL URLs at import time; the engines are never used here.
+for _name, _value in {"DB_HOST": "localhost", "DB_PORT": "3306", "DB_USER": "budget", "DB_PASSWORD": "", "DB_NAME": "auth"}.items():
+    os.environ.setdefault(_name, _value)
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+import app.database as database  # noqa: E402
+from app.services.file_audit_sink import file_audit_sink  # noqa: E402
+from cmd.synthetic_data import SyntheticDataset, bind_session_factories, create_schema, generate  # noqa: E402
+
+DEFAULT_SIZES = (10, 40, 160)
+TIMING_RUNS = 5
+# Warm medians may grow with N at most linearly times this factor, plus the slack. Deliberately
+# generous: SQLite timings on a loaded CI box are noisy, a per-row query or a quadratic loop is not.
+TIME_GROWTH_FACTOR = 3.0
+TIME_SLACK_MS = 25.0
+
+# Statement budgets for a warm call (session and reference tables cached).
+# Every list endpoint must stay flat in N: a per-row query shows up as growth between sizes.
+ENDPOINTS: list[tuple[str, str, int]] = [
+    ("requests", "/requests", 12),
+    ("requests summary", "/requests?view=summary", 9),
+    ("requests page", "/requests?limit=20", 12),
+    ("requests my", "/requests/my", 12),
+    ("request detail", "/requests/{request_id}", 12),
+    ("request my detail", "/requests/my/{my_request_id}", 12),
+    ("request attachments", "/requests/{attachment_request_id}/attachments", 2),
+    ("request invoices", "/requests/{request_id}/invoices", 2),
+    ("request approvals", "/requests/my/approvals", 2),
+    ("invoices", "/invoices", 11),
+    ("invoices summary", "/invoices?view=summary", 9),
+    ("invoices my", "/invoices/my", 11),
+    ("invoice detail", "/invoices/{invoice_id}", 13),
+    ("item mappings", "/item-mappings", 2),
+    ("item mapping detail", "/item-mappings/{mapping_id}", 3),
+    ("warehouse receipts", "/warehouse-receipts", 6),
+    ("warehouse receipts summary", "/warehouse-receipts?view=summary", 5),
+    ("warehouse receipt detail", "/warehouse-receipts/{receipt_id}", 6),
+    ("warehouse receipt items", "/warehouse-receipts/{receipt_id}/items", 4),
+    ("warehouses", "/warehouses", 1),
+    ("projects", "/projects", 1),
+    ("project user roles", "/project-user-roles", 2),
+    ("project user roles by level", "/project-user-roles/{object_levels_id}", 2),
+    ("request objects", "/request-objects", 7),
+    ("request objects my", "/request-objects/my", 7),
+    ("units", "/units", 1),
+    ("warehouse categories", "/warehouse-categories", 1),
+    ("nomenclature", "/nomenclature", 1),
+    ("nomenclature detail", "/nomenclature/{nomenclature_id}", 1),
+    ("metrics", "/metrics", 0),
+]
+
+
+class StatementCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.count += 1
+
+
+def bind_sqlite(counter: StatementCounter) -> None:
+    engines = {}
+    for name in ("auth", "supply", "reference"):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        event.listen(engine, "before_cursor_execute", counter)
+        engines[name] = engine
+
+    create_schema(engines["auth"], engines["supply"], engines["reference"])
+    bind_session_factories(engines["auth"], engines["supply"], engines["reference"])
+
+
+def seed(size: int) -> SyntheticDataset:
+    auth_db = database.AuthSessionLocal()
+    supply_db = database.SupplySessionLocal()
+    reference_db = database.ReferenceSessionLocal()
+    try:
+        return generate(auth_db, supply_db, reference_db, size)
+    finally:
+        for db in (auth_db, supply_db, reference_db):
+            db.close()
+
+
+def path_params(dataset: SyntheticDataset) -> dict[str, object]:
+    my_request_ids = [request_id for request_id in dataset.request_ids if request_id % 4 == 0]
+    return {
+        "request_id": dataset.request_ids[len(dataset.request_ids) // 2],
+        "my_request_id": my_request_ids[0] if my_request_ids else dataset.request_ids[0],
+        "attachment_request_id": dataset.attachments[0][0] if dataset.attachments else dataset.request_ids[0],
+        "invoice_id": dataset.invoice_ids[len(dataset.invoice_ids) // 2],
+        "mapping_id": dataset.mapping_ids[0],
+        "receipt_id": dataset.receipt_ids[len(dataset.receipt_ids) // 2],
+        "object_levels_id": dataset.object_level_ids[0],
+        "nomenclature_id": dataset.nomenclature_ids[0],
+    }
+
+
+def measure(size: int, timing_runs: int = TIMING_RUNS) -> dict[str, dict]:
+    from app.api import app
+
+    counter = StatementCounter()
+    bind_sqlite(counter)
+    dataset = seed(size)
+    params = path_params(dataset)
+
+    client = TestClient(app)
+    client.cookies.set("session", dataset.token)
+
+    result = {}
+    for name, template, _ in ENDPOINTS:
+        url = "/api/supply" + template.format(**params)
+        # The first call fills the session and reference caches.
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"{name}: GET {url} returned {response.status_code}: {response.text[:300]}")
+
+        # Audit rows recorded so far are written now, not in the middle of the counted call.
+        file_audit_sink.flush()
+        counter.count = 0
+        client.get(url)
+        statements = counter.count
+
+        timings = []
+        for _ in range(timing_runs):
+            started = time.perf_counter()
+            client.get(url)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        result[name] = {"statements": statements, "ms": statistics.median(timings) if timings else None}
+    return result
+
+
+def allowed_ms(base_ms: float, smallest: int, largest: int) -> float:
+    return base_ms * (largest / smallest) * TIME_GROWTH_FACTOR + TIME_SLACK_MS
+
+
+def check(results: dict[int, dict[str, dict]]) -> list[str]:
+    sizes = sorted(results)
+    smallest, largest = sizes[0], sizes[-1]
+    failures = []
+    for name, template, budget in ENDPOINTS:
+        counts = {size: results[size][name]["statements"] for size in sizes}
+        if max(counts.values()) > budget:
+            failures.append(f"{name}: {max(counts.values())} statements, budget {budget} ({template})")
+        if len(set(counts.values())) > 1:
+            failures.append(f"{name}: statement count grows with N {counts} ({template})")
+
+        base_ms, largest_ms = results[smallest][name]["ms"], results[largest][name]["ms"]
+        if base_ms is None or largest_ms is None:
+            continue
+        limit_ms = allowed_ms(base_ms, smallest, largest)
+        if largest_ms > limit_ms:
+            failures.append(
+                f"{name}: {largest_ms:.1f} ms at N={largest}, allowed {limit_ms:.1f} ms "
+                f"({base_ms:.1f} ms at N={smallest}) ({template})"
+            )
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Проверка бюджета SQL-запросов для GET-эндпоинтов")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Количество заявок")
+    args = parser.parse_args()
+    if len(args.sizes) < 2:
+        parser.error("нужно минимум два размера")
+
+    results = {size: measure(size) for size in sorted(args.sizes)}
+
+    sizes = sorted(results)
+    print(f"{'endpoint':<32}" + "".join(f"{f'N={size}':>18}" for size in sizes))
+    for name, _, budget in ENDPOINTS:
+        cells = "".join(
+            f"{results[size][name]['statements']:>5} q {results[size][name]['ms']:>8.1f} ms" for size in sizes
+        )
+        print(f"{name:<32}{cells}   budget {budget}")
+
+    failures = check(results)
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,542 @@
+import argparse
+import hashlib
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+import app.database as database
+from app.database import AuthBase, ReferenceBase, SupplyBase
+from app.middleware.session_cache import clear_session_cache
+from app.models import (
+    AuthUser,
+    ContractRef,
+    FileDB,
+    FileType,
+    Invoice,
+    InvoiceItem,
+    InvoiceLog,
+    InvoicePayment,
+    ItemMapping,
+    NomenclatureRef,
+    ObjectLevel,
+    Project,
+    ProjectUserRole,
+    RefObject,
+    RequestFile,
+    RequestItem,
+    RequestLog,
+    SessionDB,
+    StatusRef,
+    SupplyRequest,
+    UnitRef,
+    Warehouse,
+    WarehouseCategoryRef,
+    WarehouseReceipt,
+    WarehouseReceiptItem,
+    WorkTypeRef,
+)
+from app.models.project_user_role import ProjectUserRoleType
+from app.models.reference_object import CounterpartyRef
+from app.repositories.counterparty_repository import schema_cache
+from app.repositories.reference_table_repository import reference_cache
+from app.services.file_ingest import file_type_cache
+
+SESSION_TOKEN = "synthetic-session-token"
+
+_STATUS_NAMES = ["Черновик", "На согласовании", "Согласовано", "Отклонено", "В работе", "Выполнено"]
+_UNIT_NAMES = ["шт", "м", "м2", "м3", "кг", "т", "компл"]
+_LOG_STATUSES = ["pending", "approved", "rejected"]
+
+
+@dataclass
+class SyntheticDataset:
+    size: int
+    token: str
+    user_id: str
+    request_ids: list[int] = field(default_factory=list)
+    invoice_ids: list[int] = field(default_factory=list)
+    receipt_ids: list[str] = field(default_factory=list)
+    mapping_ids: list[str] = field(default_factory=list)
+    nomenclature_ids: list[str] = field(default_factory=list)
+    object_level_ids: list[str] = field(default_factory=list)
+    attachments: list[tuple[int, str]] = field(default_factory=list)
+
+
+def create_schema(auth_engine: Engine, supply_engine: Engine, reference_engine: Engine) -> None:
+    AuthBase.metadata.create_all(auth_engine)
+    SupplyBase.metadata.create_all(supply_engine)
+    ReferenceBase.metadata.create_all(reference_engine)
+
+
+def bind_session_factories(auth_engine: Engine, supply_engine: Engine, reference_engine: Engine) -> None:
+    database.AuthSessionLocal.configure(bind=auth_engine)
+    database.SupplySessionLocal.configure(bind=supply_engine)
+    database.ReferenceSessionLocal.configure(bind=reference_engine)
+
+    # Cached rows from the previous binding must not leak into the new dataset.
+    reference_cache.invalidate()
+    schema_cache.invalidate()
+    file_type_cache.invalidate()
+    clear_session_cache()
+
+
+def generate(
+    auth_db: Session,
+    supply_db: Session,
+    reference_db: Session,
+    size: int,
+    seed: int = 0,
+) -> SyntheticDataset:
+    # size is the number of requests; everything else is scaled from it.
+    rnd = random.Random(seed)
+
+    def new_id() -> str:
+        return str(uuid.UUID(int=rnd.getrandbits(128), version=4))
+
+    started_at = datetime(2025, 1, 1)
+
+    user_ids = [new_id() for _ in range(max(5, size // 20))]
+    auth_db.add_all(
+        AuthUser(id=user_id, name=f"Имя {index}", surname=f"Фамилия {index}", patronymic=f"Отчество {index}")
+        for index, user_id in enumerate(user_ids)
+    )
+    current_user_id = user_ids[0]
+    auth_db.add(
+        SessionDB(
+            id=new_id(),
+            user_id=current_user_id,
+            token_hash=hashlib.sha256(SESSION_TOKEN.encode()).hexdigest(),
+            expires_at=datetime.utcnow() + timedelta(days=30),
+        )
+    )
+
+    status_ids = [new_id() for _ in _STATUS_NAMES]
+    supply_db.add_all(StatusRef(id=status_id, name=name) for status_id, name in zip(status_ids, _STATUS_NAMES, strict=True))
+    unit_ids = [new_id() for _ in _UNIT_NAMES]
+    supply_db.add_all(UnitRef(id=unit_id, name=name) for unit_id, name in zip(unit_ids, _UNIT_NAMES, strict=True))
+
+    root_category_ids = [new_id() for _ in range(3)]
+    category_ids = list(root_category_ids)
+    supply_db.add_all(
+        WarehouseCategoryRef(id=category_id, name=f"Категория {index}")
+        for index, category_id in enumerate(root_category_ids)
+    )
+    for index in range(6):
+        category_id = new_id()
+        category_ids.append(category_id)
+        supply_db.add(
+            WarehouseCategoryRef(
+                id=category_id,
+                name=f"Подкатегория {index}",
+                parent_id=rnd.choice(root_category_ids),
+            )
+        )
+
+    nomenclature_ids = [new_id() for _ in range(max(20, size // 2))]
+    supply_db.add_all(
+        NomenclatureRef(
+            id=nomenclature_id,
+            warehouse_category_id=rnd.choice(category_ids),
+            name=f"Номенклатура {index}",
+            article=f"ART-{index:05d}",
+            unit_id=rnd.choice(unit_ids),
+            weight=round(rnd.uniform(0.1, 50), 2),
+            created_at=started_at + timedelta(minutes=index),
+            created_by=rnd.choice(user_ids),
+        )
+        for index, nomenclature_id in enumerate(nomenclature_ids)
+    )
+
+    counterparty_ids = [new_id() for _ in range(max(5, size // 10))]
+    reference_db.add_all(
+        CounterpartyRef(id=counterparty_id, short_name=f"ООО Контрагент {index}", full_name=f"Контрагент {index}")
+        for index, counterparty_id in enumerate(counterparty_ids)
+    )
+
+    # object -> section -> worktype, requests and invoices hang off worktype levels.
+    work_type_ids = [new_id() for _ in range(4)]
+    reference_db.add_all(
+        WorkTypeRef(id=work_type_id, name=f"Вид работ {index}") for index, work_type_id in enumerate(work_type_ids)
+    )
+    object_ids = []
+    worktype_level_ids = []
+    for object_index in range(max(2, size // 25)):
+        object_id = new_id()
+        object_ids.append(object_id)
+        reference_db.add(RefObject(id=object_id, short_name=f"Объект {object_index}", full_name=f"Объект {object_index}"))
+        contract_id = new_id()
+        reference_db.add(ContractRef(id=contract_id, contract_id=contract_id, name=f"Договор {object_index}"))
+        supply_db.add(Project(id=new_id(), object_id=object_id, is_hide=False, is_active=True))
+
+        for section_index in range(2):
+            section_id = new_id()
+            reference_db.add(
+                ObjectLevel(
+                    id=section_id,
+                    object_id=object_id,
+                    name=f"Секция {section_index}",
+                    level_type="section",
+                    level_number=1,
+                    contract_id=contract_id,
+                    created_at=started_at,
+                )
+            )
+            for worktype_index in range(2):
+                level_id = new_id()
+                worktype_level_ids.append(level_id)
+                reference_db.add(
+                    ObjectLevel(
+                        id=level_id,
+                        object_id=object_id,
+                        name=f"Работы {worktype_index}",
+                        level_type="worktype",
+                        level_number=2,
+                        work_type=rnd.choice(work_type_ids),
+                        contract_id=contract_id,
+                        created_at=started_at,
+                        parent_id=section_id,
+                    )
+                )
+
+    for level_id in worktype_level_ids:
+        for role in (ProjectUserRoleType.REQUESTER, ProjectUserRoleType.REQUEST_APPROVER):
+            supply_db.add(ProjectUserRole(id=new_id(), object_levels_id=level_id, user_id=current_user_id, role=role))
+        supply_db.add(
+            ProjectUserRole(
+                id=new_id(),
+                object_levels_id=level_id,
+                user_id=rnd.choice(user_ids),
+                role=ProjectUserRoleType.SUPPLY_MANAGER,
+            )
+        )
+
+    warehouse_ids = [new_id() for _ in range(3)]
+    supply_db.add_all(
+        Warehouse(id=warehouse_id, name=f"Склад {index}", type="main", object_levels_id=rnd.choice(worktype_level_ids))
+        for index, warehouse_id in enumerate(warehouse_ids)
+    )
+
+    attachment_type_id = new_id()
+    supply_db.add(
+        FileType(
+            id=attachment_type_id,
+            code="request_attachment",
+            name="Вложение заявки",
+            allowed_extensions=["pdf", "xlsx", "jpg"],
+            max_size_mb=20,
+            is_active=True,
+        )
+    )
+    supply_db.flush()
+
+    dataset = SyntheticDataset(
+        size=size,
+        token=SESSION_TOKEN,
+        user_id=current_user_id,
+        nomenclature_ids=nomenclature_ids,
+        object_level_ids=worktype_level_ids,
+    )
+
+    invoice_id = 0
+    receipt_num = 0
+    for request_id in range(1, size + 1):
+        created_at = started_at + timedelta(hours=request_id * 7)
+        # A quarter of the requests belong to the session user so the /my endpoints have data.
+        created_by = current_user_id if request_id % 4 == 0 else rnd.choice(user_ids)
+        object_levels_id = rnd.choice(worktype_level_ids)
+        supply_db.add(
+            SupplyRequest(
+                id=request_id,
+                object_levels_id=object_levels_id,
+                name=f"Заявка {request_id}",
+                comment=rnd.choice([None, "Срочно", "По графику"]),
+                created_by=created_by,
+                executor=rnd.choice([None, *user_ids]),
+                created_at=created_at,
+                deadline=created_at + timedelta(days=rnd.randint(3, 30)),
+                status_id=rnd.choice(status_ids),
+            )
+        )
+        dataset.request_ids.append(request_id)
+
+        request_items = []
+        for num in range(1, rnd.randint(2, 8) + 1):
+            nomenclature_id = rnd.choice(nomenclature_ids) if rnd.random() < 0.7 else None
+            request_item = RequestItem(
+                id=new_id(),
+                request_id=request_id,
+                num=num,
+                nomenclature_id=nomenclature_id,
+                name=None if nomenclature_id else f"Позиция {num}",
+                unit_id=rnd.choice(unit_ids),
+                quantity=float(rnd.randint(1, 100)),
+                warehouse_category_id=rnd.choice(category_ids),
+            )
+            request_items.append(request_item)
+        supply_db.add_all(request_items)
+
+        for _ in range(rnd.randint(0, 3)):
+            supply_db.add(
+                RequestLog(
+                    id=new_id(),
+                    user_id=rnd.choice([current_user_id, *user_ids]),
+                    request_id=str(request_id),
+                    status_name=rnd.choice(_LOG_STATUSES),
+                    date_response=created_at + timedelta(days=1) if rnd.random() < 0.5 else None,
+                )
+            )
+
+        if rnd.random() < 0.2:
+            file_id = new_id()
+            supply_db.add(
+                FileDB(
+                    id=file_id,
+                    original_name=f"spec_{request_id}.pdf",
+                    storage_name=f"{file_id}.pdf",
+                    file_type_id=attachment_type_id,
+                    mime_type="application/pdf",
+                    extension="pdf",
+                    file_size=rnd.randint(10_000, 2_000_000),
+                    file_path=f"synthetic/{file_id}.pdf",
+                    uploaded_by=created_by,
+                    uploaded_at=created_at,
+                    status="active",
+                )
+            )
+            supply_db.flush()
+            supply_db.add(
+                RequestFile(
+                    id=new_id(),
+                    request_id=request_id,
+                    file_id=file_id,
+                    is_main=True,
+                    created_at=created_at,
+                    created_by=created_by,
+                )
+            )
+            dataset.attachments.append((request_id, file_id))
+
+        for _ in range(rnd.choice([0, 1, 1, 2])):
+            invoice_id += 1
+            dataset.invoice_ids.append(invoice_id)
+            _add_invoice(
+                supply_db,
+                rnd,
+                new_id,
+                dataset,
+                invoice_id=invoice_id,
+                request_id=request_id,
+                request_items=request_items,
+                object_levels_id=object_levels_id,
+                created_at=created_at + timedelta(days=1),
+                created_by=created_by,
+                status_id=rnd.choice(status_ids),
+                unit_ids=unit_ids,
+                counterparty_ids=counterparty_ids,
+                user_ids=[current_user_id, *user_ids],
+            )
+
+        receipt_num += 1
+        receipt_id = new_id()
+        dataset.receipt_ids.append(receipt_id)
+        supply_db.add(
+            WarehouseReceipt(
+                id=receipt_id,
+                num=receipt_num,
+                from_id=rnd.choice(counterparty_ids),
+                object_id=rnd.choice(object_ids),
+                created_at=created_at + timedelta(days=2),
+                date_arrival=(created_at + timedelta(days=3)).date(),
+                warehouse_id=rnd.choice(warehouse_ids),
+                status_id=rnd.choice(status_ids),
+            )
+        )
+        supply_db.add_all(
+            WarehouseReceiptItem(
+                id=new_id(),
+                warehouse_receipt_id=receipt_id,
+                nomenclature_id=rnd.choice(nomenclature_ids),
+                quantity=float(rnd.randint(1, 50)),
+                price=round(rnd.uniform(10, 5000), 2),
+                object_id=rnd.choice(object_ids),
+            )
+            for _ in range(rnd.randint(1, 5))
+        )
+
+    for db in (auth_db, supply_db, reference_db):
+        db.commit()
+    return dataset
+
+
+def _add_invoice(
+    supply_db: Session,
+    rnd: random.Random,
+    new_id,
+    dataset: SyntheticDataset,
+    *,
+    invoice_id: int,
+    request_id: int,
+    request_items: list[RequestItem],
+    object_levels_id: str,
+    created_at: datetime,
+    created_by: str,
+    status_id: str,
+    unit_ids: list[str],
+    counterparty_ids: list[str],
+    user_ids: list[str],
+) -> None:
+    supply_db.add(
+        Invoice(
+            id=invoice_id,
+            object_levels_id=object_levels_id,
+            num=f"СЧ-{invoice_id:05d}",
+            date=created_at.date(),
+            request_id=request_id,
+            provider_id=rnd.choice(counterparty_ids),
+            payer_id=rnd.choice(counterparty_ids),
+            prepayment_percent=rnd.choice([0, 30, 50, 100]),
+            due_days=rnd.choice([0, 5, 10]),
+            is_urgent=rnd.random() < 0.1,
+            vat_rate=20,
+            status=status_id,
+            created_at=created_at,
+            created_by=created_by,
+        )
+    )
+
+    invoice_items = []
+    total = 0.0
+    for index in range(rnd.randint(1, 6)):
+        quantity = float(rnd.randint(1, 100))
+        price = round(rnd.uniform(10, 5000), 2)
+        invoice_item = InvoiceItem(
+            id=new_id(),
+            invoice_id=invoice_id,
+            name=f"Товар {index}",
+            unit_name=rnd.choice(_UNIT_NAMES),
+            quantity=quantity,
+            price=price,
+            sum=round(quantity * price, 2),
+            nds=20,
+            unit_id=rnd.choice(unit_ids),
+        )
+        total += invoice_item.sum
+        invoice_items.append(invoice_item)
+    supply_db.add_all(invoice_items)
+    supply_db.flush()
+
+    invoice = supply_db.get(Invoice, invoice_id)
+    invoice.total_amount = round(total, 2)
+    invoice.vat_amount = round(total / 6, 2)
+
+    for _ in range(rnd.randint(0, 3)):
+        supply_db.add(
+            InvoiceLog(
+                id=new_id(),
+                user_id=rnd.choice(user_ids),
+                invoice_id=invoice_id,
+                type=rnd.choice(["approval", "budget", "payment"]),
+                status_name=rnd.choice(_LOG_STATUSES),
+            )
+        )
+
+    for _ in range(rnd.randint(0, 2)):
+        paid = rnd.random() < 0.5
+        supply_db.add(
+            InvoicePayment(
+                id=new_id(),
+                invoice_id=invoice_id,
+                value=round(total / 2, 2),
+                date_plan=created_at.date() + timedelta(days=rnd.randint(1, 20)),
+                created_by=rnd.choice(user_ids),
+                created_at=created_at,
+                paid=round(total / 2, 2) if paid else None,
+                paid_by=rnd.choice(user_ids) if paid else None,
+                paid_at=created_at + timedelta(days=5) if paid else None,
+            )
+        )
+
+    # Direct 1:1 matches for as many items as both sides have, plus one kit (a head and its components) on some invoices.
+    for group_number, (request_item, invoice_item) in enumerate(zip(request_items, invoice_items, strict=False), start=1):
+        mapping_id = new_id()
+        dataset.mapping_ids.append(mapping_id)
+        supply_db.add(
+            ItemMapping(
+                id=mapping_id,
+                request_id=request_id,
+                invoice_id=invoice_id,
+                unit_id=request_item.unit_id,
+                request_item_id=request_item.id,
+                invoice_item_id=invoice_item.id,
+                group_number=group_number,
+                match_type="direct",
+                mapped_quantity=request_item.quantity,
+                created_at=created_at,
+            )
+        )
+
+    if len(request_items) > 2 and rnd.random() < 0.3:
+        group_number = len(request_items) + 1
+        kit_item = invoice_items[-1]
+        for match_type, request_item, quantity in [
+            ("kit_head", request_items[0], 1.0),
+            ("kit_component", request_items[1], request_items[1].quantity),
+            ("kit_component", request_items[2], request_items[2].quantity),
+        ]:
+            mapping_id = new_id()
+            dataset.mapping_ids.append(mapping_id)
+            supply_db.add(
+                ItemMapping(
+                    id=mapping_id,
+                    request_id=request_id,
+                    invoice_id=invoice_id,
+                    unit_id=request_item.unit_id,
+                    request_item_id=request_item.id,
+                    invoice_item_id=kit_item.id,
+                    group_number=group_number,
+                    match_type=match_type,
+                    mapped_quantity=quantity,
+                    created_at=created_at,
+                )
+            )
+
+
+def main() -> None:
+    from app.database import (
+        AuthSessionLocal,
+        ReferenceSessionLocal,
+        SupplySessionLocal,
+        auth_engine,
+        reference_engine,
+        supply_engine,
+    )
+
+    parser = argparse.ArgumentParser(description="Заполняет базы синтетическими данными")
+    parser.add_argument("--size", type=int, default=1000, help="Количество заявок")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--create-schema", action="store_true", help="Создать недостающие таблицы")
+    args = parser.parse_args()
+
+    if args.create_schema:
+        create_schema(auth_engine, supply_engine, reference_engine)
+
+    auth_db, supply_db, reference_db = AuthSessionLocal(), SupplySessionLocal(), ReferenceSessionLocal()
+    try:
+        dataset = generate(auth_db, supply_db, reference_db, args.size, args.seed)
+    finally:
+        for db in (auth_db, supply_db, reference_db):
+            db.close()
+
+    print(
+        f"requests={len(dataset.request_ids)} invoices={len(dataset.invoice_ids)} "
+        f"receipts={len(dataset.receipt_ids)} mappings={len(dataset.mapping_ids)} "
+        f"session_token={dataset.token}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import os
+
+# app.database builds its MySQL URLs at import time; the tests bind every factory to SQLite.
+for _name, _value in {"DB_HOST": "localhost", "DB_PORT": "3306", "DB_USER": "test", "DB_PASSWORD": "", "DB_NAME": "auth"}.items():
+    os.environ.setdefault(_name, _value)
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.pool import QueuePool, StaticPool  # noqa: E402
+
+import app.database as database  # noqa: E402
+from app.services.file_audit_sink import file_audit_sink  # noqa: E402
+from cmd.synthetic_data import SyntheticDataset, bind_session_factories, create_schema, generate  # noqa: E402
+
+
+@pytest.fixture
+def engines():
+    engines = {
+        name: create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        for name in ("auth", "supply", "reference")
+    }
+    create_schema(engines["auth"], engines["supply"], engines["reference"])
+    bind_session_factories(engines["auth"], engines["supply"], engines["reference"])
+    yield engines
+    for engine in engines.values():
+        engine.dispose()
+
+
+@pytest.fixture
+def file_engines(tmp_path):
+    # File-backed SQLite behind a QueuePool: every session gets its own connection, which tests
+    # with background threads or pool accounting need. A module opts in by overriding engines.
+    engines = {
+        name: create_engine(f"sqlite:///{tmp_path / name}.db", poolclass=QueuePool, pool_size=5, max_overflow=0)
+        for name in ("auth", "supply", "reference")
+    }
+    create_schema(engines["auth"], engines["supply"], engines["reference"])
+    bind_session_factories(engines["auth"], engines["supply"], engines["reference"])
+    yield engines
+    for engine in engines.values():
+        engine.dispose()
+
+
+@pytest.fixture
+def dataset(engines) -> SyntheticDataset:
+    auth_db = database.AuthSessionLocal()
+    supply_db = database.SupplySessionLocal()
+    reference_db = database.ReferenceSessionLocal()
+    try:
+        return generate(auth_db, supply_db, reference_db, 12)
+    finally:
+        for db in (auth_db, supply_db, reference_db):
+            db.close()
+
+
+@pytest.fixture
+def client(dataset) -> TestClient:
+    from app.api import app
+
+    client = TestClient(app)
+    client.cookies.set("session", dataset.token)
+    yield client
+    # Audit rows recorded by this test go to its own database, not the next test's.
+    file_audit_sink.flush()
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    # Drives TTLCache expiry without sleeping.
+    clock = FakeClock()
+    monkeypatch.setattr("app.cache.time", clock)
+    return clock
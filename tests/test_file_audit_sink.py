@@ -0,0 +1,181 @@
+import json
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+
+import app.database as database
+from app.models.request_file import FileAudit
+from app.services.file_audit_sink import FileAuditSink
+
+
+def spilled_row(row_id: str | None = None) -> str:
+    row = {
+        "id": row_id or str(uuid.uuid4()),
+        "file_id": str(uuid.uuid4()),
+        "action": "download",
+        "user_id": str(uuid.uuid4()),
+        "created_at": datetime(2026, 1, 1).isoformat(),
+    }
+    return json.dumps(row) + "\n"
+
+
+def audit_ids() -> set[str]:
+    db = database.SupplySessionLocal()
+    try:
+        return {row_id for (row_id,) in db.query(FileAudit.id)}
+    finally:
+        db.close()
+
+
+def make_sink(tmp_path, session_factory=None, batch_size: int = 3, **options) -> FileAuditSink:
+    return FileAuditSink(
+        session_factory=session_factory or database.SupplySessionLocal,
+        batch_size=batch_size,
+        spill_path=str(tmp_path / "spill.jsonl"),
+        **options,
+    )
+
+
+@pytest.fixture
+def sinks():
+    sinks = []
+    yield sinks
+    for sink in sinks:
+        sink.shutdown()
+
+
+def record(sink: FileAuditSink, count: int) -> list[str]:
+    file_ids = [str(uuid.uuid4()) for _ in range(count)]
+    for file_id in file_ids:
+        sink.record(file_id, "download", "user-1")
+    return file_ids
+
+
+def audited_file_ids() -> set[str]:
+    db = database.SupplySessionLocal()
+    try:
+        return {file_id for (file_id,) in db.query(FileAudit.file_id)}
+    finally:
+        db.close()
+
+
+def wait_for(condition, timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_full_batch_is_written_without_waiting(engines, tmp_path, sinks):
+    sink = make_sink(tmp_path, batch_size=3, flush_interval_seconds=60)
+    sinks.append(sink)
+
+    file_ids = record(sink, 3)
+    wait_for(lambda: sink.stats()["written_total"] == 3)
+    assert sink.stats()["batches_total"] == 1
+    assert audited_file_ids() == set(file_ids)
+
+    # Two rows are less than a batch and wait for the interval (or a flush).
+    more_ids = record(sink, 2)
+    time.sleep(0.2)
+    assert sink.stats()["written_total"] == 3
+    assert sink.flush(timeout=5)
+    assert sink.stats()["batches_total"] == 2
+    assert audited_file_ids() == set(file_ids + more_ids)
+
+
+def test_partial_batch_is_written_after_the_interval(engines, tmp_path, sinks):
+    sink = make_sink(tmp_path, batch_size=100, flush_interval_seconds=0.2)
+    sinks.append(sink)
+
+    file_ids = record(sink, 2)
+
+    wait_for(lambda: sink.stats()["written_total"] == 2)
+    assert sink.stats()["batches_total"] == 1
+    assert audited_file_ids() == set(file_ids)
+
+
+def test_rows_that_do_not_fit_the_queue_are_spilled(engines, tmp_path, sinks):
+    writing = threading.Event()
+    release = threading.Event()
+
+    def blocked_session():
+        writing.set()
+        release.wait(5)
+        return database.SupplySessionLocal()
+
+    sink = make_sink(tmp_path, session_factory=blocked_session, batch_size=1, flush_interval_seconds=60, max_queue=2)
+    sinks.append(sink)
+    first_id = record(sink, 1)
+    # The writer holds the first row, two more fill the queue and the last one has no room.
+    assert writing.wait(5)
+    queued_ids = record(sink, 2)
+    spilled_id = record(sink, 1)
+
+    assert sink.stats()["spilled_total"] == 1
+    spilled = [json.loads(line) for line in (tmp_path / "spill.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [row["file_id"] for row in spilled] == spilled_id
+
+    release.set()
+    assert sink.flush(timeout=5)
+    assert audited_file_ids() == set(first_id + queued_ids)
+
+
+def test_shutdown_writes_every_queued_row(engines, tmp_path):
+    sink = make_sink(tmp_path, batch_size=100, flush_interval_seconds=60)
+
+    file_ids = record(sink, 5)
+    sink.shutdown()
+
+    assert audited_file_ids() == set(file_ids)
+    assert sink.stats()["written_total"] == 5
+    assert sink.stats()["queued"] == 0
+
+    # Rows recorded after shutdown are written directly.
+    late_id = record(sink, 1)
+    assert audited_file_ids() == set(file_ids + late_id)
+
+
+def test_replay_quarantines_bad_lines_and_rejected_rows(engines, tmp_path):
+    sink = make_sink(tmp_path)
+    duplicate_id = str(uuid.uuid4())
+    lines = [spilled_row() for _ in range(4)]
+    lines += [spilled_row(duplicate_id), spilled_row(duplicate_id), "{not json\n", '{"id": "x"}\n']
+    (tmp_path / "spill.jsonl").write_text("".join(lines), encoding="utf-8")
+
+    sink._replay_spill()
+
+    assert audit_ids() == {json.loads(line)["id"] for line in lines[:5]}
+    quarantined = (tmp_path / "spill.jsonl.rejected").read_text(encoding="utf-8").splitlines(keepends=True)
+    assert sorted(quarantined) == sorted([lines[5], lines[6], lines[7]])
+    assert not (tmp_path / "spill.jsonl.replay").exists()
+    assert sink.stats()["replayed_total"] == 5
+    assert sink.stats()["quarantined_total"] == 3
+    assert sink.stats()["spill_pending"] is False
+
+
+def test_replay_keeps_rows_while_database_is_down(engines, tmp_path):
+    def unavailable():
+        raise ConnectionError("database is down")
+
+    lines = [spilled_row() for _ in range(5)]
+    (tmp_path / "spill.jsonl").write_text("".join(lines), encoding="utf-8")
+
+    make_sink(tmp_path, session_factory=unavailable)._replay_spill()
+
+    assert (tmp_path / "spill.jsonl.replay").read_text(encoding="utf-8") == "".join(lines)
+    assert not (tmp_path / "spill.jsonl.rejected").exists()
+
+    # Rows spilled in the meantime wait for the next round instead of mixing in.
+    later = spilled_row()
+    (tmp_path / "spill.jsonl").write_text(later, encoding="utf-8")
+    sink = make_sink(tmp_path)
+    sink._replay_spill()
+    assert audit_ids() == {json.loads(line)["id"] for line in lines}
+
+    sink._replay_spill()
+    assert audit_ids() == {json.loads(line)["id"] for line in [*lines, later]}
+    assert sink.stats()["spill_pending"] is False
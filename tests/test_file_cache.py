@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+from app.file_cache import FileCache
+
+
+def key(name: str) -> str:
+    return name * 8
+
+
+def cache_files(directory) -> list[str]:
+    return sorted(file_name for _, _, file_names in os.walk(directory) for file_name in file_names)
+
+
+def test_hits_misses_and_hit_ratio(tmp_path):
+    cache = FileCache(str(tmp_path), max_bytes=1024)
+    assert cache.stats()["hit_ratio"] is None
+
+    assert cache.get(key("a")) is None
+    cache.set(key("a"), "значение")
+    assert cache.get(key("a")) == "значение"
+    assert cache.get(key("a")) == "значение"
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (2, 1, 0.6667)
+    assert (stats["entries"], stats["bytes"]) == (1, len("значение".encode()))
+
+
+def test_entries_survive_a_new_instance(tmp_path):
+    FileCache(str(tmp_path), max_bytes=1024).set(key("a"), "value")
+
+    assert FileCache(str(tmp_path), max_bytes=1024).get(key("a")) == "value"
+
+
+def test_least_recently_used_entries_are_evicted_by_size(tmp_path):
+    cache = FileCache(str(tmp_path), max_bytes=25)
+    cache.set(key("a"), "a" * 10)
+    cache.set(key("b"), "b" * 10)
+    # Reading "a" makes "b" the oldest entry.
+    assert cache.get(key("a")) is not None
+
+    cache.set(key("c"), "c" * 10)
+
+    assert cache.get(key("b")) is None
+    assert cache.get(key("a")) == "a" * 10
+    assert cache.get(key("c")) == "c" * 10
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"], stats["evictions"]) == (2, 20, 1)
+
+
+def test_overwrite_replaces_the_entry_size(tmp_path):
+    cache = FileCache(str(tmp_path), max_bytes=25)
+    cache.set(key("a"), "a" * 10)
+    cache.set(key("a"), "a" * 20)
+
+    assert cache.stats()["bytes"] == 20
+    assert cache.stats()["evictions"] == 0
+
+
+def test_failed_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    cache = FileCache(str(tmp_path), max_bytes=1024)
+
+    def disk_full(*_args):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(os, "replace", disk_full)
+    cache.set(key("a"), "value")
+
+    assert cache_files(tmp_path) == []
+    assert cache.stats()["errors"] == 1
+    assert cache.get(key("a")) is None
+
+
+def test_unexpected_error_leaves_no_temp_file(tmp_path, monkeypatch):
+    cache = FileCache(str(tmp_path), max_bytes=1024)
+
+    def broken_replace(*_args):
+        raise RuntimeError("interrupted")
+
+    monkeypatch.setattr(os, "replace", broken_replace)
+    with pytest.raises(RuntimeError):
+        cache.set(key("a"), "value")
+
+    assert cache_files(tmp_path) == []
@@ -0,0 +1,111 @@
+import hashlib
+import os
+from email.utils import formatdate
+
+import pytest
+
+from app.services.file_storage import BlobStore
+from app.services.request_file_service import RequestFileService
+
+CONTENT = bytes(range(256)) * 4
+ETAG = f'"{hashlib.md5(CONTENT).hexdigest()}"'
+
+
+@pytest.fixture
+def download(client, dataset, tmp_path, monkeypatch):
+    store = BlobStore(str(tmp_path / "blobs"))
+    monkeypatch.setattr("app.services.file_ingest.blob_store", store)
+    transfers = []
+    monkeypatch.setattr(
+        RequestFileService,
+        "record_file_download",
+        lambda self, file_id, user_id: transfers.append(file_id),
+    )
+
+    url = f"/api/supply/requests/{dataset.request_ids[0]}/attachments"
+    uploaded = client.post(url, files={"file": ("scan.pdf", CONTENT, "application/pdf")}).json()
+
+    def get(**headers):
+        return client.get(f"{url}/{uploaded['id']}/download", headers=headers)
+
+    return get, uploaded, transfers
+
+
+def test_full_download_carries_validators(download):
+    get, uploaded, transfers = download
+
+    response = get()
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["etag"] == ETAG
+    assert response.headers["cache-control"] == "private, max-age=31536000, immutable"
+    mtime = os.stat(uploaded["file_path"]).st_mtime
+    assert response.headers["last-modified"] == formatdate(mtime, usegmt=True)
+    assert transfers == [uploaded["id"]]
+
+
+@pytest.mark.parametrize("if_none_match", [ETAG, f"W/{ETAG}", "*", f'"other", {ETAG}'])
+def test_matching_if_none_match_is_not_modified(download, if_none_match):
+    get, _uploaded, transfers = download
+
+    response = get(**{"If-None-Match": if_none_match})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == ETAG
+    assert transfers == []
+
+
+def test_other_etag_gets_the_file(download):
+    get, uploaded, transfers = download
+
+    response = get(**{"If-None-Match": '"other"'})
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert transfers == [uploaded["id"]]
+
+
+def test_if_modified_since(download):
+    get, uploaded, transfers = download
+    mtime = os.stat(uploaded["file_path"]).st_mtime
+
+    assert get(**{"If-Modified-Since": formatdate(mtime, usegmt=True)}).status_code == 304
+    assert get(**{"If-Modified-Since": formatdate(mtime + 60, usegmt=True)}).status_code == 304
+    assert transfers == []
+
+    assert get(**{"If-Modified-Since": formatdate(mtime - 60, usegmt=True)}).status_code == 200
+    assert get(**{"If-Modified-Since": "not a date"}).status_code == 200
+    assert len(transfers) == 2
+
+
+def test_if_none_match_wins_over_if_modified_since(download):
+    get, uploaded, _transfers = download
+    fresh = formatdate(os.stat(uploaded["file_path"]).st_mtime, usegmt=True)
+
+    response = get(**{"If-None-Match": '"other"', "If-Modified-Since": fresh})
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+def test_range_request_returns_partial_content_without_audit(download):
+    get, _uploaded, transfers = download
+
+    response = get(Range="bytes=100-199")
+
+    assert response.status_code == 206
+    assert response.content == CONTENT[100:200]
+    assert response.headers["content-range"] == f"bytes 100-199/{len(CONTENT)}"
+    assert transfers == []
+
+
+def test_range_from_the_start_counts_as_a_download(download):
+    get, uploaded, transfers = download
+
+    response = get(Range="bytes=0-99")
+
+    assert response.status_code == 206
+    assert response.content == CONTENT[:100]
+    assert transfers == [uploaded["id"]]
@@ -0,0 +1,149 @@
+import hashlib
+import io
+import os
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+import app.database as database
+from app.models.request_file import FileDB
+from app.services.file_storage import BlobStore
+
+
+@pytest.fixture
+def store(tmp_path) -> BlobStore:
+    return BlobStore(str(tmp_path / "blobs"))
+
+
+def test_identical_content_shares_one_inode(store):
+    first = store.save(io.BytesIO(b"invoice"), 1, "first.pdf")
+    second = store.save(io.BytesIO(b"invoice"), 1, "second.pdf")
+
+    assert (first.is_new, second.is_new) == (True, False)
+    assert first.path != second.path
+    assert os.path.basename(second.path) == "second.pdf"
+    assert os.path.samefile(first.path, second.path)
+    assert store.stats()["bytes_saved"] == len(b"invoice")
+
+
+def test_content_goes_with_its_last_name(store):
+    first = store.save(io.BytesIO(b"invoice"), 1, "first.pdf")
+    second = store.save(io.BytesIO(b"invoice"), 1, "second.pdf")
+
+    store.remove(first.path)
+    assert not os.path.exists(first.path)
+    with open(second.path, "rb") as stored_file:
+        assert stored_file.read() == b"invoice"
+
+    store.remove(second.path)
+    assert not os.path.exists(os.path.dirname(second.path))
+
+
+class ChunkRecorder(io.BytesIO):
+    def __init__(self, content: bytes) -> None:
+        super().__init__(content)
+        self.reads = []
+
+    def read(self, size: int = -1) -> bytes:
+        self.reads.append(size)
+        return super().read(size)
+
+
+def leftovers(directory) -> list[str]:
+    return [name for _, _, names in os.walk(directory) for name in names if name.endswith(".part")]
+
+
+def test_multi_chunk_copy_hashes_the_whole_content(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"), chunk_size=1000)
+    content = os.urandom(10_500)
+    stream = ChunkRecorder(content)
+
+    stored = store.save(stream, 1, "scan.pdf")
+
+    # Read chunk by chunk, never as a whole.
+    assert set(stream.reads) == {1000}
+    assert len(stream.reads) == 12
+    assert stored.size == len(content)
+    assert stored.md5_hash == hashlib.md5(content).hexdigest()
+    assert stored.sha256_hash == hashlib.sha256(content).hexdigest()
+    with open(stored.path, "rb") as stored_file:
+        assert stored_file.read() == content
+    assert leftovers(tmp_path) == []
+
+
+def test_oversized_upload_is_rejected_without_leftovers(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"), chunk_size=64 * 1024)
+    stream = ChunkRecorder(b"x" * (1024 * 1024 + 1))
+
+    with pytest.raises(HTTPException) as error:
+        store.save(stream, 1, "big.pdf")
+
+    assert error.value.status_code == 400
+    assert leftovers(tmp_path) == []
+    assert os.listdir(tmp_path / "blobs") == []
+    # Stopped at the chunk that crossed the limit.
+    assert len(stream.reads) == 17
+
+
+def test_oversized_attachment_returns_400_and_stores_nothing(client, dataset, store, monkeypatch):
+    monkeypatch.setattr("app.services.file_ingest.blob_store", store)
+    request_id = dataset.request_ids[0]
+    url = f"/api/supply/requests/{request_id}/attachments"
+    files_before = client.get(url).json()
+
+    # The request_attachment type in the synthetic data allows 20 MB.
+    response = client.post(url, files={"file": ("big.pdf", b"x" * (20 * 1024 * 1024 + 1), "application/pdf")})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "File size exceeds 20 MB"
+    assert leftovers(store.directory) == []
+    assert client.get(url).json() == files_before
+
+
+def test_concurrent_saves_and_removes_keep_live_names(store):
+    kept = []
+    kept_lock = threading.Lock()
+
+    def worker(number: int) -> None:
+        for attempt in range(40):
+            stored = store.save(io.BytesIO(b"same content"), 1, f"{number}-{attempt}.pdf")
+            if attempt % 2:
+                store.remove(stored.path)
+            else:
+                with kept_lock:
+                    kept.append(stored.path)
+
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for path in kept:
+        with open(path, "rb") as stored_file:
+            assert stored_file.read() == b"same content"
+    assert os.stat(kept[0]).st_nlink == len(kept)
+
+
+def test_uploaded_attachment_is_downloadable_after_duplicate_is_deleted(client, dataset, store, monkeypatch):
+    monkeypatch.setattr("app.services.file_ingest.blob_store", store)
+    monkeypatch.setattr("app.services.request_file_service.blob_store", store)
+    request_id = dataset.request_ids[0]
+    url = f"/api/supply/requests/{request_id}/attachments"
+
+    first = client.post(url, files={"file": ("scan.pdf", b"%PDF-1.4 scan", "application/pdf")}).json()
+    second = client.post(url, files={"file": ("copy.pdf", b"%PDF-1.4 scan", "application/pdf")}).json()
+
+    db = database.SupplySessionLocal()
+    try:
+        rows = [db.get(FileDB, first["id"]), db.get(FileDB, second["id"])]
+    finally:
+        db.close()
+    assert all(os.path.basename(row.file_path) == row.storage_name for row in rows)
+    assert os.path.samefile(rows[0].file_path, rows[1].file_path)
+
+    assert client.delete(f"{url}/{first['id']}").status_code == 204
+    response = client.get(f"{url}/{second['id']}/download")
+    assert response.status_code == 200
+    assert response.content == b"%PDF-1.4 scan"
@@ -0,0 +1,192 @@
+import time
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+import app.database as database
+from app.file_cache import FileCache
+from app.services import invoice_parse_jobs
+from app.services.invoice_extraction import StubExtractionClient
+from app.services.invoice_parse_jobs import FINISHED_STATUSES, InvoiceParseQueue
+
+PARSED_INVOICE = {
+    "invoice_num": "СЧ-42",
+    "invoice_date": "2026-03-15",
+    "vat_rate": 20,
+    "vat_amount": 100,
+    "total_amount": 600,
+    "items": [
+        {"name": "Кабель ВВГ 3x2.5", "unit_name": "м", "quantity": 100, "price": 4, "sum": 400},
+        {"name": "Автомат 16А", "unit_name": "шт", "quantity": 2, "price": 50, "sum": 100},
+    ],
+}
+
+
+class UpstreamError(Exception):
+    # Shaped like the Mistral SDK errors: the upstream answer is on status_code.
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"upstream returned {status_code}")
+        self.status_code = status_code
+
+
+def status_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://api.mistral.ai/v1/ocr")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status_code, request=request))
+
+
+@pytest.mark.parametrize(
+    ("exc", "retryable"),
+    [
+        (HTTPException(status_code=400, detail="bad file"), False),
+        (UpstreamError(401), False),
+        (UpstreamError(422), False),
+        (UpstreamError(429), True),
+        (UpstreamError(503), True),
+        (status_error(403), False),
+        (status_error(502), True),
+        (httpx.ConnectTimeout("timed out"), True),
+        (ConnectionResetError(), True),
+        (ValueError("unexpected payload"), False),
+    ],
+)
+def test_only_transient_errors_are_retried(exc, retryable):
+    assert InvoiceParseQueue._is_retryable(exc) is retryable
+
+
+def test_lifespan_shuts_the_queue_down(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.api import app
+    from app.services import invoice_parse_jobs
+    from app.services.file_audit_sink import file_audit_sink
+
+    calls = []
+    monkeypatch.setattr(invoice_parse_jobs.invoice_parse_queue, "shutdown", lambda: calls.append("shutdown"))
+    monkeypatch.setattr(file_audit_sink, "shutdown", lambda: None)
+    with TestClient(app):
+        assert calls == []
+    assert calls == ["shutdown"]
+
+
+@pytest.fixture
+def engines(file_engines):
+    # The parse worker commits from its own thread, next to the request and audit sink sessions.
+    return file_engines
+
+
+class FlakyExtractionClient(StubExtractionClient):
+    # Raises the queued errors from ocr() one per call, then answers like the stub.
+    def __init__(self, errors: list[Exception]) -> None:
+        super().__init__(PARSED_INVOICE)
+        self.errors = errors
+        self.ocr_calls = 0
+
+    def ocr(self, file_name: str, content: bytes) -> str:
+        self.ocr_calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return super().ocr(file_name, content)
+
+
+class FakeTime:
+    def __init__(self) -> None:
+        self.sleeps = []
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+
+
+@pytest.fixture
+def parse_jobs(client, dataset, tmp_path, monkeypatch):
+    # A fresh parse cache per test, so the stub client is really called.
+    parse_cache = FileCache(str(tmp_path / "cache"), 1024 * 1024)
+    monkeypatch.setattr("app.services.invoice_service.invoice_parse_cache", parse_cache)
+    fake_time = FakeTime()
+    monkeypatch.setattr(invoice_parse_jobs, "time", fake_time)
+    file_path = tmp_path / "invoice.pdf"
+    file_path.write_bytes(b"%PDF-1.4 invoice")
+    queues = []
+
+    def start(client_factory) -> InvoiceParseQueue:
+        queue = InvoiceParseQueue(
+            client_factory=client_factory,
+            session_factory=database.SupplySessionLocal,
+            max_workers=1,
+            max_attempts=3,
+            backoff_seconds=0.5,
+        )
+        monkeypatch.setattr("app.routes.invoices_routes.invoice_parse_queue", queue)
+        queues.append(queue)
+        return queue
+
+    yield start, str(file_path), fake_time
+    for queue in queues:
+        queue.shutdown()
+
+
+def submit_and_wait(client, invoice_id: int, file_path: str) -> dict:
+    response = client.post(f"/api/supply/invoices/{invoice_id}/parse-jobs", json={"file_path": file_path})
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued"
+
+    deadline = time.monotonic() + 10
+    while job["status"] not in FINISHED_STATUSES:
+        assert time.monotonic() < deadline, job
+        time.sleep(0.01)
+        response = client.get(f"/api/supply/invoices/{invoice_id}/parse-jobs/{job['job_id']}")
+        assert response.status_code == 200
+        job = response.json()
+    return job
+
+
+def test_job_applies_the_parsed_invoice(client, dataset, parse_jobs):
+    start, file_path, fake_time = parse_jobs
+    start(lambda: StubExtractionClient(PARSED_INVOICE))
+    invoice_id = dataset.invoice_ids[0]
+
+    job = submit_and_wait(client, invoice_id, file_path)
+
+    assert job["status"] == "succeeded"
+    assert job["attempts"] == 1
+    assert job["result"]["items_count"] == 2
+    assert fake_time.sleeps == []
+    invoice = client.get(f"/api/supply/invoices/{invoice_id}").json()
+    assert invoice["num"] == "СЧ-42"
+    assert invoice["date"] == "2026-03-15"
+    assert sorted(item["name"] for item in invoice["items"]) == ["Автомат 16А", "Кабель ВВГ 3x2.5"]
+
+
+def test_transient_failure_is_retried_with_backoff(client, dataset, parse_jobs):
+    start, file_path, fake_time = parse_jobs
+    extraction_client = FlakyExtractionClient([UpstreamError(503), ConnectionResetError()])
+    queue = start(lambda: extraction_client)
+
+    job = submit_and_wait(client, dataset.invoice_ids[0], file_path)
+
+    assert job["status"] == "succeeded"
+    assert job["attempts"] == 3
+    assert extraction_client.ocr_calls == 3
+    # Exponential backoff between the attempts.
+    assert fake_time.sleeps == [0.5, 1.0]
+    assert queue.stats()["retries_total"] == 2
+
+
+def test_permanent_failure_is_not_retried(client, dataset, parse_jobs):
+    start, file_path, fake_time = parse_jobs
+    extraction_client = FlakyExtractionClient([UpstreamError(401)])
+    queue = start(lambda: extraction_client)
+    invoice_id = dataset.invoice_ids[0]
+    before = client.get(f"/api/supply/invoices/{invoice_id}").json()
+
+    job = submit_and_wait(client, invoice_id, file_path)
+
+    assert job["status"] == "failed"
+    assert job["attempts"] == 1
+    assert job["error"] == "UpstreamError: upstream returned 401"
+    assert extraction_client.ocr_calls == 1
+    assert fake_time.sleeps == []
+    assert queue.stats()["failed_total"] == 1
+    after = client.get(f"/api/supply/invoices/{invoice_id}").json()
+    assert (after["num"], len(after["items"])) == (before["num"], len(before["items"]))
@@ -0,0 +1,94 @@
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import app.database as database
+from app.models.invoice import Invoice
+from app.models.supply_request import StatusRef
+from app.repositories.reference_table_repository import ReferenceTableRepository
+from app.services.file_audit_sink import file_audit_sink
+from cmd.synthetic_data import generate
+
+STATUS_QUERY = re.compile(r"\bFROM status\b")
+
+
+class StatusQueryCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if STATUS_QUERY.search(statement):
+            self.count += 1
+
+
+@pytest.fixture
+def seeded(engines, request):
+    auth_db = database.AuthSessionLocal()
+    supply_db = database.SupplySessionLocal()
+    reference_db = database.ReferenceSessionLocal()
+    try:
+        dataset = generate(auth_db, supply_db, reference_db, request.param)
+        status_by_invoice_id = {
+            invoice_id: name
+            for invoice_id, name in supply_db.query(Invoice.id, StatusRef.name).join(
+                StatusRef, StatusRef.id == Invoice.status
+            )
+        }
+    finally:
+        for db in (auth_db, supply_db, reference_db):
+            db.close()
+
+    from app.api import app
+
+    client = TestClient(app)
+    client.cookies.set("session", dataset.token)
+    counter = StatusQueryCounter()
+    event.listen(engines["supply"], "before_cursor_execute", counter)
+    yield client, dataset, status_by_invoice_id, counter
+    event.remove(engines["supply"], "before_cursor_execute", counter)
+    file_audit_sink.flush()
+
+
+@pytest.mark.parametrize("seeded", [5, 20], indirect=True)
+@pytest.mark.parametrize("path", ["/api/supply/invoices", "/api/supply/invoices?view=summary"])
+def test_invoice_list_loads_statuses_once(seeded, path, monkeypatch):
+    client, _dataset, status_by_invoice_id, counter = seeded
+    lookups = []
+    get_statuses = ReferenceTableRepository.get_statuses
+
+    def counted_get_statuses(self):
+        lookups.append(1)
+        return get_statuses(self)
+
+    monkeypatch.setattr(ReferenceTableRepository, "get_statuses", counted_get_statuses)
+
+    response = client.get(path)
+    assert response.status_code == 200
+    invoices = response.json()
+    assert len(invoices) > 1
+    for invoice in invoices:
+        assert invoice["status_name"] == status_by_invoice_id[invoice["id"]]
+    assert counter.count == 1
+    # One lookup for the whole page, not one per invoice.
+    assert len(lookups) == 1
+
+    # The second list is served from the reference cache.
+    client.get(path)
+    assert counter.count == 1
+
+
+@pytest.mark.parametrize("seeded", [5], indirect=True)
+def test_invoice_detail_uses_cached_statuses(seeded):
+    client, dataset, status_by_invoice_id, counter = seeded
+
+    for invoice_id in dataset.invoice_ids[:3]:
+        response = client.get(f"/api/supply/invoices/{invoice_id}")
+        assert response.status_code == 200
+        assert response.json()["status_name"] == status_by_invoice_id[invoice_id]
+    assert counter.count == 1
+
+    ReferenceTableRepository.invalidate(StatusRef.__tablename__)
+    client.get(f"/api/supply/invoices/{dataset.invoice_ids[0]}")
+    assert counter.count == 2
@@ -0,0 +1,72 @@
+import pytest
+
+from app.database import pool_options
+
+POOL_ENV = [
+    f"{prefix}DB_{name}"
+    for prefix in ("", "AUTH_", "SUPPLY_", "REFERENCE_")
+    for name in ("POOL_SIZE", "POOL_MAX_OVERFLOW", "POOL_TIMEOUT", "POOL_RECYCLE", "POOL_PRE_PING")
+]
+
+
+@pytest.fixture(autouse=True)
+def clean_pool_env(monkeypatch):
+    for name in POOL_ENV:
+        monkeypatch.delenv(name, raising=False)
+
+
+def test_defaults():
+    assert pool_options("SUPPLY") == {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30.0,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+    }
+
+
+def test_shared_settings_apply_to_every_engine(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_POOL_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "2.5")
+    monkeypatch.setenv("DB_POOL_RECYCLE", "600")
+
+    for prefix in ("AUTH", "SUPPLY", "REFERENCE"):
+        options = pool_options(prefix)
+        assert options["pool_size"] == 20
+        assert options["max_overflow"] == 0
+        assert options["pool_timeout"] == 2.5
+        assert options["pool_recycle"] == 600
+
+
+def test_engine_setting_overrides_shared_one(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("AUTH_DB_POOL_SIZE", "3")
+
+    assert pool_options("AUTH")["pool_size"] == 3
+    assert pool_options("SUPPLY")["pool_size"] == 20
+
+
+def test_empty_values_fall_back_to_defaults(monkeypatch):
+    # .env.example leaves every pool setting empty.
+    monkeypatch.setenv("DB_POOL_SIZE", "")
+    monkeypatch.setenv("SUPPLY_DB_POOL_SIZE", "")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "")
+
+    options = pool_options("SUPPLY")
+    assert options["pool_size"] == 5
+    assert options["pool_pre_ping"] is True
+
+
+@pytest.mark.parametrize(("value", "expected"), [("true", True), ("1", True), ("YES", True), ("false", False), ("0", False)])
+def test_pre_ping_flag(monkeypatch, value, expected):
+    monkeypatch.setenv("REFERENCE_DB_POOL_PRE_PING", value)
+
+    assert pool_options("REFERENCE")["pool_pre_ping"] is expected
+
+
+def test_invalid_number_is_rejected(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "many")
+
+    with pytest.raises(ValueError):
+        pool_options("AUTH")
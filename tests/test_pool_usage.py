@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import event
+
+from app.pool_metrics import PoolMetrics
+
+SESSION_ONLY_PATHS = (
+    "/api/supply/requests/{request_id}/attachments",
+    "/api/supply/projects",
+    "/api/supply/warehouses",
+)
+
+
+class PoolWatch:
+    # PoolMetrics per engine, plus the peak number of connections held across all of them at once.
+    def __init__(self, engines: dict) -> None:
+        self.metrics = {}
+        self.peak_total = 0
+        for name, engine in engines.items():
+            metrics = PoolMetrics(engine)
+            event.listen(engine, "checkout", metrics.on_checkout)
+            event.listen(engine, "checkin", metrics.on_checkin)
+            event.listen(engine, "checkout", self._on_checkout)
+            self.metrics[name] = metrics
+
+    def _on_checkout(self, *_args) -> None:
+        self.peak_total = max(self.peak_total, sum(metrics.checked_out for metrics in self.metrics.values()))
+
+    def reset(self) -> None:
+        self.peak_total = 0
+        for metrics in self.metrics.values():
+            metrics.peak_checked_out = metrics.checked_out
+
+
+@pytest.fixture
+def engines(file_engines):
+    # Connections are really checked out and returned only behind a QueuePool.
+    return file_engines
+
+
+@pytest.mark.parametrize("path", SESSION_ONLY_PATHS)
+def test_session_only_route_holds_one_connection(client, dataset, engines, path):
+    watch = PoolWatch(engines)
+    path = path.format(request_id=dataset.request_ids[0])
+
+    # First call misses the session cache and reads the token from the auth database.
+    response = client.get(path)
+
+    assert response.status_code == 200
+    assert watch.metrics["auth"].checkouts == 1
+    # The auth connection is back in the pool before the route touches the supply database.
+    assert watch.metrics["auth"].peak_checked_out == 1
+    assert watch.metrics["supply"].peak_checked_out == 1
+    assert watch.peak_total == 1
+    assert all(metrics.checked_out == 0 for metrics in watch.metrics.values())
+
+    watch.reset()
+    assert client.get(path).status_code == 200
+    # A cached session needs no auth connection at all.
+    assert watch.metrics["auth"].checkouts == 1
+    assert watch.peak_total == 1
@@ -0,0 +1,134 @@
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.repositories.counterparty_repository import CounterpartyRepository, schema_cache
+from cmd.query_budget import ENDPOINTS, StatementCounter, allowed_ms, measure
+
+SIZES = (5, 20)
+
+# counterparties, details_ip, details_llc and bank_accounts: one statement per table, whatever N.
+COUNTERPARTY_BRIEFS_BUDGET = 4
+
+COUNTERPARTY_SCHEMA = (
+    "CREATE TABLE counterparties (id VARCHAR(36) PRIMARY KEY, short_name VARCHAR(255), type VARCHAR(8))",
+    "CREATE TABLE details_ip (id INTEGER PRIMARY KEY, counterparty_id VARCHAR(36), inn VARCHAR(12))",
+    "CREATE TABLE details_llc (id INTEGER PRIMARY KEY, counterparty_id VARCHAR(36), inn VARCHAR(12), kpp VARCHAR(9))",
+    "CREATE TABLE bank_accounts ("
+    "id INTEGER PRIMARY KEY, counterparty_id VARCHAR(36), account_number VARCHAR(20), is_main INTEGER)",
+)
+COUNTERPARTY_IDS = [f"cp-{index:03d}" for index in range(40)]
+
+
+@pytest.fixture(scope="module")
+def budget_results() -> dict[int, dict[str, dict]]:
+    return {size: measure(size) for size in SIZES}
+
+
+@pytest.mark.parametrize(("name", "template", "budget"), ENDPOINTS, ids=[name for name, _, _ in ENDPOINTS])
+def test_endpoint_statement_count(budget_results, name, template, budget):
+    counts = {size: budget_results[size][name]["statements"] for size in SIZES}
+    assert counts == dict.fromkeys(SIZES, budget), f"GET {template}"
+
+
+@pytest.mark.parametrize(("name", "template"), [row[:2] for row in ENDPOINTS], ids=[name for name, _, _ in ENDPOINTS])
+def test_endpoint_time_growth(budget_results, name, template):
+    smallest, largest = min(SIZES), max(SIZES)
+    base_ms = budget_results[smallest][name]["ms"]
+
+    assert budget_results[largest][name]["ms"] <= allowed_ms(base_ms, smallest, largest), f"GET {template}"
+
+
+def sqlite_table_columns(self, table_name: str) -> set[str] | None:
+    # SHOW COLUMNS is MySQL only; PRAGMA gives SQLite the same answer.
+    rows = self.db.execute(text(f"PRAGMA table_info({table_name})")).mappings().all()
+    return {str(row["name"]) for row in rows} or None
+
+
+@pytest.fixture
+def counterparty_db(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    with engine.begin() as connection:
+        for statement in COUNTERPARTY_SCHEMA:
+            connection.execute(text(statement))
+        for index, counterparty_id in enumerate(COUNTERPARTY_IDS):
+            counterparty_type = "IP" if index % 2 else "LLC"
+            connection.execute(
+                text("INSERT INTO counterparties VALUES (:id, :name, :type)"),
+                {"id": counterparty_id, "name": f"Контрагент {index}", "type": counterparty_type},
+            )
+            if counterparty_type == "IP":
+                connection.execute(
+                    text("INSERT INTO details_ip (counterparty_id, inn) VALUES (:id, :inn)"),
+                    {"id": counterparty_id, "inn": f"7700{index:08d}"},
+                )
+            else:
+                connection.execute(
+                    text("INSERT INTO details_llc (counterparty_id, inn, kpp) VALUES (:id, :inn, '770001001')"),
+                    {"id": counterparty_id, "inn": f"77{index:08d}"},
+                )
+            connection.execute(
+                text(
+                    "INSERT INTO bank_accounts (counterparty_id, account_number, is_main) "
+                    "VALUES (:id, :spare, 0), (:id, :main, 1)"
+                ),
+                {"id": counterparty_id, "spare": f"40702{index:015d}", "main": f"40701{index:015d}"},
+            )
+
+    counter = StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    monkeypatch.setattr(CounterpartyRepository, "_get_table_columns", sqlite_table_columns)
+    schema_cache.invalidate()
+    db = Session(engine)
+    yield db, counter
+    db.close()
+    schema_cache.invalidate()
+    engine.dispose()
+
+
+@pytest.mark.parametrize("count", [2, 10, 40])
+def test_counterparty_briefs_statement_count(counterparty_db, count):
+    db, counter = counterparty_db
+    repo = CounterpartyRepository(db)
+    counterparty_ids = COUNTERPARTY_IDS[:count]
+
+    # The first call introspects the tables and caches the compiled plan.
+    repo.get_counterparty_briefs(counterparty_ids)
+    counter.count = 0
+    briefs = repo.get_counterparty_briefs(counterparty_ids)
+
+    assert counter.count == COUNTERPARTY_BRIEFS_BUDGET
+    assert set(briefs) == set(counterparty_ids)
+    assert briefs["cp-000"] == {
+        "id": "cp-000",
+        "short_name": "Контрагент 0",
+        "inn": "7700000000",
+        "kpp": "770001001",
+        "checking_account": "40701000000000000000",
+    }
+    assert briefs["cp-001"]["inn"] == "770000000001"
+    assert briefs["cp-001"]["kpp"] is None
+
+
+def test_counterparty_briefs_recompile_after_schema_change(counterparty_db, monkeypatch):
+    db, _counter = counterparty_db
+    repo = CounterpartyRepository(db)
+    repo.get_counterparty_briefs(["cp-000"])
+
+    db.execute(text("ALTER TABLE details_llc RENAME COLUMN kpp TO kpp_code"))
+    db.commit()
+    rollbacks = []
+    rollback = db.rollback
+
+    def counted_rollback() -> None:
+        rollbacks.append(1)
+        rollback()
+
+    monkeypatch.setattr(db, "rollback", counted_rollback)
+
+    briefs = repo.get_counterparty_briefs(["cp-000"])
+
+    assert rollbacks == [1]
+    assert briefs["cp-000"]["inn"] == "7700000000"
+    assert briefs["cp-000"]["kpp"] is None
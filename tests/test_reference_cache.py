@@ -0,0 +1,76 @@
+import app.database as database
+from app.models.supply_request import WarehouseCategoryRef
+from app.repositories.catalog_repository import CatalogRepository
+from app.repositories.reference_table_repository import ReferenceTableRepository, reference_cache
+
+
+def cached_categories() -> dict:
+    db = database.SupplySessionLocal()
+    try:
+        return ReferenceTableRepository(db).get_warehouse_categories()
+    finally:
+        db.close()
+
+
+def test_categories_are_served_from_cache(dataset):
+    first = cached_categories()
+    misses = reference_cache.stats()["misses"]
+
+    assert cached_categories() is first
+    assert reference_cache.stats()["misses"] == misses
+
+
+def test_create_invalidates_cached_categories(dataset):
+    before = cached_categories()
+
+    db = database.SupplySessionLocal()
+    try:
+        item = CatalogRepository(db).create_warehouse_category({"name": "Новая категория"})
+    finally:
+        db.close()
+
+    after = cached_categories()
+    assert item.id not in before
+    assert after[item.id].name == "Новая категория"
+
+
+def test_save_invalidates_cached_categories(dataset):
+    category_id = next(iter(cached_categories()))
+
+    db = database.SupplySessionLocal()
+    try:
+        repo = CatalogRepository(db)
+        item = repo.get_warehouse_category_by_id(category_id)
+        item.name = "Переименованная"
+        repo.save_warehouse_category(item)
+    finally:
+        db.close()
+
+    assert cached_categories()[category_id].name == "Переименованная"
+
+
+def test_api_writes_are_visible_immediately(client):
+    cached_categories()
+
+    created = client.post("/api/supply/warehouse-categories", json={"name": "Через API"})
+    assert created.status_code == 201
+    category_id = created.json()["id"]
+    assert cached_categories()[category_id].name == "Через API"
+
+    updated = client.patch(f"/api/supply/warehouse-categories/{category_id}", json={"name": "Обновлена"})
+    assert updated.status_code == 200
+    assert cached_categories()[category_id].name == "Обновлена"
+    assert {"id": category_id, "name": "Обновлена", "parent_id": None} in client.get(
+        "/api/supply/warehouse-categories"
+    ).json()
+
+
+def test_invalidate_drops_only_the_given_table(dataset):
+    cached_categories()
+    db = database.SupplySessionLocal()
+    try:
+        statuses = ReferenceTableRepository(db).get_statuses()
+        ReferenceTableRepository.invalidate(WarehouseCategoryRef.__tablename__)
+        assert ReferenceTableRepository(db).get_statuses() is statuses
+    finally:
+        db.close()
@@ -0,0 +1,109 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+import app.database as database
+from app.models.supply_request import RequestItem
+from app.repositories.request_repository import RequestRepository
+
+
+def items_by_id(request_id: int) -> dict[str, tuple]:
+    db = database.SupplySessionLocal()
+    try:
+        rows = db.query(RequestItem).filter(RequestItem.request_id == request_id).all()
+        return {row.id: (row.num, row.name, row.quantity) for row in rows}
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def request_with_items(dataset) -> tuple[int, list[str]]:
+    for request_id in dataset.request_ids:
+        item_ids = sorted(items_by_id(request_id))
+        if len(item_ids) >= 3:
+            return request_id, item_ids
+    pytest.fail("no request with three items in the dataset")
+
+
+@pytest.fixture
+def commits(engines) -> list[int]:
+    commits = []
+
+    def count_commit(_conn) -> None:
+        commits.append(1)
+
+    event.listen(engines["supply"], "commit", count_commit)
+    yield commits
+    event.remove(engines["supply"], "commit", count_commit)
+
+
+def test_mixed_batch_commits_once(client, request_with_items, commits):
+    request_id, (updated_id, deleted_id, *_rest) = request_with_items
+    before = items_by_id(request_id)
+
+    response = client.post(
+        f"/api/supply/requests/{request_id}/items/batch",
+        json={
+            "create": [{"name": "Кабель", "quantity": 5}, {"name": "Без количества"}],
+            "update": [{"id": updated_id, "quantity": 42}],
+            "delete": [deleted_id],
+        },
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert len(commits) == 1
+    assert [item["name"] for item in body["created"]] == ["Кабель", "Без количества"]
+    assert body["updated"][0]["quantity"] == 42
+    assert body["deleted"] == [deleted_id]
+
+    after = items_by_id(request_id)
+    assert deleted_id not in after
+    assert after[updated_id][2] == 42
+    created_ids = [item["id"] for item in body["created"]]
+    next_num = max(num for num, _, _ in before.values()) + 1
+    assert [after[item_id][0] for item_id in created_ids] == [next_num, next_num + 1]
+    assert after[created_ids[1]][2] == 1.0
+
+
+def test_invalid_row_rejects_the_whole_batch(client, request_with_items, commits):
+    request_id, (updated_id, deleted_id, *_rest) = request_with_items
+    before = items_by_id(request_id)
+
+    response = client.post(
+        f"/api/supply/requests/{request_id}/items/batch",
+        json={
+            "create": [{"name": "Кабель"}],
+            "update": [{"id": updated_id, "quantity": 42}, {"id": "missing-item", "quantity": 1}],
+            "delete": [deleted_id],
+        },
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == [
+        {"operation": "update", "index": 1, "id": "missing-item", "detail": "Request item not found"}
+    ]
+    assert commits == []
+    assert items_by_id(request_id) == before
+
+
+def test_database_error_rolls_back_earlier_rows(engines, request_with_items):
+    request_id, (updated_id, deleted_id, other_id, *_rest) = request_with_items
+    before = items_by_id(request_id)
+
+    db = database.SupplySessionLocal()
+    try:
+        repo = RequestRepository(db)
+        existing = repo.get_request_items_by_ids(request_id, [updated_id, deleted_id, other_id])
+        with pytest.raises(IntegrityError):
+            repo.apply_request_item_batch(
+                request_id,
+                [{"num": 100, "name": "Кабель", "quantity": 1.0}],
+                # The delete and the first update reach the database before quantity NOT NULL fails.
+                [(existing[updated_id], {"name": "Изменено"}), (existing[other_id], {"quantity": None})],
+                [existing[deleted_id]],
+            )
+    finally:
+        db.close()
+
+    assert items_by_id(request_id) == before
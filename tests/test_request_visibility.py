@@ -0,0 +1,94 @@
+import uuid
+from datetime import datetime
+
+import app.database as database
+from app.models.supply_request import RequestLog, SupplyRequest
+from app.routes.pagination import NEXT_CURSOR_HEADER
+
+
+def add_foreign_request(dataset, executor: str | None = None) -> int:
+    # Created by someone else and without a log entry: only the executor, if any, can see it.
+    request_id = max(dataset.request_ids) + 1
+    db = database.SupplySessionLocal()
+    try:
+        status_id = db.get(SupplyRequest, dataset.request_ids[0]).status_id
+        db.add(
+            SupplyRequest(
+                id=request_id,
+                object_levels_id=dataset.object_level_ids[0],
+                name="Чужая заявка",
+                created_by=str(uuid.uuid4()),
+                executor=executor,
+                created_at=datetime(2025, 1, 1),
+                status_id=status_id,
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+    return request_id
+
+
+def add_log(request_id: int, user_id: str) -> None:
+    db = database.SupplySessionLocal()
+    try:
+        db.add(RequestLog(id=str(uuid.uuid4()), user_id=user_id, request_id=str(request_id), status_name="pending"))
+        db.commit()
+    finally:
+        db.close()
+
+
+def my_ids(client) -> list[int]:
+    return [row["id"] for row in client.get("/api/supply/requests/my").json()]
+
+
+def my_paged_ids(client, limit: int) -> list[list[int]]:
+    pages = []
+    params = {"limit": limit}
+    while True:
+        response = client.get("/api/supply/requests/my", params=params)
+        pages.append([row["id"] for row in response.json()])
+        if NEXT_CURSOR_HEADER not in response.headers:
+            return pages
+        params["cursor"] = response.headers[NEXT_CURSOR_HEADER]
+
+
+def test_foreign_request_is_hidden(client, dataset):
+    request_id = add_foreign_request(dataset)
+
+    assert request_id in [row["id"] for row in client.get("/api/supply/requests").json()]
+    assert request_id not in my_ids(client)
+    assert client.get(f"/api/supply/requests/my/{request_id}").status_code == 404
+
+
+def test_request_is_visible_to_its_executor(client, dataset):
+    request_id = add_foreign_request(dataset, executor=dataset.user_id)
+
+    assert request_id in my_ids(client)
+    assert client.get(f"/api/supply/requests/my/{request_id}").status_code == 200
+
+
+def test_request_is_visible_to_a_user_in_its_log(client, dataset):
+    request_id = add_foreign_request(dataset)
+    add_log(request_id, dataset.user_id)
+
+    assert request_id in my_ids(client)
+    assert client.get(f"/api/supply/requests/my/{request_id}").status_code == 200
+
+
+def test_another_users_log_does_not_reveal_the_request(client, dataset):
+    request_id = add_foreign_request(dataset)
+    add_log(request_id, str(uuid.uuid4()))
+
+    assert request_id not in my_ids(client)
+
+
+def test_my_pages_are_full_and_match_the_list(client, dataset):
+    add_foreign_request(dataset)
+    full = my_ids(client)
+
+    pages = my_paged_ids(client, 2)
+
+    assert [request_id for page in pages for request_id in page] == full
+    # Hidden rows are filtered in SQL, so no page comes back short.
+    assert all(len(page) == 2 for page in pages[:-1])
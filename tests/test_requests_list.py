@@ -0,0 +1,55 @@
+import pytest
+
+from app.routes.pagination import NEXT_CURSOR_HEADER
+
+
+def walk_pages(client, url: str, limit: int, **params) -> tuple[list[int], list[int]]:
+    ids, page_sizes = [], []
+    cursor = None
+    while True:
+        query = {**params, "limit": limit}
+        if cursor is not None:
+            query["cursor"] = cursor
+        response = client.get(url, params=query)
+        assert response.status_code == 200
+        page = [row["id"] for row in response.json()]
+        ids.extend(page)
+        page_sizes.append(len(page))
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return ids, page_sizes
+        assert int(cursor) == page[-1]
+
+
+@pytest.mark.parametrize("order", ["desc", "asc"])
+@pytest.mark.parametrize("limit", [1, 4, 5, 12, 50])
+def test_pages_add_up_to_the_full_list(client, dataset, order, limit):
+    full = [row["id"] for row in client.get("/api/supply/requests").json()]
+    expected = full if order == "desc" else full[::-1]
+
+    ids, page_sizes = walk_pages(client, "/api/supply/requests", limit, order=order)
+
+    assert ids == expected
+    assert all(size == limit for size in page_sizes[:-1])
+    # The last page never carries a cursor, also when it is exactly full.
+    assert 0 < page_sizes[-1] <= limit
+
+
+def test_cursor_is_exclusive(client, dataset):
+    request_ids = sorted(dataset.request_ids)
+    cursor = request_ids[5]
+
+    older = client.get("/api/supply/requests", params={"limit": 3, "cursor": cursor}).json()
+    newer = client.get("/api/supply/requests", params={"limit": 3, "cursor": cursor, "order": "asc"}).json()
+
+    assert [row["id"] for row in older] == request_ids[2:5][::-1]
+    assert [row["id"] for row in newer] == request_ids[6:9]
+
+
+def test_last_page_has_no_next_cursor(client, dataset):
+    oldest = min(dataset.request_ids)
+
+    response = client.get("/api/supply/requests", params={"limit": 5, "cursor": oldest + 1})
+
+    assert [row["id"] for row in response.json()] == [oldest]
+    assert NEXT_CURSOR_HEADER not in response.headers
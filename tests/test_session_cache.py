@@ -0,0 +1,72 @@
+import uuid
+from datetime import datetime, timedelta
+
+from app.middleware import session_cache
+from app.models.session import SessionDB
+from app.repositories.session_repository import SessionRepository
+
+
+def make_session(user_id: str, expires_in_seconds: float) -> SessionDB:
+    return SessionDB(
+        id=str(uuid.uuid4()),
+        user_id=user_id,
+        token_hash=uuid.uuid4().hex,
+        expires_at=datetime.utcnow() + timedelta(seconds=expires_in_seconds),
+    )
+
+
+def test_valid_session_expires_with_cache_ttl(engines, clock):
+    session = make_session("user-1", expires_in_seconds=3600)
+    session_cache.remember_session("hash-1", session)
+
+    clock.advance(session_cache.SESSION_CACHE_TTL_SECONDS - 1)
+    cached, snapshot = session_cache.get_cached_session("hash-1")
+    assert cached
+    assert snapshot.user_id == "user-1"
+
+    clock.advance(2)
+    assert session_cache.get_cached_session("hash-1") == (False, None)
+
+
+def test_cached_session_does_not_outlive_its_expires_at(engines, clock):
+    session_cache.remember_session("hash-1", make_session("user-1", expires_in_seconds=10))
+
+    clock.advance(11)
+    assert session_cache.get_cached_session("hash-1") == (False, None)
+
+
+def test_expired_session_is_not_cached(engines):
+    session_cache.remember_session("hash-1", make_session("user-1", expires_in_seconds=-1))
+
+    assert session_cache.get_cached_session("hash-1") == (False, None)
+
+
+def test_invalid_token_is_cached_for_negative_ttl(engines, clock):
+    session_cache.remember_session("hash-1", None)
+    assert session_cache.get_cached_session("hash-1") == (True, None)
+
+    clock.advance(session_cache.SESSION_CACHE_NEGATIVE_TTL_SECONDS + 1)
+    assert session_cache.get_cached_session("hash-1") == (False, None)
+
+
+def test_evict_user_sessions_keeps_other_users(engines):
+    session_cache.remember_session("hash-1", make_session("user-1", expires_in_seconds=3600))
+    session_cache.remember_session("hash-2", make_session("user-1", expires_in_seconds=3600))
+    session_cache.remember_session("hash-3", make_session("user-2", expires_in_seconds=3600))
+
+    session_cache.evict_user_sessions("user-1")
+
+    assert session_cache.get_cached_session("hash-1") == (False, None)
+    assert session_cache.get_cached_session("hash-2") == (False, None)
+    assert session_cache.get_cached_session("hash-3")[0]
+
+
+
+def test_evict_session_drops_the_token(engines):
+    session_cache.remember_session(SessionRepository.hash_token("token-1"), make_session("user-1", 3600))
+    session_cache.remember_session(SessionRepository.hash_token("token-2"), make_session("user-1", 3600))
+
+    session_cache.evict_session("token-1")
+
+    assert session_cache.get_cached_session(SessionRepository.hash_token("token-1")) == (False, None)
+    assert session_cache.get_cached_session(SessionRepository.hash_token("token-2"))[0]